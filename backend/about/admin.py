@@ -1,4 +1,5 @@
 from django.contrib import admin
+from backend.search import SearchVectorAdminMixin
 from .models import Job, Achievement
 
 
@@ -8,7 +9,7 @@ class AchievementInline(admin.TabularInline):
 
 
 @admin.register(Job)
-class JobAdmin(admin.ModelAdmin):
+class JobAdmin(SearchVectorAdminMixin, admin.ModelAdmin):
     list_display = ("company", "link", "title", "start_date", "end_date", "is_current")
     list_filter = ("is_current",)
     search_fields = ("company", "title")
@@ -23,7 +24,7 @@ class JobAdmin(admin.ModelAdmin):
 
 
 @admin.register(Achievement)
-class AchievementAdmin(admin.ModelAdmin):
+class AchievementAdmin(SearchVectorAdminMixin, admin.ModelAdmin):
     list_display = ("description", "job")
     search_fields = ("description",)
     list_filter = ("job",)
@@ -1,9 +1,11 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 
 
 class Achievement(models.Model):
     description = models.TextField()
     job = models.ForeignKey("Job", on_delete=models.CASCADE, related_name="achievements")
+    search_vector = SearchVectorField(null=True, editable=False)
 
     def __str__(self):
         return self.description[:50]
@@ -17,14 +19,20 @@ class Job(models.Model):
     end_date = models.DateField(null=True, blank=True)
     is_current = models.BooleanField(default=False)
     technologies = models.ManyToManyField("projects.Technology", related_name="jobs")
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         ordering = ["-start_date"]
+        indexes = [models.Index(fields=["-start_date", "-id"], name="job_start_date_id_idx")]
 
     def __str__(self):
         return f"{self.title} at {self.company}"
 
-    def save(self, *args, **kwargs):
+    def prepare_save(self):
+        # Current jobs never have an end date; also called before bulk writes, which skip save()
         if self.is_current:
             self.end_date = None
+
+    def save(self, *args, **kwargs):
+        self.prepare_save()
         super().save(*args, **kwargs)
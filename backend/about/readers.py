@@ -0,0 +1,35 @@
+from backend.fast import Reader, group_by
+from projects.readers import technologies_by_owner
+from .models import Achievement
+
+
+def isoformat(value):
+    return value.isoformat() if value is not None else None
+
+
+class AchievementReader(Reader):
+    values = ("id", "description", "job_id")
+
+    def assemble(self, rows):
+        return list(rows)
+
+
+class JobReader(Reader):
+    values = ("id", "company", "link", "title", "start_date", "end_date", "is_current")
+
+    def assemble(self, rows):
+        ids = [row["id"] for row in rows]
+        technologies = technologies_by_owner("jobs", ids)
+        achievements = group_by(
+            Achievement.objects.filter(job__in=ids).values(*AchievementReader.values), "job_id", pop=False
+        )
+        return [
+            {
+                **row,
+                "start_date": isoformat(row["start_date"]),
+                "end_date": isoformat(row["end_date"]),
+                "technologies": technologies.get(row["id"], []),
+                "achievements": achievements.get(row["id"], []),
+            }
+            for row in rows
+        ]
@@ -1,19 +1,39 @@
 from rest_framework import serializers
+from backend.bulk import BulkListSerializer, BulkModelSerializer
+from backend.relations import NestedRelatedField, PreloadedPrimaryKeyRelatedField
 from .models import Job, Achievement
+from projects.models import Technology
 from projects.serializers import TechnologySerializer
 
 
-class AchievementSerializer(serializers.ModelSerializer):
-    job_id = serializers.PrimaryKeyRelatedField(queryset=Job.objects.all(), source="job")
+class AchievementSerializer(BulkModelSerializer):
+    job_id = PreloadedPrimaryKeyRelatedField(queryset=Job.objects.all(), source="job")
 
     class Meta:
         model = Achievement
         fields = ["id", "description", "job_id"]
+        list_serializer_class = BulkListSerializer
 
 
-class JobSerializer(serializers.ModelSerializer):
-    achievements = AchievementSerializer(many=True, read_only=True)
-    technologies = TechnologySerializer(many=True, read_only=True)
+class JobAchievementSerializer(AchievementSerializer):
+    """
+    Achievement written as part of its job, which supplies `job_id`.
+    Accepts a plain description string as well as an object.
+    """
+
+    job_id = serializers.PrimaryKeyRelatedField(source="job", read_only=True)
+
+    def to_internal_value(self, data):
+        if isinstance(data, str):
+            data = {"description": data}
+        return super().to_internal_value(data)
+
+
+class JobSerializer(BulkModelSerializer):
+    achievements = JobAchievementSerializer(many=True, required=False)
+    technologies = NestedRelatedField(
+        TechnologySerializer(many=True), queryset=Technology.objects.all(), slug_field="name", required=False
+    )
 
     class Meta:
         model = Job
@@ -28,3 +48,5 @@ class JobSerializer(serializers.ModelSerializer):
             "technologies",
             "achievements",
         ]
+        prefetch_related = ["technologies", "achievements"]
+        list_serializer_class = BulkListSerializer
@@ -0,0 +1,26 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from backend.cache import bump_generation
+from backend.search import register_search
+from backend.snapshot import schedule_snapshot_build
+from .models import Job, Achievement
+
+
+def invalidate_model(sender, **kwargs):
+    bump_generation(sender)
+    schedule_snapshot_build()
+
+
+def invalidate_job_technologies(sender, action, **kwargs):
+    if action.startswith("post_"):
+        bump_generation(Job)
+        schedule_snapshot_build()
+
+
+for model in (Job, Achievement):
+    post_save.connect(invalidate_model, sender=model)
+    post_delete.connect(invalidate_model, sender=model)
+m2m_changed.connect(invalidate_job_technologies, sender=Job.technologies.through)
+register_search("achievement", Achievement, {"description": "A"}, trigram=("description",), title="description")
+register_search(
+    "job", Job, {"company": "A", "title": "A"}, trigram=("company", "title"), title="title", children=("achievements",)
+)
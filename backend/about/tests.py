@@ -1,8 +1,13 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.test import TestCase
 from django.urls import reverse
+from rest_framework.pagination import Cursor
 from rest_framework.test import APITestCase
 from rest_framework import status
 from datetime import date
+from backend.pagination import KeysetPagination
 
 from .models import Job, Achievement
 from projects.models import Technology
@@ -91,8 +96,8 @@ class JobAPITests(APITestCase):
         """Test retrieving a list of jobs"""
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["company"], "Test Company")
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["company"], "Test Company")
 
     def test_get_job_detail(self):
         """Test retrieving a single job with its related fields"""
@@ -142,8 +147,8 @@ class AchievementAPITests(APITestCase):
         """Test retrieving a list of achievements"""
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["description"], "Implemented new feature")
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["description"], "Implemented new feature")
 
     def test_get_achievement_detail(self):
         """Test retrieving a single achievement"""
@@ -175,3 +180,277 @@ class AchievementAPITests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.achievement.refresh_from_db()
         self.assertEqual(self.achievement.description, "Updated achievement")
+
+
+class QueryCountTests(APITestCase):
+    """
+    Test cases for the query plan of the Job and Achievement list endpoints.
+    The number of queries must not grow with the number of jobs.
+    """
+
+    def create_jobs(self, count):
+        # Each job gets its own technologies and achievements
+        for i in range(count):
+            job = Job.objects.create(company=f"Company {i}", title="Engineer", start_date=date(2020, 1, i + 1))
+            job.technologies.add(*[Technology.objects.create(name=f"Technology {count}.{i}.{j}") for j in range(3)])
+            for j in range(3):
+                Achievement.objects.create(description=f"Achievement {i}.{j}", job=job)
+
+    def test_job_list_queries(self):
+        """Jobs, technologies and achievements are each loaded with one query"""
+        url = reverse("job-list")
+        for count in (1, 5):
+            self.create_jobs(count)
+            with self.assertNumQueries(3):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_achievement_list_queries(self):
+        """Achievements render their job from the foreign key without extra queries"""
+        url = reverse("achievement-list")
+        for count in (1, 5):
+            self.create_jobs(count)
+            with self.assertNumQueries(1):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class JobPaginationTests(APITestCase):
+    """
+    Test cases for cursor pagination of the Job list.
+    Jobs are paged newest first, with the id breaking ties between equal start dates.
+    """
+
+    def setUp(self):
+        self.jobs = [
+            Job.objects.create(company=f"Company {i}", title="Engineer", start_date=date(2020, 1 + i % 2, 1))
+            for i in range(5)
+        ]
+        self.url = reverse("job-list")
+
+    def test_walk_all_pages(self):
+        """Test that following next cursors yields every job once in (-start_date, -id) order"""
+        ids = []
+        url = f"{self.url}?page_size=2"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids += [job["id"] for job in response.data["results"]]
+            url = response.data["next"]
+        expected = sorted(self.jobs, key=lambda job: (job.start_date, job.id), reverse=True)
+        self.assertEqual(ids, [job.id for job in expected])
+
+    def test_ties_paged_without_offset(self):
+        """Test that pages after rows tied on start_date are found by (start_date, id), not by OFFSET"""
+        url = f"{self.url}?page_size=2"
+        pages = []
+        while url:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertFalse([query["sql"] for query in queries if "OFFSET" in query["sql"]])
+            pages.append([job["id"] for job in response.data["results"]])
+            url = response.data["next"]
+
+        # Walking back from the last page yields the same pages
+        url = response.data["previous"]
+        for page in reversed(pages[:-1]):
+            response = self.client.get(url)
+            self.assertEqual([job["id"] for job in response.data["results"]], page)
+            url = response.data["previous"]
+        self.assertIsNone(url)
+
+    def test_malformed_cursor_is_not_found(self):
+        """Test that a cursor whose position does not fit the ordering is rejected with 404"""
+        paginator = KeysetPagination()
+        paginator.base_url = f"http://testserver{self.url}"
+        for position in ("x", '["2020-01-01"]', '["x", 1]'):
+            url = paginator.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+            self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+
+class JobCacheTests(APITestCase):
+    """
+    Test cases for cached Job responses.
+    Changes to achievements and technologies must invalidate cached jobs.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.job = Job.objects.create(company="Test Company", title="Software Engineer", start_date=date(2020, 1, 1))
+        self.url = reverse("job-detail", kwargs={"pk": self.job.pk})
+
+    def test_achievement_change_invalidates(self):
+        """Test that a new achievement shows up in a previously cached job"""
+        self.assertEqual(self.client.get(self.url)["X-Cache"], "MISS")
+        self.assertEqual(self.client.get(self.url)["X-Cache"], "HIT")
+        Achievement.objects.create(description="Shipped", job=self.job)
+        response = self.client.get(self.url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(len(response.data["achievements"]), 1)
+
+    def test_technology_rename_invalidates(self):
+        """Test that renaming a technology updates previously cached jobs"""
+        technology = Technology.objects.create(name="Python")
+        self.job.technologies.add(technology)
+        self.client.get(self.url)
+        technology.name = "Python 3"
+        technology.save()
+        self.assertEqual(self.client.get(self.url).data["technologies"][0]["name"], "Python 3")
+
+
+class FastReadParityTests(APITestCase):
+    """
+    Test cases for the fast read path of jobs and achievements.
+    Responses built from value rows must match the serializers byte for byte.
+    """
+
+    def setUp(self):
+        # Current and past jobs, with and without technologies and achievements
+        current = Job.objects.create(company="Now Inc", title="Lead", start_date=date(2022, 5, 1), is_current=True)
+        past = Job.objects.create(
+            company="Then LLC",
+            link="https://then.example.com",
+            title="Dev",
+            start_date=date(2019, 1, 1),
+            end_date=date(2022, 4, 30),
+        )
+        Job.objects.create(company="Same Day", title="Intern", start_date=date(2019, 1, 1))
+        current.technologies.add(Technology.objects.create(name="Python"), Technology.objects.create(name="Go"))
+        Achievement.objects.create(description="Shipped ✓", job=current)
+        Achievement.objects.create(description="Scaled", job=current)
+        Achievement.objects.create(description="Migrated", job=past)
+
+    def assertParity(self, url, params=None):
+        cache.clear()
+        with self.settings(API_FAST_READS=False):
+            expected = self.client.get(url, params)
+        cache.clear()
+        with self.settings(API_FAST_READS=True):
+            actual = self.client.get(url, params)
+        self.assertEqual(actual.status_code, expected.status_code)
+        self.assertEqual(actual.content, expected.content)
+
+    def test_list_parity(self):
+        """Test job and achievement lists, including pages split between equal start dates"""
+        for name in ("job-list", "achievement-list"):
+            self.assertParity(reverse(name))
+            self.assertParity(reverse(name), {"page_size": 2})
+
+    def test_detail_parity(self):
+        """Test every job and achievement detail response"""
+        for name, model in (("job-detail", Job), ("achievement-detail", Achievement)):
+            for pk in model.objects.values_list("pk", flat=True):
+                self.assertParity(reverse(name, kwargs={"pk": pk}))
+
+
+class JobBulkWriteTests(APITestCase):
+    """
+    Test suite for the bulk/ endpoints of jobs and achievements.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.python = Technology.objects.create(name="Python")
+        self.django = Technology.objects.create(name="Django")
+
+    def test_bulk_create_jobs(self):
+        """Test that jobs get their technologies and current jobs lose their end date"""
+        rows = [
+            {
+                "company": "Acme",
+                "title": "Engineer",
+                "start_date": "2020-01-01",
+                "end_date": "2021-01-01",
+                "is_current": True,
+                "technologies": [self.python.pk, self.django.pk],
+            },
+            {"company": "Initech", "title": "Developer", "start_date": "2018-01-01", "end_date": "2019-12-31"},
+        ]
+        response = self.client.post(reverse("job-bulk"), rows, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        acme = Job.objects.get(company="Acme")
+        self.assertIsNone(acme.end_date)
+        self.assertEqual(acme.technologies.count(), 2)
+        self.assertEqual(Job.objects.get(company="Initech").technologies.count(), 0)
+
+    def test_bulk_create_achievements_validates_jobs_once(self):
+        """Test that job ids of every row are checked with a single query"""
+        job = Job.objects.create(company="Acme", title="Engineer", start_date=date(2020, 1, 1))
+        rows = [{"description": f"Shipped {index}", "job_id": job.pk} for index in range(10)]
+        # Preload jobs, savepoint, one insert, release, reload the response rows
+        with self.assertNumQueries(5):
+            response = self.client.post(reverse("achievement-bulk"), rows, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(job.achievements.count(), 10)
+
+        response = self.client.post(reverse("achievement-bulk"), [{"description": "x", "job_id": 0}], format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_create_job_with_achievements(self):
+        """Test that a job, its technologies by name and its achievements are one request"""
+        data = {
+            "company": "Acme",
+            "title": "Engineer",
+            "start_date": "2020-01-01",
+            "technologies": [self.python.pk, "Kubernetes"],
+            "achievements": [{"description": "Shipped"}, {"description": "Scaled"}],
+        }
+        response = self.client.post(reverse("job-list"), data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        job = Job.objects.get(company="Acme")
+        self.assertEqual([a["description"] for a in response.data["achievements"]], ["Shipped", "Scaled"])
+        self.assertEqual(response.data["achievements"][0]["job_id"], job.pk)
+        self.assertEqual({tech.name for tech in job.technologies.all()}, {"Python", "Kubernetes"})
+
+    def test_create_job_queries_constant(self):
+        """Test that the number of queries does not depend on the number of achievements"""
+        counts = []
+        for size in (1, 10):
+            data = {
+                "company": f"Acme {size}",
+                "title": "Engineer",
+                "start_date": "2020-01-01",
+                "achievements": [{"description": f"Shipped {index}"} for index in range(size)],
+            }
+            with CaptureQueriesContext(connection) as queries:
+                self.client.post(reverse("job-list"), data, format="json")
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_update_job_replaces_achievements(self):
+        """Test that updating achievements replaces the previous list"""
+        job = Job.objects.create(company="Acme", title="Engineer", start_date=date(2020, 1, 1))
+        Achievement.objects.create(job=job, description="Old")
+        url = reverse("job-detail", kwargs={"pk": job.pk})
+        response = self.client.patch(url, {"achievements": [{"description": "New"}]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(job.achievements.values_list("description", flat=True)), ["New"])
+        self.client.patch(url, {"title": "Lead"}, format="json")
+        self.assertEqual(job.achievements.count(), 1)
+
+    def test_achievements_as_descriptions(self):
+        """Test that achievements can be written as a list of description strings"""
+        job = Job.objects.create(company="Acme", title="Engineer", start_date=date(2020, 1, 1))
+        url = reverse("job-detail", kwargs={"pk": job.pk})
+        response = self.client.patch(url, {"achievements": ["Shipped", {"description": "Scaled"}]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([a["description"] for a in response.data["achievements"]], ["Shipped", "Scaled"])
+        response = self.client.patch(url, {"achievements": [""]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class JobSparseFieldsTests(APITestCase):
+    """
+    Test suite for ?fields= and ?expand= on jobs.
+    """
+
+    def test_expand_skips_achievements(self):
+        """Test that relations left out of expand are neither rendered nor prefetched"""
+        job = Job.objects.create(company="Acme", title="Engineer", start_date=date(2020, 1, 1))
+        job.technologies.add(Technology.objects.create(name="Python"))
+        Achievement.objects.create(job=job, description="Shipped")
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("job-list"), {"expand": "technologies"})
+        job_data = response.data["results"][0]
+        self.assertNotIn("achievements", job_data)
+        self.assertEqual(job_data["technologies"][0]["name"], "Python")
@@ -1,13 +1,20 @@
-from rest_framework import viewsets
+from backend.viewsets import PortfolioViewSet
+from projects.models import Technology
 from .models import Job, Achievement
+from .readers import JobReader, AchievementReader
 from .serializers import JobSerializer, AchievementSerializer
 
 
-class JobViewSet(viewsets.ModelViewSet):
+class JobViewSet(PortfolioViewSet):
     queryset = Job.objects.all()
     serializer_class = JobSerializer
+    reader = JobReader()
+    cache_models = (Job, Achievement, Technology)
+    ordering = ("-start_date", "-id")
 
 
-class AchievementViewSet(viewsets.ModelViewSet):
+class AchievementViewSet(PortfolioViewSet):
     queryset = Achievement.objects.all()
     serializer_class = AchievementSerializer
+    reader = AchievementReader()
+    cache_models = (Achievement,)
@@ -0,0 +1,95 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import aprefetch_related_objects
+from django.http import Http404
+from rest_framework.response import Response
+from backend.query_plan import get_query_plan
+
+
+class AsyncReadMixin:
+    """
+    Viewset mixin that serves GET list and retrieve from coroutines when
+    `ASYNC_READS` is enabled (the ASGI serving mode).
+
+    Reads load rows with the async ORM and prefetch relations with
+    `aprefetch_related_objects`, so an ASGI worker keeps serving other requests
+    while it waits on the database. Writes still go through the regular
+    synchronous viewset in a worker thread.
+    """
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        view = super().as_view(actions, **initkwargs)
+        if not settings.ASYNC_READS or actions.get("get") not in ("list", "retrieve"):
+            return view
+        sync_view = sync_to_async(view)
+
+        async def async_view(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return await sync_view(request, *args, **kwargs)
+            return await cls(**initkwargs).adispatch(dict(actions, head=actions["get"]), request, *args, **kwargs)
+
+        # Keep the attributes routers, schema generators and CSRF checks look for
+        async_view.__dict__.update(view.__dict__)
+        async_view.__name__ = view.__name__
+        return async_view
+
+    async def adispatch(self, actions, request, *args, **kwargs):
+        """Async counterpart of `ViewSet.as_view()` and `APIView.dispatch()` for read actions."""
+        self.action_map = actions
+        for method, action in actions.items():
+            setattr(self, method, getattr(self, action))
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            # Authentication, permissions and throttling may read sessions and users
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            handler = self.alist if self.action == "list" else self.aretrieve
+            response = await self.acached_response(handler, request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    def get_async_queryset(self):
+        """Filtered queryset with the plan's joins; prefetches are applied after rows are loaded."""
+        select_related, prefetch_related = get_query_plan(self.get_serializer())
+        queryset = self.queryset.select_related(*select_related) if select_related else self.queryset.all()
+        return self.filter_queryset(queryset), prefetch_related
+
+    async def alist(self, request, *args, **kwargs):
+        if self.use_fast_reads():
+            return await sync_to_async(self.fast_list)(request, *args, **kwargs)
+
+        queryset, prefetch_related = self.get_async_queryset()
+        if self.paginator is None:
+            objects = [obj async for obj in queryset]
+        else:
+            objects = await self.paginator.apaginate_queryset(queryset, request, view=self)
+        await aprefetch_related_objects(objects, *prefetch_related)
+
+        data = self.get_serializer(objects, many=True).data
+        return Response(data) if self.paginator is None else self.get_paginated_response(data)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        if self.use_fast_reads():
+            return await sync_to_async(self.fast_retrieve)(request, *args, **kwargs)
+
+        queryset, prefetch_related = self.get_async_queryset()
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            instance = await queryset.aget(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except queryset.model.DoesNotExist:
+            raise Http404(f"No {queryset.model._meta.object_name} matches the given query.")
+        except (TypeError, ValueError, ValidationError):
+            # A lookup value of the wrong type is not found, as in DRF's get_object_or_404
+            raise Http404
+        self.check_object_permissions(request, instance)
+        await aprefetch_related_objects([instance], *prefetch_related)
+        return Response(self.get_serializer(instance).data)
@@ -0,0 +1,74 @@
+import hashlib
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.permissions import SAFE_METHODS
+
+
+def token_cache_key(key):
+    # Hashed so raw tokens never appear in cache keys
+    return "auth-token:" + hashlib.sha256(key.encode()).hexdigest()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    `Authorization: Token <key>` authentication whose lookups are cached for
+    `API_TOKEN_CACHE_TIMEOUT` seconds, so a warm request costs one cache read
+    instead of a token query, and never a password hash. Deleting a token or
+    saving its user evicts the entry. `request.auth` is the token key.
+    """
+
+    def authenticate_credentials(self, key):
+        cache_key = token_cache_key(key)
+        user = cache.get(cache_key)
+        if user is None:
+            try:
+                user = Token.objects.select_related("user").get(key=key).user
+            except Token.DoesNotExist:
+                raise exceptions.AuthenticationFailed("Invalid token.")
+            if not user.is_active:
+                raise exceptions.AuthenticationFailed("User inactive or deleted.")
+            cache.set(cache_key, user, settings.API_TOKEN_CACHE_TIMEOUT)
+        return user, key
+
+
+def evict_token(sender, instance, **kwargs):
+    cache.delete(token_cache_key(instance.key))
+
+
+def evict_user_tokens(sender, instance, **kwargs):
+    # Deactivation or permission changes apply to the next request
+    cache.delete_many(
+        [token_cache_key(key) for key in Token.objects.filter(user=instance).values_list("key", flat=True)]
+    )
+
+
+def is_public_read(request):
+    """Whether `request` is a safe-method request carrying no credentials: no Authorization header, no session."""
+    return (
+        request.method in SAFE_METHODS
+        and "HTTP_AUTHORIZATION" not in request.META
+        and settings.SESSION_COOKIE_NAME not in request.COOKIES
+    )
+
+
+class PublicReadMixin:
+    """
+    View mixin serving anonymous reads without running any authenticator: the
+    session is never loaded and no user is queried. Requests with credentials,
+    and all writes, authenticate as usual.
+    """
+
+    def initialize_request(self, request, *args, **kwargs):
+        drf_request = super().initialize_request(request, *args, **kwargs)
+        if is_public_read(request):
+            drf_request.authenticators = ()
+        return drf_request
+
+
+post_delete.connect(evict_token, sender=Token, dispatch_uid="backend.authentication:token")
+post_save.connect(evict_user_tokens, sender=get_user_model(), dispatch_uid="backend.authentication:user")
@@ -0,0 +1,270 @@
+import base64
+import json
+import random
+import statistics
+import time
+from datetime import date, timedelta
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.authentication import BasicAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from backend.authentication import CachedTokenAuthentication
+from about.models import Achievement, Job
+from about.urls import router as about_router
+from projects.models import Category, Subcategory, Technology, Project
+from projects.urls import router as projects_router
+from projects.views import ProjectViewSet
+
+BATCH_SIZE = 5000
+
+# Relations per row, as (min, max), picked at random for every object
+TECHNOLOGIES_PER_PROJECT = (2, 8)
+TECHNOLOGIES_PER_JOB = (3, 10)
+ACHIEVEMENTS_PER_JOB = (2, 6)
+
+
+def _bulk_through(field, rows):
+    """Insert M2M rows given as (source id, target id) pairs into the through table of `field`."""
+    through = field.remote_field.through
+    source, target = field.m2m_field_name(), field.m2m_reverse_field_name()
+    through.objects.bulk_create(
+        [through(**{f"{source}_id": a, f"{target}_id": b}) for a, b in rows], batch_size=BATCH_SIZE
+    )
+
+
+def seed(scale, random_seed=0):
+    """
+    Create a synthetic portfolio with `scale` technologies, projects and jobs.
+
+    Categories and subcategories grow with the scale, and every project and job
+    links to several technologies, so nested serializers fan out as they do
+    on real data. Signals are not involved: rows are bulk inserted.
+    """
+    rng = random.Random(random_seed)
+    categories = Category.objects.bulk_create(
+        [Category(name=f"Category {i}") for i in range(max(1, scale // 100))], batch_size=BATCH_SIZE
+    )
+    subcategories = Subcategory.objects.bulk_create(
+        [Subcategory(name=f"Subcategory {i}", category=rng.choice(categories)) for i in range(max(1, scale // 10))],
+        batch_size=BATCH_SIZE,
+    )
+    technologies = Technology.objects.bulk_create(
+        [Technology(name=f"Technology {i}", subcategory=rng.choice(subcategories + [None])) for i in range(scale)],
+        batch_size=BATCH_SIZE,
+    )
+    projects = Project.objects.bulk_create(
+        [
+            Project(
+                name=f"Project {i}",
+                description=f"Synthetic project {i} " * 8,
+                category=rng.choice(categories),
+                github=f"https://github.com/example/project-{i}",
+            )
+            for i in range(scale)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    start = date(2000, 1, 1)
+    jobs = Job.objects.bulk_create(
+        [
+            Job(
+                company=f"Company {i}",
+                link=f"https://example.com/{i}",
+                title=f"Engineer {i}",
+                start_date=start + timedelta(days=rng.randrange(9000)),
+                is_current=i == 0,
+            )
+            for i in range(scale)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    Achievement.objects.bulk_create(
+        [
+            Achievement(description=f"Achievement {n} at job {job.pk}", job=job)
+            for job in jobs
+            for n in range(rng.randint(*ACHIEVEMENTS_PER_JOB))
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+    technology_ids = [technology.pk for technology in technologies]
+    _bulk_through(
+        Project._meta.get_field("technology"),
+        [
+            (project.pk, technology)
+            for project in projects
+            for technology in rng.sample(technology_ids, min(scale, rng.randint(*TECHNOLOGIES_PER_PROJECT)))
+        ],
+    )
+    _bulk_through(
+        Job._meta.get_field("technologies"),
+        [
+            (job.pk, technology)
+            for job in jobs
+            for technology in rng.sample(technology_ids, min(scale, rng.randint(*TECHNOLOGIES_PER_JOB)))
+        ],
+    )
+
+
+def router_endpoints():
+    """Return (name, url) for the list, detail and GET detail actions of every registered viewset."""
+    endpoints = []
+    for router in (projects_router, about_router):
+        for _prefix, viewset, basename in router.registry:
+            pk = viewset.queryset.model._default_manager.order_by("pk").values_list("pk", flat=True).first()
+            endpoints.append((f"{basename}-list", reverse(f"{basename}-list")))
+            if pk is None:
+                continue
+            endpoints.append((f"{basename}-detail", reverse(f"{basename}-detail", kwargs={"pk": pk})))
+            for extra in viewset.get_extra_actions():
+                if extra.detail and "get" in extra.mapping:
+                    name = f"{basename}-{extra.url_name}"
+                    endpoints.append((name, reverse(name, kwargs={"pk": pk})))
+    return endpoints
+
+
+def _percentile(samples, percent):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, round(percent / 100 * (len(ordered) - 1)))]
+
+
+def measure(client, url, requests, warm=False):
+    """
+    Request `url` repeatedly and return latency percentiles in milliseconds, queries and bytes per request.
+    The response cache is cleared before each request unless `warm` is set.
+    """
+    timings, queries = [], []
+    size = 0
+    for _ in range(requests):
+        if not warm:
+            cache.clear()
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = client.get(url, secure=True)
+            timings.append((time.perf_counter() - started) * 1000)
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {url} returned {response.status_code}")
+        queries.append(len(captured))
+        size = len(response.content)
+    return {
+        "p50": round(statistics.median(timings), 3),
+        "p95": round(_percentile(timings, 95), 3),
+        "p99": round(_percentile(timings, 99), 3),
+        "queries": max(queries),
+        "bytes": size,
+    }
+
+
+def run_benchmark(scale, requests, warm=False):
+    """Seed `scale` rows and measure every router endpoint as a superuser."""
+    seed(scale)
+    client = APIClient()
+    client.force_authenticate(User.objects.create_superuser("benchmark", "benchmark@example.com", "benchmark"))
+    return {name: measure(client, url, requests, warm) for name, url in router_endpoints()}
+
+
+def measure_writes(rows):
+    """
+    Create `rows` projects, each linked to three technologies, first with one
+    request per project and then with a single bulk/ request.
+    Returns rows per second and queries for both paths.
+    """
+    seed(10)
+    client = APIClient()
+    client.force_authenticate(User.objects.create_superuser("benchmark", "benchmark@example.com", "benchmark"))
+    technology_ids = list(Technology.objects.values_list("pk", flat=True)[:3])
+    payload = [
+        {"name": f"Import {i}", "description": "Imported", "github": "https://g.com/i", "technology": technology_ids}
+        for i in range(rows)
+    ]
+
+    results = {}
+    for path, requests in (
+        ("one-by-one", [(reverse("project-list"), row) for row in payload]),
+        ("bulk", [(reverse("project-bulk"), payload)]),
+    ):
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            for url, data in requests:
+                response = client.post(url, data, format="json", secure=True)
+                if response.status_code != 201:
+                    raise RuntimeError(f"POST {url} returned {response.status_code}")
+            elapsed = time.perf_counter() - started
+        results[path] = {"rows_per_second": round(rows / elapsed, 1), "queries": len(captured)}
+    return results
+
+
+def measure_auth(requests):
+    """
+    Return the CPU milliseconds per warm GET of the project list for each way of
+    calling it: anonymous (no authenticator runs), a cached token, and the Basic
+    authentication used before, which hashes the password on every request.
+    """
+    seed(10)
+    user = User.objects.create_user("benchmark", "benchmark@example.com", "benchmark")
+    token = Token.objects.create(user=user)
+    basic = base64.b64encode(b"benchmark:benchmark").decode()
+    url = reverse("project-list")
+    schemes = (
+        ("anonymous", [CachedTokenAuthentication], {}),
+        ("token", [CachedTokenAuthentication], {"HTTP_AUTHORIZATION": f"Token {token.key}"}),
+        ("basic", [BasicAuthentication], {"HTTP_AUTHORIZATION": f"Basic {basic}"}),
+    )
+
+    client = APIClient()
+    results = {}
+    authentication_classes = ProjectViewSet.authentication_classes
+    try:
+        for name, classes, headers in schemes:
+            ProjectViewSet.authentication_classes = classes
+            # The first request fills the response and token caches
+            client.get(url, secure=True, **headers)
+            started = time.process_time()
+            for _ in range(requests):
+                response = client.get(url, secure=True, **headers)
+                if response.status_code != 200:
+                    raise RuntimeError(f"GET {url} as {name} returned {response.status_code}")
+            results[name] = {"cpu_ms": round((time.process_time() - started) * 1000 / requests, 3)}
+    finally:
+        ProjectViewSet.authentication_classes = authentication_classes
+    return results
+
+
+def check_results(results, baseline=None, latency_tolerance=None):
+    """
+    Return the list of failed checks for `results`, a {scale: {endpoint: metrics}} mapping.
+
+    Query counts must not grow with the dataset: a count that changes between
+    scales means a relation is loaded per row. With a `baseline` in the same
+    shape, query counts must not exceed it, and when `latency_tolerance` is set
+    the p95 latency must stay within that fraction above it.
+    """
+    failures = []
+    scales = sorted(results, key=int)
+    for endpoint in results[scales[0]]:
+        counts = {scale: results[scale][endpoint]["queries"] for scale in scales if endpoint in results[scale]}
+        if len(set(counts.values())) > 1:
+            failures.append(f"{endpoint}: queries grow with the dataset {counts}")
+
+    for scale in scales:
+        for endpoint, metrics in results[scale].items():
+            expected = (baseline or {}).get(scale, {}).get(endpoint)
+            if expected is None:
+                continue
+            if metrics["queries"] > expected["queries"]:
+                failures.append(f"{endpoint} @ {scale}: {metrics['queries']} queries, baseline {expected['queries']}")
+            if latency_tolerance is not None and metrics["p95"] > expected["p95"] * (1 + latency_tolerance):
+                failures.append(f"{endpoint} @ {scale}: p95 {metrics['p95']} ms, baseline {expected['p95']} ms")
+    return failures
+
+
+def load_baseline(path):
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return None
@@ -0,0 +1,317 @@
+from collections.abc import Mapping
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Q
+from django.dispatch import Signal
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from backend.cache import batched_invalidation, bump_generation
+from backend.relations import PreloadedPrimaryKeyRelatedField, preload_related
+from backend.snapshot import schedule_snapshot_build
+
+BATCH_SIZE = 500
+
+# Sent by write_rows inside its transaction with the written `objects` and whether they were created,
+# since bulk writes send no model signals
+rows_written = Signal()
+# Sent by set_many_to_many, with sender the through model, with the `links` queryset it is about to delete
+links_replaced = Signal()
+
+
+def parse_pk(model, value):
+    """Return `value` as a primary key of `model`, e.g. 1 for "1", or None when it is not one."""
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return model._meta.pk.to_python(value)
+    except ValidationError:
+        return None
+
+
+def set_many_to_many(objects, relations, replace):
+    """
+    Write many-to-many relations for `objects` with one insert per relation.
+    `relations[i]` maps relation names to the related objects of `objects[i]`;
+    with `replace`, the existing links of those objects are deleted first,
+    after `links_replaced` is sent. Through-table writes send no model signals,
+    so callers bump the generations.
+    """
+    if not objects:
+        return
+    model = type(objects[0])
+    for name in set().union(*relations):
+        field = model._meta.get_field(name)
+        through = field.remote_field.through
+        source, target = f"{field.m2m_field_name()}_id", f"{field.m2m_reverse_field_name()}_id"
+        linked = [(obj, related[name]) for obj, related in zip(objects, relations) if name in related]
+        if replace:
+            links = through.objects.filter(**{f"{source}__in": [obj.pk for obj, _targets in linked]})
+            links_replaced.send(sender=through, links=links)
+            links.delete()
+        through.objects.bulk_create(
+            [
+                through(**{source: obj.pk, target: target_obj.pk})
+                for obj, targets in linked
+                for target_obj in dict.fromkeys(targets)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+
+
+def set_children(objects, children, replace):
+    """
+    Write reverse foreign key lists, e.g. the achievements of jobs, with one insert.
+    `children[i]` maps accessor names to lists of attribute dicts for `objects[i]`;
+    with `replace`, the existing children of those objects are deleted first.
+    Returns the created children by accessor name.
+    """
+    if not objects:
+        return {}
+    relations = {rel.get_accessor_name(): rel for rel in type(objects[0])._meta.related_objects if rel.one_to_many}
+    created = {}
+    for name in set().union(*children):
+        rel = relations[name]
+        linked = [(obj, rows[name]) for obj, rows in zip(objects, children) if name in rows]
+        if replace:
+            rel.related_model.objects.filter(**{f"{rel.field.name}__in": [obj for obj, _rows in linked]}).delete()
+        created[name] = rel.related_model.objects.bulk_create(
+            [rel.related_model(**attrs, **{rel.field.name: obj}) for obj, rows in linked for attrs in rows],
+            batch_size=BATCH_SIZE,
+        )
+    return created
+
+
+def save_new_related(relations):
+    """
+    Insert the objects created from slugs by `preload_related`, one insert per
+    model. Another request may have created the same slug since it was looked
+    up, so conflicting rows are skipped and every new object takes the primary
+    key of the stored row with the same unique field values, read back with one
+    query per model.
+    """
+    pending = {}
+    for related in relations:
+        for targets in related.values():
+            for obj in targets:
+                if obj.pk is None:
+                    pending.setdefault(type(obj), {})[id(obj)] = obj
+    for model, objects in pending.items():
+        objects = list(objects.values())
+        model.objects.bulk_create(objects, batch_size=BATCH_SIZE, ignore_conflicts=True)
+        fields = [field.attname for field in model._meta.concrete_fields if field.unique and not field.primary_key]
+        lookup = Q()
+        for field in fields:
+            lookup |= Q(**{f"{field}__in": {getattr(obj, field) for obj in objects}})
+        stored = {}
+        for row in model.objects.filter(lookup).order_by("pk"):
+            for field in fields:
+                stored.setdefault((field, getattr(row, field)), row)
+        for obj in objects:
+            row = next(stored[key] for key in ((field, getattr(obj, field)) for field in fields) if key in stored)
+            obj.pk, obj._state.adding, obj._state.db = row.pk, False, row._state.db
+        bump_generation(model)
+
+
+def split_related(model, attrs):
+    """
+    Split the validated `attrs` of one `model` row into column values, the
+    targets of its many-to-many relations and its reverse foreign key lists.
+    """
+    many_to_many = {field.name for field in model._meta.many_to_many}
+    reverse = {rel.get_accessor_name() for rel in model._meta.related_objects if rel.one_to_many}
+    attrs = dict(attrs)
+    attrs.pop("id", None)
+    relations = {name: attrs.pop(name) for name in list(attrs) if name in many_to_many}
+    children = {name: attrs.pop(name) for name in list(attrs) if name in reverse}
+    return attrs, relations, children
+
+
+def write_rows(model, rows, instances=None):
+    """
+    Create one `model` object per validated row, or update `instances` in order,
+    with a constant number of queries: `bulk_create`/`bulk_update` for the
+    columns, one insert per many-to-many or reverse foreign key relation (after
+    deleting the old links on update) and one insert per model for objects
+    created from slugs. Updates only write the columns given in some row, or
+    changed by `prepare_save`, so concurrent writes to other columns are kept.
+    Bulk writes send no model signals, so the generations of the written
+    models are bumped here.
+    """
+    columns = {field.attname: field.name for field in model._meta.concrete_fields if field.editable}
+    objects, relations, children, updated = [], [], [], set()
+    for index, row in enumerate(rows):
+        attrs, row_relations, row_children = split_related(model, row)
+        relations.append(row_relations)
+        children.append(row_children)
+        obj = model() if instances is None else instances[index]
+        for name, value in attrs.items():
+            setattr(obj, name, value)
+        updated.update(attrs)
+        if hasattr(obj, "prepare_save"):
+            before = {attname: getattr(obj, attname) for attname in columns}
+            obj.prepare_save()
+            updated.update(name for attname, name in columns.items() if getattr(obj, attname) != before[attname])
+        objects.append(obj)
+
+    with transaction.atomic(), batched_invalidation():
+        save_new_related(relations)
+        if instances is None:
+            objects = model.objects.bulk_create(objects, batch_size=BATCH_SIZE)
+        else:
+            fields = [name for name in columns.values() if name in updated and name != model._meta.pk.name]
+            if fields:
+                model.objects.bulk_update(objects, fields, batch_size=BATCH_SIZE)
+        set_many_to_many(objects, relations, replace=instances is not None)
+        set_children(objects, children, replace=instances is not None)
+        rows_written.send(sender=model, objects=objects, created=instances is None)
+        bump_generation(model)
+        for name in set().union(*children):
+            bump_generation(model._meta.get_field(name).related_model)
+        schedule_snapshot_build()
+    return objects
+
+
+def save_row(instance, validated_data, created):
+    """
+    Write one validated row to `instance` with `save()`, so model `save()`
+    overrides and signal receivers run as for any other save. Many-to-many
+    relations are set through their managers, which send `m2m_changed`, and
+    child lists are written with one insert, reported to `rows_written`.
+    """
+    model = type(instance)
+    attrs, relations, children = split_related(model, validated_data)
+    with transaction.atomic(), batched_invalidation():
+        save_new_related([relations])
+        for name, value in attrs.items():
+            setattr(instance, name, value)
+        instance.save()
+        for name, targets in relations.items():
+            getattr(instance, name).set(targets)
+        for name, objects in set_children([instance], [children], replace=not created).items():
+            child_model = model._meta.get_field(name).related_model
+            rows_written.send(sender=child_model, objects=objects, created=True)
+            bump_generation(child_model)
+    return instance
+
+
+class BulkListSerializer(serializers.ListSerializer):
+    """
+    ListSerializer that validates rows in a batch and writes them with `write_rows`.
+
+    Relation fields built on `PreloadedPrimaryKeyRelatedField` are resolved with
+    one query per field for the whole list. For updates, `instance` is a list of
+    objects and every row carries the `id` of a different object it updates.
+    """
+
+    def to_internal_value(self, data):
+        if self.instance is not None:
+            self.instance_map = {obj.pk: obj for obj in self.instance}
+            self.seen_ids = set()
+        with preload_related(self.child, data if isinstance(data, list) else []):
+            return super().to_internal_value(data)
+
+    def run_child_validation(self, data):
+        if self.instance is None:
+            return super().run_child_validation(data)
+        pk = parse_pk(self.child.Meta.model, data.get("id") if isinstance(data, Mapping) else None)
+        if pk is None:
+            raise serializers.ValidationError({"id": ["A valid id is required."]})
+        instance = self.instance_map.get(pk)
+        if instance is None:
+            raise serializers.ValidationError({"id": [f"Object with id={pk} does not exist."]})
+        if instance.pk in self.seen_ids:
+            raise serializers.ValidationError({"id": [f"Object with id={pk} is listed more than once."]})
+        self.seen_ids.add(instance.pk)
+        self.child.instance = instance
+        self.child.initial_data = data
+        try:
+            validated = super().run_child_validation(data)
+        finally:
+            self.child.instance = None
+        return {**validated, "id": instance.pk}
+
+    def create(self, validated_data):
+        return write_rows(self.child.Meta.model, validated_data)
+
+    def update(self, instances, validated_data):
+        objects = [self.instance_map[attrs["id"]] for attrs in validated_data]
+        return write_rows(self.child.Meta.model, validated_data, objects)
+
+
+class BulkModelSerializer(serializers.ModelSerializer):
+    """
+    ModelSerializer for the bulk endpoints, whose list payloads are written with
+    `write_rows`. Single-object creates and updates are saved with `save_row`,
+    so model `save()` overrides and signals run. In both, nested relations given
+    by id, slug or as child lists are written in one transaction with a constant
+    number of queries.
+    """
+
+    serializer_related_field = PreloadedPrimaryKeyRelatedField
+
+    def to_internal_value(self, data):
+        if isinstance(self.parent, BulkListSerializer):
+            # Already preloaded for the whole list
+            return super().to_internal_value(data)
+        with preload_related(self, [data]):
+            return super().to_internal_value(data)
+
+    def create(self, validated_data):
+        return save_row(self.Meta.model(), validated_data, created=True)
+
+    def update(self, instance, validated_data):
+        return save_row(instance, validated_data, created=False)
+
+
+class BulkWriteMixin:
+    """
+    Viewset mixin adding `POST`, `PATCH` and `DELETE` on `<prefix>/bulk/`.
+
+    Creates and updates take a list of objects, deletes a list of ids, each
+    applied in one transaction with at most `API_MAX_BULK_SIZE` rows.
+    """
+
+    def get_bulk_serializer(self, *args, **kwargs):
+        return self.get_serializer(*args, many=True, max_length=settings.API_MAX_BULK_SIZE, **kwargs)
+
+    def bulk_response(self, objects, status_code):
+        # Reload through the query plan so the nested relations render without extra queries
+        queryset = self.get_queryset().filter(pk__in=[obj.pk for obj in objects]).order_by("pk")
+        return Response(self.get_serializer(queryset, many=True).data, status=status_code)
+
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request, *args, **kwargs):
+        serializer = self.get_bulk_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        objects = serializer.save()
+        return self.bulk_response(objects, status.HTTP_201_CREATED)
+
+    @bulk.mapping.patch
+    def bulk_update(self, request, *args, **kwargs):
+        rows = request.data if isinstance(request.data, list) else []
+        # Normalized as run_child_validation does, so "1" finds the object with id 1
+        model = self.queryset.model
+        ids = {parse_pk(model, row.get("id")) for row in rows if isinstance(row, Mapping)} - {None}
+        instances = list(self.filter_queryset(self.queryset.all()).filter(pk__in=ids))
+        serializer = self.get_bulk_serializer(instances, data=request.data, partial=True)
+        serializer.is_valid(raise_exception=True)
+        objects = serializer.save()
+        return self.bulk_response(objects, status.HTTP_200_OK)
+
+    @bulk.mapping.delete
+    def bulk_destroy(self, request, *args, **kwargs):
+        ids = request.data
+        if not isinstance(ids, list) or not all(isinstance(pk, int) and not isinstance(pk, bool) for pk in ids):
+            raise serializers.ValidationError({api_settings.NON_FIELD_ERRORS_KEY: ["Expected a list of ids."]})
+        if len(ids) > settings.API_MAX_BULK_SIZE:
+            message = f"Ensure there are no more than {settings.API_MAX_BULK_SIZE} ids."
+            raise serializers.ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [message]})
+
+        # Deletes cascade through model signals; they are collapsed to one bump per model
+        model = self.queryset.model
+        with transaction.atomic(), batched_invalidation():
+            _total, deleted = self.filter_queryset(self.queryset.all()).filter(pk__in=ids).delete()
+        return Response({"deleted": deleted.get(model._meta.label, 0)}, status=status.HTTP_200_OK)
@@ -0,0 +1,318 @@
+import hashlib
+import time
+import weakref
+from contextlib import contextmanager
+from contextvars import ContextVar
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from backend.compression import compress_response, negotiate_encoding, set_encoding_headers
+from backend.db_routers import pin_primary
+from backend.instrumentation import count_cache_result
+
+HITS_KEY = "api-cache:hits"
+MISSES_KEY = "api-cache:misses"
+
+_batch = ContextVar("invalidation_batch", default=None)
+# Callbacks waiting for the current transaction of each connection, by key. Only Django's list of
+# on-commit callbacks keeps them alive, so a callback dropped by a rollback disappears from here too.
+_pending_callbacks = weakref.WeakKeyDictionary()
+
+
+def generation_key(model):
+    return f"generation:{model._meta.label_lower}"
+
+
+def modified_key(model):
+    return f"modified:{model._meta.label_lower}"
+
+
+def _incr(key, start=0):
+    """Atomically increment a counter that never expires, creating it from `start` if needed."""
+    try:
+        return cache.incr(key)
+    except ValueError:
+        if cache.add(key, start + 1, timeout=None):
+            return start + 1
+        return cache.incr(key)
+
+
+def _touch(model):
+    # Seed missing generations from the clock so an evicted counter never repeats an old value
+    _incr(generation_key(model), start=time.time_ns())
+    cache.set(modified_key(model), time.time(), timeout=None)
+    pin_primary()
+
+
+def bump_generation(model):
+    """
+    Invalidate every cached response that depends on `model`.
+    The counter is bumped right away and again once the surrounding transaction
+    commits, so a response rendered from pre-commit data is never stored under
+    the final generation. Each bump also pins reads to the primary database for
+    a while, so a lagging replica cannot fill the cache with old rows.
+    """
+    batch = _batch.get()
+    if batch is not None:
+        batch["models"].add(model)
+        return
+    _touch(model)
+    transaction.on_commit(lambda: _touch(model))
+
+
+class PendingCallback:
+    """
+    On-commit callback that later calls in the same transaction can find with
+    `pending()` and add to, instead of registering another callback, e.g. to
+    refresh every object written in a transaction at once. Subclasses implement
+    `run`. Outside a transaction, `register` runs it right away.
+    """
+
+    robust = False
+
+    def __init__(self):
+        self.done = False
+
+    def __call__(self):
+        if not self.done:
+            self.done = True
+            self.run()
+
+    def run(self):
+        raise NotImplementedError
+
+    @classmethod
+    def pending(cls, key=None):
+        """The callback registered for `key` (the class by default) that has not run yet, or None."""
+        callbacks = _pending_callbacks.get(transaction.get_connection(), {})
+        callback = callbacks.get(cls if key is None else key)
+        return callback if callback is not None and not callback.done else None
+
+    def register(self, key=None):
+        connection = transaction.get_connection()
+        _pending_callbacks.setdefault(connection, weakref.WeakValueDictionary())[
+            type(self) if key is None else key
+        ] = self
+        transaction.on_commit(self, robust=self.robust)
+
+
+class PendingIds(PendingCallback):
+    """On-commit callback calling `func` once with the ids collected while it was pending."""
+
+    def __init__(self, func):
+        super().__init__()
+        self.func = func
+        self.ids = set()
+
+    def run(self):
+        self.func(set(self.ids))
+
+
+def on_commit_with_ids(func, ids):
+    """
+    Call `func` with `ids` when the current transaction commits. Calls for the
+    same `func` in that transaction add to one pending call, so e.g. a bulk write
+    or a cascading delete refreshes each object once. Outside a transaction
+    `func` runs right away.
+    """
+    pending = PendingIds.pending(func)
+    if pending is None:
+        pending = PendingIds(func)
+        pending.ids.update(ids)
+        pending.register(func)
+    else:
+        # Ids added inside a savepoint that rolls back are passed on anyway, which is harmless
+        pending.ids.update(ids)
+
+
+class AfterBumps(PendingCallback):
+    robust = True
+
+    def __init__(self, func):
+        super().__init__()
+        self.func = func
+
+    def run(self):
+        self.func()
+
+
+def on_commit_after_bumps(func):
+    """
+    Run `func` once when the current transaction commits, after every generation
+    bump registered so far, e.g. to rebuild a document keyed by generations.
+    Scheduling it again moves it behind the newer bumps instead of adding a run.
+    """
+    batch = _batch.get()
+    if batch is not None:
+        batch["callbacks"][func] = None
+        return
+    # The earlier registration is skipped. If the savepoint of the new one rolls back, the
+    # rebuild is skipped and readers build lazily
+    previous = AfterBumps.pending(func)
+    if previous is not None:
+        previous.done = True
+    AfterBumps(func).register(func)
+
+
+@contextmanager
+def batched_invalidation():
+    """
+    Collect the generation bumps and `on_commit_after_bumps` callbacks made inside
+    the block, e.g. by model signals during a cascading delete, and apply each once
+    at the end.
+    """
+    batch = {"models": set(), "callbacks": {}}
+    token = _batch.set(batch)
+    try:
+        yield
+    finally:
+        _batch.reset(token)
+        for model in batch["models"]:
+            bump_generation(model)
+        for func in batch["callbacks"]:
+            on_commit_after_bumps(func)
+
+
+def _marker_keys(models):
+    return [generation_key(model) for model in models] + [modified_key(model) for model in models]
+
+
+def _initial_marker(key):
+    return time.time_ns() if key.startswith("generation:") else time.time()
+
+
+def _split_markers(models, markers):
+    values = [markers[key] for key in _marker_keys(models)]
+    return values[: len(models)], max(values[len(models) :], default=None)
+
+
+def get_change_markers(models):
+    """
+    Return the generation of each model, in order, and the latest modification time
+    across them, with one cache round trip. Missing markers are seeded with the
+    current time, which can only make clients refetch.
+    """
+    markers = cache.get_many(_marker_keys(models))
+    for key in _marker_keys(models):
+        if key not in markers:
+            cache.add(key, _initial_marker(key), timeout=None)
+            markers[key] = cache.get(key)
+    return _split_markers(models, markers)
+
+
+async def aget_change_markers(models):
+    """Async counterpart of `get_change_markers`."""
+    markers = await cache.aget_many(_marker_keys(models))
+    for key in _marker_keys(models):
+        if key not in markers:
+            await cache.aadd(key, _initial_marker(key), timeout=None)
+            markers[key] = await cache.aget(key)
+    return _split_markers(models, markers)
+
+
+def record_cache_result(hit):
+    count_cache_result(hit)
+    _incr(HITS_KEY if hit else MISSES_KEY)
+
+
+def get_cache_stats():
+    counts = cache.get_many([HITS_KEY, MISSES_KEY])
+    hits = counts.get(HITS_KEY, 0)
+    misses = counts.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {"hits": hits, "misses": misses, "hit_ratio": hits / total if total else None}
+
+
+class CachedResponseMixin:
+    """
+    Viewset mixin that caches rendered list and retrieve responses.
+
+    Keys include the generation of every model in `cache_models`, which model
+    signals bump on each change, so a cached body is never served after an edit.
+    The same markers give a strong ETag and a Last-Modified date, so conditional
+    requests are answered with 304 before any query or serializer runs.
+    Bodies are stored compressed with the encoding negotiated for the request,
+    so hits are served without compressing them again.
+    Authentication and permission checks still run before the cache is consulted.
+    """
+
+    cache_models = ()
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    def get_response_cache_key(self, request, encoding, generations):
+        url = hashlib.sha1(request.build_absolute_uri().encode()).hexdigest()
+        generations = ".".join(str(generation) for generation in generations)
+        return (
+            f"api:{self.basename}:{self.action}:{request.accepted_renderer.format}:{encoding or 'identity'}:"
+            f"{url}:{generations}"
+        )
+
+    def get_validators(self, request, encoding, generations, last_modified):
+        """Return the cache key, ETag and Last-Modified timestamp for the encoding and current markers."""
+        key = self.get_response_cache_key(request, encoding, generations)
+        return key, quote_etag(hashlib.sha1(key.encode()).hexdigest()), int(last_modified)
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        encoding = negotiate_encoding(request)
+        key, etag, last_modified = self.get_validators(request, encoding, *get_change_markers(self.cache_models))
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            cached = cache.get(key)
+            record_cache_result(cached is not None)
+            if cached is not None:
+                response = self.hit_response(cached)
+            else:
+                response = self.miss_response(key, encoding, handler(request, *args, **kwargs))
+        return self.set_validators(response, etag, last_modified)
+
+    async def acached_response(self, handler, request, *args, **kwargs):
+        """Async counterpart of `cached_response` for coroutine handlers."""
+        encoding = negotiate_encoding(request)
+        markers = await aget_change_markers(self.cache_models)
+        key, etag, last_modified = self.get_validators(request, encoding, *markers)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            cached = await cache.aget(key)
+            await sync_to_async(record_cache_result)(cached is not None)
+            if cached is not None:
+                response = self.hit_response(cached)
+            else:
+                response = self.miss_response(key, encoding, await handler(request, *args, **kwargs))
+        return self.set_validators(response, etag, last_modified)
+
+    def hit_response(self, cached):
+        content, content_type, encoding = cached
+        response = HttpResponse(content, content_type=content_type)
+        set_encoding_headers(response, encoding)
+        response["X-Cache"] = "HIT"
+        return response
+
+    def miss_response(self, key, encoding, response):
+        if response.status_code == 200:
+
+            def store(rendered):
+                # Compressed once here; the compression middleware skips encoded bodies
+                applied = compress_response(rendered, encoding)
+                set_encoding_headers(rendered, applied)
+                cache.set(key, (rendered.content, rendered["Content-Type"], applied), settings.API_CACHE_TIMEOUT)
+
+            response.add_post_render_callback(store)
+        response["X-Cache"] = "MISS"
+        return response
+
+    def set_validators(self, response, etag, last_modified):
+        if response.status_code in (200, 304):
+            response["ETag"] = etag
+            response["Last-Modified"] = http_date(last_modified)
+            # Let browsers keep the body but revalidate it on every use
+            response["Cache-Control"] = "no-cache"
+        return response
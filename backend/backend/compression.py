@@ -0,0 +1,108 @@
+import gzip
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+# Content types worth compressing; images and archives are compressed already
+COMPRESSIBLE_TYPES = ("application/json", "application/javascript", "application/xml", "text/")
+
+
+def supported_encodings():
+    """Return the encodings this process can produce, preferred first."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(request):
+    """
+    Return the best encoding accepted by `request` ("br" or "gzip"), or None
+    for an uncompressed response. Quality values are honoured, `q=0` refuses
+    an encoding, `*` stands for the encodings not listed, and brotli wins ties.
+    """
+    if not settings.API_COMPRESSION:
+        return None
+    accepted = {}
+    for item in request.headers.get("Accept-Encoding", "").split(","):
+        name, _sep, params = item.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _sep, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name:
+            accepted[name.strip().lower()] = quality
+    candidates = [
+        (accepted.get(encoding, accepted.get("*", 0.0)), -rank, encoding)
+        for rank, encoding in enumerate(supported_encodings())
+    ]
+    quality, _rank, encoding = max(candidates)
+    return encoding if quality > 0 else None
+
+
+def compress(content, encoding):
+    """Compress `content` with `encoding` at the levels set for live responses."""
+    if encoding == "br":
+        return brotli.compress(content, mode=brotli.MODE_TEXT, quality=settings.API_COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(content, compresslevel=settings.API_COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+def is_compressible(response):
+    if response.streaming or response.has_header("Content-Encoding"):
+        return False
+    if "no-transform" in response.get("Cache-Control", ""):
+        return False
+    if len(response.content) < settings.API_COMPRESSION_MIN_SIZE:
+        return False
+    return response.get("Content-Type", "").startswith(COMPRESSIBLE_TYPES)
+
+
+def compress_response(response, encoding):
+    """
+    Compress the body of `response` in place with `encoding` when it is worth it,
+    and return the encoding applied, or None when the body was left as it is.
+    """
+    if encoding is None or not is_compressible(response):
+        return None
+    compressed = compress(response.content, encoding)
+    if len(compressed) >= len(response.content):
+        return None
+    response.content = compressed
+    response["Content-Length"] = str(len(compressed))
+    response["Content-Encoding"] = encoding
+    return encoding
+
+
+def set_encoding_headers(response, encoding):
+    """Mark `response` as encoded with `encoding`, if any, and as varying with Accept-Encoding."""
+    if encoding is not None:
+        response["Content-Encoding"] = encoding
+    patch_vary_headers(response, ("Accept-Encoding",))
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compress responses with brotli or gzip, as negotiated with Accept-Encoding,
+    once they reach `API_COMPRESSION_MIN_SIZE` bytes.
+
+    Responses already encoded, e.g. cached bodies stored compressed by
+    CachedResponseMixin or the snapshot, pass through untouched. As with Django's
+    GZipMiddleware, strong ETags of compressed bodies are weakened, since the bytes
+    differ from the uncompressed representation.
+    """
+
+    def process_response(self, request, response):
+        if not settings.API_COMPRESSION or not is_compressible(response):
+            return response
+        patch_vary_headers(response, ("Accept-Encoding",))
+        if compress_response(response, negotiate_encoding(request)) is not None:
+            etag = response.get("ETag")
+            if etag and etag.startswith('"'):
+                response["ETag"] = "W/" + etag
+        return response
@@ -0,0 +1,69 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+
+REPLICA_ALIAS = "replica"
+PIN_PRIMARY_KEY = "db:pin-primary"
+
+_use_replica = ContextVar("use_replica", default=False)
+
+
+def replica_configured():
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+def pin_primary():
+    """Send reads to the primary for `DB_REPLICA_LAG` seconds, so they see a write that just happened."""
+    if replica_configured():
+        cache.set(PIN_PRIMARY_KEY, True, settings.DB_REPLICA_LAG)
+
+
+@contextmanager
+def use_replica(enabled=True):
+    token = _use_replica.set(enabled)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Route reads to the replica alias inside `use_replica()`, and everything else
+    to the default database. Without a replica configured it never chooses.
+    """
+
+    def db_for_read(self, model, **hints):
+        if _use_replica.get() and replica_configured():
+            return REPLICA_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != REPLICA_ALIAS
+
+
+class ReplicaReadMixin:
+    """
+    Viewset mixin that reads from the replica for GET, HEAD and OPTIONS requests,
+    unless a recent write pinned reads to the primary.
+    """
+
+    def can_use_replica(self, request):
+        return request.method in SAFE_METHODS and replica_configured()
+
+    def dispatch(self, request, *args, **kwargs):
+        with use_replica(self.can_use_replica(request) and not cache.get(PIN_PRIMARY_KEY)):
+            return super().dispatch(request, *args, **kwargs)
+
+    async def adispatch(self, actions, request, *args, **kwargs):
+        with use_replica(self.can_use_replica(request) and not await cache.aget(PIN_PRIMARY_KEY)):
+            return await super().adispatch(actions, request, *args, **kwargs)
@@ -0,0 +1,226 @@
+import fcntl
+import gzip
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from django.conf import settings
+from django.db import connections
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+from rest_framework.renderers import JSONRenderer
+from backend.internal import InternalClient
+from tasks.queue import register_task
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+# URL modules whose GET endpoints are exported, and routes that must always reach Django
+EXPORT_URLCONFS = ("projects.urls", "about.urls")
+EXCLUDED_URL_NAMES = {"api-root", "health-check", "readiness-check", "cache-stats"}
+# Pagination links, made relative so the exported pages are right on every host
+LINK_KEYS = ("next", "previous")
+
+logger = logging.getLogger("backend.export")
+
+_lock = threading.Lock()
+_pending = threading.Event()
+
+
+def _patterns(urlconf):
+    for pattern in get_resolver(urlconf).url_patterns:
+        if isinstance(pattern, URLResolver):
+            continue
+        if pattern.name and pattern.name not in EXCLUDED_URL_NAMES and _serves_get(pattern):
+            yield pattern
+
+
+def _serves_get(pattern):
+    # Viewset routes list their methods, e.g. the write-only bulk/ routes have no "get"
+    actions = getattr(pattern.callback, "actions", None)
+    if actions is not None:
+        return "get" in actions
+    view = getattr(pattern.callback, "view_class", None) or getattr(pattern.callback, "cls", None)
+    return view is None or hasattr(view, "get")
+
+
+def export_paths():
+    """
+    Every GET path served by the exported URL modules: each route without
+    arguments once, and each detail route (including detail actions) once per
+    object of its viewset's queryset. Format-suffix variants are skipped.
+    """
+    paths = []
+    for urlconf in EXPORT_URLCONFS:
+        for pattern in _patterns(urlconf):
+            groups = set(pattern.pattern.regex.groupindex)
+            if not groups:
+                paths.append(reverse(pattern.name))
+            elif groups == {"pk"} and isinstance(pattern, URLPattern):
+                viewset = getattr(pattern.callback, "cls", None)
+                if viewset is not None:
+                    for pk in viewset.queryset.order_by("pk").values_list("pk", flat=True):
+                        paths.append(reverse(pattern.name, kwargs={"pk": pk}))
+    return list(dict.fromkeys(paths))
+
+
+def _link(link, target):
+    """Point `link` at `target` with a relative symlink, replacing any previous link atomically."""
+    link.parent.mkdir(parents=True, exist_ok=True)
+    tmp = link.with_name(f".{link.name}.tmp")
+    if tmp.is_symlink() or tmp.exists():
+        tmp.unlink()
+    tmp.symlink_to(os.path.relpath(target, link.parent))
+    os.replace(tmp, link)
+
+
+@contextmanager
+def _export_lock(root):
+    """
+    Hold an exclusive lock on `root` across processes and containers sharing
+    the directory, so exports from several workers run one after the other.
+    """
+    root.mkdir(parents=True, exist_ok=True)
+    with open(root / ".lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _prune(root, keep):
+    """Remove every build but `keep`, and entries left by unfinished exports or older layouts."""
+    for entry in root.iterdir():
+        if entry.name in (".lock", "current"):
+            continue
+        if entry.name == "builds":
+            for build in entry.iterdir():
+                if build != keep:
+                    shutil.rmtree(build, ignore_errors=True)
+        elif entry.is_dir() and not entry.is_symlink():
+            shutil.rmtree(entry, ignore_errors=True)
+        else:
+            entry.unlink()
+
+
+class ExportError(Exception):
+    """An exported endpoint did not answer an anonymous GET with JSON; nothing is published."""
+
+
+def _relative_links(content, host):
+    """Strip the `https://<host>` origin from the pagination links of a JSON page."""
+    data = json.loads(content)
+    if not isinstance(data, dict):
+        return content
+    origin = f"https://{host}"
+    links = {
+        key: data[key][len(origin) :]
+        for key in LINK_KEYS
+        if isinstance(data.get(key), str) and data[key].startswith(f"{origin}/")
+    }
+    return JSONRenderer().render({**data, **links}) if links else content
+
+
+def _render(build, host):
+    files_dir = build / "files"
+    files_dir.mkdir()
+    client = InternalClient(host)
+    manifest = {"generated": time.time(), "paths": {}}
+
+    for path in export_paths():
+        response = client.get(path, HTTP_ACCEPT="application/json")
+        if response.status_code != 200 or not response.get("Content-Type", "").startswith("application/json"):
+            raise ExportError(f"GET {path} answered {response.status_code} {response.get('Content-Type', '')}")
+        content = _relative_links(response.content, host)
+        digest = hashlib.sha256(content).hexdigest()
+        name = f"{path.strip('/').replace('/', '-') or 'index'}.{digest[:12]}.json"
+        variants = {"": content, ".gz": gzip.compress(content, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            variants[".br"] = brotli.compress(content, quality=11)
+        for suffix, body in variants.items():
+            (files_dir / f"{name}{suffix}").write_bytes(body)
+            _link(build / path.lstrip("/") / f"index.json{suffix}", files_dir / f"{name}{suffix}")
+        manifest["paths"][path] = {
+            "file": f"files/{name}",
+            "sha256": digest,
+            "bytes": {suffix.lstrip(".") or "identity": len(body) for suffix, body in variants.items()},
+        }
+
+    (build / "manifest.json").write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    return manifest
+
+
+def export_api(root, host="localhost"):
+    """
+    Render every exported endpoint as an anonymous client into a new build
+    under `root/builds/`, then publish it by swapping the `root/current`
+    symlink, which nginx serves from. A build holds:
+
+    - `files/<name>.<hash>.json` plus `.gz` and `.br` (when brotli is installed)
+      variants, named by content hash so they can be cached forever;
+    - `<url path>/index.json[.gz|.br]` links to those files, for nginx;
+    - `manifest.json`, mapping each URL path to its files.
+
+    Readers see either the previous build or the new one, never a mix. Exports
+    take a lock on `root`, so exports from other processes wait for each other.
+    Every exported endpoint must answer 200 with JSON, or ExportError is raised
+    and the previous build stays published: routes that are not public belong
+    in EXCLUDED_URL_NAMES. List endpoints export their first page, with
+    relative `next` and `previous` links; requests with a query string still
+    go to Django.
+    """
+    root = Path(root)
+    with _export_lock(root):
+        builds = root / "builds"
+        builds.mkdir(exist_ok=True)
+        build = Path(tempfile.mkdtemp(dir=builds, prefix=time.strftime("%Y%m%dT%H%M%S-")))
+        try:
+            manifest = _render(build, host)
+        except BaseException:
+            shutil.rmtree(build, ignore_errors=True)
+            raise
+        os.chmod(build, 0o755)
+        _link(root / "current", build)
+        _prune(root, keep=build)
+    return manifest
+
+
+# Exports rewrite every file, so bursts of changes are debounced for longer than other tasks
+@register_task("api.export", debounce=5.0, max_wait=60.0)
+def export_current():
+    export_api(settings.API_EXPORT_ROOT, settings.API_EXPORT_HOST)
+
+
+def _export_loop():
+    try:
+        while _pending.is_set():
+            _pending.clear()
+            try:
+                export_current()
+            except Exception:
+                # The previous export stays published; the next change tries again
+                logger.exception("API export failed")
+    finally:
+        connections.close_all()
+        _lock.release()
+    # A change committed between the last check and the release still gets its export
+    if _pending.is_set():
+        schedule_export()
+
+
+def schedule_export():
+    """
+    Re-export the API in a background thread, outside the request that changed
+    the data. Changes made while an export runs are picked up by one more run.
+    """
+    _pending.set()
+    if _lock.acquire(blocking=False):
+        threading.Thread(target=_export_loop, name="api-export", daemon=True).start()
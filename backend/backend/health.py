@@ -0,0 +1,103 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from backend import warmup
+
+# One thread per dependency: its database connection is reused between checks, and a
+# hung dependency only blocks its own checks, which then time out.
+_executors = {
+    "database": ThreadPoolExecutor(max_workers=1, thread_name_prefix="health-database"),
+    "cache": ThreadPoolExecutor(max_workers=1, thread_name_prefix="health-cache"),
+    "warmup": ThreadPoolExecutor(max_workers=1, thread_name_prefix="health-warmup"),
+}
+
+_lock = threading.Lock()
+_last_result = None
+_last_checked = 0.0
+_migrations_applied = False
+
+
+def check_database():
+    connection.close_if_unusable_or_obsolete()
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+
+
+def check_migrations():
+    # Applied migrations stay applied, so once this passes it is not queried again
+    global _migrations_applied
+    if not _migrations_applied:
+        executor = MigrationExecutor(connection)
+        if executor.migration_plan(executor.loader.graph.leaf_nodes()):
+            raise RuntimeError("unapplied migrations")
+        _migrations_applied = True
+
+
+def check_cache():
+    """Ping Redis through the default cache, or round-trip a key on other backends."""
+    backend = getattr(cache, "_cache", None)
+    if hasattr(backend, "get_client"):
+        backend.get_client(write=True).ping()
+        return
+    cache.set("health:ping", 1, 10)
+    if cache.get("health:ping") != 1:
+        raise RuntimeError("cache round trip failed")
+
+
+def check_warmup():
+    """
+    With `STARTUP_WARMUP`, stay unready until this process has primed the hot
+    caches. Gunicorn workers fork warm from a preloading master; other processes,
+    or workers whose master failed to warm up, warm up here.
+    """
+    if settings.STARTUP_WARMUP:
+        warmup.ensure_warm()
+
+
+CHECKS = (
+    ("database", "database", check_database),
+    ("migrations", "database", check_migrations),
+    ("cache", "cache", check_cache),
+    ("warmup", "warmup", check_warmup),
+)
+
+
+def _timed(executor, check, timeout):
+    started = time.perf_counter()
+    try:
+        _executors[executor].submit(check).result(timeout=timeout)
+        result = {"ok": True}
+    except TimeoutError:
+        result = {"ok": False, "error": f"timed out after {timeout}s"}
+    except Exception as exc:
+        result = {"ok": False, "error": str(exc) or exc.__class__.__name__}
+    result["latency_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return result
+
+
+def run_checks():
+    """
+    Time every dependency check and return {name: {"ok", "latency_ms", "error"?}}.
+    Results are reused for `HEALTH_CHECK_CACHE_SECONDS`, and concurrent callers
+    wait for the run in progress, so polling never multiplies the load.
+    """
+    global _last_result, _last_checked
+    with _lock:
+        if _last_result is None or time.monotonic() - _last_checked >= settings.HEALTH_CHECK_CACHE_SECONDS:
+            _last_result = {
+                name: _timed(executor, check, settings.HEALTH_CHECK_TIMEOUT) for name, executor, check in CHECKS
+            }
+            _last_checked = time.monotonic()
+        return _last_result
+
+
+def reset():
+    """Forget cached results, e.g. between tests."""
+    global _last_result, _migrations_applied
+    with _lock:
+        _last_result = None
+        _migrations_applied = False
@@ -0,0 +1,163 @@
+import logging
+import time
+from contextvars import ContextVar
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from backend.metrics import record_request, requests_in_progress
+
+logger = logging.getLogger("backend.performance")
+
+_current = ContextVar("request_metrics", default=None)
+
+
+class RequestMetrics:
+    """Timings and counters collected while one request is handled."""
+
+    __slots__ = ("started", "queries", "db_time", "cache_hits", "cache_misses", "view_started", "view_db", "view_ended")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.view_started = None
+        self.view_db = 0.0
+        self.view_ended = None
+
+    def phases(self, ended):
+        """Return (db, serialize, render, total) durations in milliseconds."""
+        view_ended = self.view_ended or ended
+        serialize = render = 0.0
+        if self.view_started is not None:
+            # View time outside the database; for the API views this is the serializers
+            serialize = max(0.0, view_ended - self.view_started - (self.db_time - self.view_db))
+            render = ended - view_ended
+        return tuple(round(value * 1000, 2) for value in (self.db_time, serialize, render, ended - self.started))
+
+
+def count_cache_result(hit):
+    metrics = _current.get()
+    if metrics is not None:
+        if hit:
+            metrics.cache_hits += 1
+        else:
+            metrics.cache_misses += 1
+
+
+def track_query(execute, sql, params, many, context):
+    """Database execute wrapper that adds each query to the current request's metrics."""
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.db_time += time.perf_counter() - started
+
+
+def install_query_tracking(connection, **kwargs):
+    if track_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(track_query)
+
+
+class PerformanceMiddleware:
+    """
+    Measure every request and report where its time went.
+
+    Query count and database time come from an execute wrapper installed on each
+    connection, serializer time is the view's time outside the database, and
+    render time runs from the end of the view until the response is rendered.
+    The numbers are sent in a `Server-Timing` header, logged as one logfmt line
+    per request (at WARNING when the request exceeds `PERF_QUERY_BUDGET` or
+    `PERF_LATENCY_BUDGET_MS`) and exported to Prometheus by route name.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.PERF_INSTRUMENTATION:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        connection_created.connect(install_query_tracking, dispatch_uid="backend.instrumentation")
+        for connection in connections.all(initialized_only=True):
+            install_query_tracking(connection)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            with requests_in_progress():
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.report(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            with requests_in_progress():
+                response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.report(request, response, metrics)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.view_started = time.perf_counter()
+            metrics.view_db = metrics.db_time
+
+    def process_template_response(self, request, response):
+        # Called after the view returns and before the response is rendered
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.view_ended = time.perf_counter()
+        return response
+
+    def report(self, request, response, metrics):
+        db, serialize, render, total = metrics.phases(time.perf_counter())
+        record_request(request, response, metrics, serialize, total)
+        response["Server-Timing"] = ", ".join(
+            [
+                f'db;dur={db};desc="{metrics.queries} queries"',
+                f"serialize;dur={serialize}",
+                f"render;dur={render}",
+                f'cache;desc="{metrics.cache_hits} hits {metrics.cache_misses} misses"',
+                f"total;dur={total}",
+            ]
+        )
+
+        over_budget = []
+        if metrics.queries > settings.PERF_QUERY_BUDGET:
+            over_budget.append("queries")
+        if total > settings.PERF_LATENCY_BUDGET_MS:
+            over_budget.append("latency")
+        logger.log(
+            logging.WARNING if over_budget else logging.INFO,
+            'method=%s path="%s" status=%s total_ms=%s db_ms=%s queries=%s serialize_ms=%s render_ms=%s '
+            "cache_hits=%s cache_misses=%s over_budget=%s",
+            request.method,
+            request.path,
+            response.status_code,
+            total,
+            db,
+            metrics.queries,
+            serialize,
+            render,
+            metrics.cache_hits,
+            metrics.cache_misses,
+            ",".join(over_budget) or "none",
+        )
+        return response
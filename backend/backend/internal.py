@@ -0,0 +1,50 @@
+import io
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler, WSGIRequest
+
+# WSGI environ key marking the requests the backend renders for itself. Servers
+# pass client headers as HTTP_* keys only, so no outside request can carry it.
+INTERNAL_REQUEST = "backend.internal_request"
+
+
+def is_internal(request):
+    """Whether `request` was rendered by an InternalClient."""
+    return bool(request.META.get(INTERNAL_REQUEST))
+
+
+class InternalClient:
+    """
+    Render anonymous HTTPS GET requests for `host` in-process, through the
+    same middleware and views as outside requests, for the static export and
+    the startup warmup. The requests are marked internal, so rate limits skip
+    them.
+
+    No request_started or request_finished signal is sent: those close the
+    database connections of the calling thread, which belong to the caller.
+    """
+
+    def __init__(self, host):
+        self.host = host
+        self.handler = WSGIHandler()
+
+    def get(self, path, **headers):
+        environ = {
+            "REQUEST_METHOD": "GET",
+            "SCRIPT_NAME": "",
+            "PATH_INFO": path,
+            "QUERY_STRING": "",
+            "SERVER_NAME": self.host,
+            "SERVER_PORT": "443",
+            "SERVER_PROTOCOL": "HTTP/1.1",
+            "REMOTE_ADDR": "127.0.0.1",
+            "HTTP_HOST": self.host,
+            "wsgi.url_scheme": "https",
+            "wsgi.input": io.BytesIO(),
+            INTERNAL_REQUEST: True,
+            **headers,
+        }
+        # Behind the proxy, HTTPS is only recognised from the forwarded header
+        if settings.SECURE_PROXY_SSL_HEADER:
+            header, value = settings.SECURE_PROXY_SSL_HEADER
+            environ[header] = value
+        return self.handler.get_response(WSGIRequest(environ))
@@ -0,0 +1,162 @@
+import logging
+import os
+import time
+from contextlib import nullcontext
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+from django.views import View
+from backend.internal import is_internal
+
+try:
+    import prometheus_client
+    from prometheus_client import multiprocess
+except ImportError:  # pragma: no cover
+    prometheus_client = None
+
+logger = logging.getLogger("backend.metrics")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+if prometheus_client is not None:
+    REQUEST_DURATION = prometheus_client.Histogram(
+        "backend_request_duration_seconds",
+        "Time to handle a request, by route name.",
+        ["route", "method", "status"],
+        buckets=LATENCY_BUCKETS,
+    )
+    REQUEST_SERIALIZE = prometheus_client.Histogram(
+        "backend_request_serialize_seconds",
+        "View time outside the database, mostly serializers, by route name.",
+        ["route"],
+        buckets=LATENCY_BUCKETS,
+    )
+    REQUEST_DB = prometheus_client.Histogram(
+        "backend_request_db_seconds",
+        "Database time per request, by route name.",
+        ["route"],
+        buckets=LATENCY_BUCKETS,
+    )
+    REQUEST_QUERIES = prometheus_client.Histogram(
+        "backend_request_queries",
+        "Database queries per request, by route name.",
+        ["route"],
+        buckets=QUERY_BUCKETS,
+    )
+    CACHE_RESULTS = prometheus_client.Counter("backend_api_cache_results", "API response cache lookups.", ["result"])
+    THROTTLED = prometheus_client.Counter(
+        "backend_throttled_requests", "Requests refused by the rate limiter, by view and rate name.", ["scope"]
+    )
+    REQUESTS_IN_PROGRESS = prometheus_client.Gauge(
+        "backend_requests_in_progress", "Requests being handled.", multiprocess_mode="livesum"
+    )
+    WORKERS = prometheus_client.Gauge("backend_workers", "Live server workers.", multiprocess_mode="livesum")
+    # The lowest value across workers is the container's first fast response
+    FIRST_FAST_RESPONSE = prometheus_client.Gauge(
+        "backend_first_fast_response_seconds",
+        "Seconds from container start to the first warmed route response within WARMUP_FAST_RESPONSE_MS.",
+        multiprocess_mode="min",
+    )
+    DB_POOL = prometheus_client.Gauge(
+        "backend_db_pool_connections",
+        "Connection pool usage of the default database.",
+        ["state"],
+        multiprocess_mode="livesum",
+    )
+
+
+def route_name(request):
+    """Name of the matched URL pattern, e.g. "project-list", so labels stay bounded."""
+    match = getattr(request, "resolver_match", None)
+    return (match.url_name or match.view_name) if match else "unmatched"
+
+
+def requests_in_progress():
+    if prometheus_client is None:
+        return nullcontext()
+    return REQUESTS_IN_PROGRESS.track_inprogress()
+
+
+def record_request(request, response, request_metrics, serialize, total):
+    """Observe one request measured by `backend.instrumentation.PerformanceMiddleware`; durations in ms."""
+    if prometheus_client is None:
+        return
+    route = route_name(request)
+    REQUEST_DURATION.labels(route, request.method, f"{response.status_code // 100}xx").observe(total / 1000)
+    REQUEST_SERIALIZE.labels(route).observe(serialize / 1000)
+    REQUEST_DB.labels(route).observe(request_metrics.db_time)
+    REQUEST_QUERIES.labels(route).observe(request_metrics.queries)
+    record_first_fast_response(request, route, total)
+    if request_metrics.cache_hits:
+        CACHE_RESULTS.labels("hit").inc(request_metrics.cache_hits)
+    if request_metrics.cache_misses:
+        CACHE_RESULTS.labels("miss").inc(request_metrics.cache_misses)
+    if "pool" in settings.DATABASES["default"].get("OPTIONS", {}):
+        record_pool_usage()
+
+
+_first_fast_response = None
+
+
+def record_first_fast_response(request, route, total):
+    """
+    Record, once per process, how long after container start a `WARMUP_URL_NAMES`
+    route first answered a client within `WARMUP_FAST_RESPONSE_MS`; `total` in ms.
+    The warmup's own internal requests do not count.
+    """
+    global _first_fast_response
+    if _first_fast_response is not None or route not in settings.WARMUP_URL_NAMES or is_internal(request):
+        return
+    from backend.warmup import container_started_at
+
+    if total > settings.WARMUP_FAST_RESPONSE_MS:
+        return
+    _first_fast_response = time.time() - container_started_at()
+    FIRST_FAST_RESPONSE.set(_first_fast_response)
+    logger.info("First fast response (%s, %.1f ms) %.2fs after container start", route, total, _first_fast_response)
+
+
+def record_throttled(scope):
+    if prometheus_client is not None:
+        THROTTLED.labels(scope).inc()
+
+
+def record_pool_usage():
+    pool = connections["default"].pool
+    if pool is None:
+        return
+    stats = pool.get_stats()
+    DB_POOL.labels("size").set(stats.get("pool_size", 0))
+    DB_POOL.labels("available").set(stats.get("pool_available", 0))
+    DB_POOL.labels("waiting").set(stats.get("requests_waiting", 0))
+
+
+def worker_started():
+    """Count this process as a live worker; called from the gunicorn post_fork hook."""
+    if prometheus_client is not None:
+        WORKERS.set(1)
+
+
+def get_registry():
+    # Under gunicorn every worker writes its samples to PROMETHEUS_MULTIPROC_DIR
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return prometheus_client.REGISTRY
+    registry = prometheus_client.CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+class MetricsView(View):
+    """Prometheus exposition of the metrics of every worker, optionally behind a bearer token."""
+
+    def get(self, request):
+        if prometheus_client is None:
+            return HttpResponse("prometheus_client is not installed", status=404, content_type="text/plain")
+        token = settings.METRICS_TOKEN
+        if token and not constant_time_compare(request.headers.get("Authorization", ""), f"Bearer {token}"):
+            return HttpResponse(status=403)
+        return HttpResponse(
+            prometheus_client.generate_latest(get_registry()), content_type=prometheus_client.CONTENT_TYPE_LATEST
+        )
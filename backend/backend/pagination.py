@@ -0,0 +1,124 @@
+import json
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination
+
+
+def reverse_ordering(ordering):
+    return tuple(order[1:] if order.startswith("-") else f"-{order}" for order in ordering)
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination ordered by the view's `ordering` attribute, which must end
+    with a unique field such as the id. Cursors hold the values of every ordering
+    field of the last row shown, and pages are fetched with a row comparison on
+    them instead of an OFFSET, so deep pages cost the same as the first one and
+    rows tied on a leading field are never skipped or repeated.
+
+    Loading a page is split around its query, `get_window` and `set_page`, so
+    `apaginate_queryset` can run that query with the async ORM.
+    """
+
+    ordering = ("id",)
+    page_size_query_param = "page_size"
+    max_page_size = settings.API_MAX_PAGE_SIZE
+
+    def get_ordering(self, request, queryset, view):
+        return tuple(getattr(view, "ordering", self.ordering))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        window = self.get_window(queryset, request, view)
+        if window is None:
+            return None
+        return self.set_page(list(window))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        window = self.get_window(queryset, request, view)
+        if window is None:
+            return None
+        return self.set_page([obj async for obj in window])
+
+    def get_window(self, queryset, request, view=None):
+        """The sliced queryset holding the requested page plus one row, or None when pagination is off."""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        # Previous pages are read backwards from the cursor, then put back in order by set_page
+        ordering = reverse_ordering(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if self.cursor is not None:
+            try:
+                queryset = queryset.filter(self.after_position(ordering, self.decode_position(self.cursor.position)))
+            except (TypeError, ValueError, ValidationError):
+                raise NotFound(self.invalid_cursor_message)
+        # One extra row tells whether a following page exists
+        return queryset[: self.page_size + 1]
+
+    def set_page(self, results):
+        """Keep the page from the rows loaded by `get_window` and work out whether there are pages around it."""
+        self.page = list(results[: self.page_size])
+        has_following = len(results) > len(self.page)
+        if self.cursor is not None and self.cursor.reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_following
+        else:
+            self.has_next, self.has_previous = has_following, self.cursor is not None
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        position = self.encode_position(self.page[-1]) if self.page else self.cursor.position
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        position = self.encode_position(self.page[0]) if self.page else self.cursor.position
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+    def encode_position(self, instance):
+        # Fast reads page through value rows, so `instance` may be a dict
+        fields = [order.lstrip("-") for order in self.ordering]
+        if isinstance(instance, dict):
+            values = [instance[field] for field in fields]
+        else:
+            values = [getattr(instance, field) for field in fields]
+        return json.dumps(values, cls=DjangoJSONEncoder)
+
+    def decode_position(self, position):
+        try:
+            values = json.loads(position)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return values
+
+    def after_position(self, ordering, values):
+        """
+        Match the rows after `values` in `ordering`, the row comparison
+        (a, b) > (x, y) written as a > x OR (a = x AND b > y), with the
+        comparison of each field following its direction.
+        """
+        match, ties = Q(), {}
+        for order, value in zip(ordering, values):
+            field = order.lstrip("-")
+            lookup = "lt" if order.startswith("-") else "gt"
+            match |= Q(**ties, **{f"{field}__{lookup}": value})
+            ties[field] = value
+        return match
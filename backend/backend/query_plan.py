@@ -0,0 +1,61 @@
+from django.db.models import Prefetch
+from rest_framework import serializers
+from backend.relations import NestedRelatedField
+
+
+def get_nested_serializer(field):
+    """Return the serializer used to render a nested field, or None for plain fields."""
+    if isinstance(field, NestedRelatedField):
+        return field.serializer.child
+    if isinstance(field, serializers.ListSerializer):
+        return field.child
+    if isinstance(field, serializers.BaseSerializer):
+        return field
+    return None
+
+
+def get_query_plan(serializer):
+    """
+    Build the select_related/prefetch_related lookups needed to render `serializer`.
+
+    Serializers declare the relations they read in `Meta.select_related` and
+    `Meta.prefetch_related`. A prefetch that feeds a nested serializer becomes a
+    `Prefetch` whose queryset is planned from that serializer, so a whole tree is
+    loaded with one query per level. Declarations for fields the serializer does
+    not render are skipped.
+    """
+    meta = getattr(serializer, "Meta", None)
+    fields = {}
+    for field in serializer.fields.values():
+        if not field.write_only:
+            fields.setdefault(field.source.split(".")[0], field)
+
+    select_related = [lookup for lookup in getattr(meta, "select_related", ()) if lookup.split("__")[0] in fields]
+    prefetch_related = []
+    for lookup in getattr(meta, "prefetch_related", ()):
+        field = fields.get(lookup.split("__")[0])
+        if field is None:
+            continue
+        nested = get_nested_serializer(field)
+        if nested is not None and "__" not in lookup:
+            queryset = apply_query_plan(nested.Meta.model._default_manager.all(), nested)
+            prefetch_related.append(Prefetch(lookup, queryset=queryset))
+        else:
+            prefetch_related.append(lookup)
+    return select_related, prefetch_related
+
+
+def apply_query_plan(queryset, serializer):
+    select_related, prefetch_related = get_query_plan(serializer)
+    if select_related:
+        queryset = queryset.select_related(*select_related)
+    if prefetch_related:
+        queryset = queryset.prefetch_related(*prefetch_related)
+    return queryset
+
+
+class QueryPlanMixin:
+    """Viewset mixin that loads every relation the serializer renders up front."""
+
+    def get_queryset(self):
+        return apply_query_plan(super().get_queryset(), self.get_serializer())
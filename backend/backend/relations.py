@@ -0,0 +1,133 @@
+from collections.abc import Mapping
+from contextlib import contextmanager
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework import serializers
+
+
+class PreloadedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    PrimaryKeyRelatedField that resolves from objects loaded in advance by
+    `preload_related`, so validating any number of rows costs one query per relation.
+    Outside of `preload_related` it behaves like PrimaryKeyRelatedField.
+
+    With `slug_field`, strings are looked up by that field instead and missing
+    objects are created: they resolve to unsaved instances, which `write_rows`
+    saves in one insert. Integers are always primary keys.
+    """
+
+    default_error_messages = {"invalid_slug": "Invalid value {value!r}: {message}"}
+
+    preloaded = None
+    preloaded_slugs = None
+
+    def __init__(self, slug_field=None, **kwargs):
+        self.slug_field = slug_field
+        super().__init__(**kwargs)
+
+    def is_slug(self, data):
+        return self.slug_field is not None and isinstance(data, str)
+
+    def clean_slug(self, data):
+        """Return `data` as a valid value of `slug_field`, or raise a ValidationError."""
+        model_field = self.get_queryset().model._meta.get_field(self.slug_field)
+        try:
+            return model_field.clean(data.strip(), None)
+        except DjangoValidationError as exc:
+            self.fail("invalid_slug", value=data, message=" ".join(exc.messages))
+
+    def load_slugs(self, slugs):
+        """Map each of `slugs` to an existing object, or to a new unsaved one."""
+        objects = {}
+        for obj in self.get_queryset().filter(**{f"{self.slug_field}__in": slugs}).order_by("pk"):
+            objects.setdefault(getattr(obj, self.slug_field), obj)
+        model = self.get_queryset().model
+        for slug in slugs:
+            if slug not in objects:
+                objects[slug] = model(**{self.slug_field: slug})
+        return objects
+
+    def to_key(self, data):
+        """Return the primary key for `data`, or None when it is not a valid key."""
+        if isinstance(data, bool):
+            return None
+        try:
+            return self.get_queryset().model._meta.pk.to_python(data)
+        except (DjangoValidationError, TypeError, ValueError):
+            return None
+
+    def to_internal_value(self, data):
+        if self.is_slug(data):
+            slug = self.clean_slug(data)
+            if self.preloaded_slugs is None:
+                return self.load_slugs([slug])[slug]
+            return self.preloaded_slugs[slug]
+        if self.preloaded is None:
+            return super().to_internal_value(data)
+        key = self.to_key(data)
+        if key is None:
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        try:
+            return self.preloaded[key]
+        except KeyError:
+            self.fail("does_not_exist", pk_value=data)
+
+
+class NestedRelatedField(serializers.ManyRelatedField):
+    """
+    Many-to-many field rendered with a nested serializer and written as a list of
+    primary keys, e.g. `technology` on projects: read as technology objects,
+    written as `[1, 2]`, or as `[1, "Django"]` when `slug_field="name"`.
+    """
+
+    def __init__(self, serializer, queryset, slug_field=None, **kwargs):
+        self.serializer = serializer
+        child = PreloadedPrimaryKeyRelatedField(queryset=queryset, slug_field=slug_field)
+        super().__init__(child_relation=child, **kwargs)
+
+    def bind(self, field_name, parent):
+        super().bind(field_name, parent)
+        self.serializer.bind(field_name, parent)
+
+    def to_representation(self, iterable):
+        return self.serializer.to_representation(iterable)
+
+
+def _preloadable_fields(serializer):
+    """Yield (input name, field, many) for the writable preloaded relations of `serializer`."""
+    for field in serializer.fields.values():
+        if field.read_only:
+            continue
+        if isinstance(field, serializers.ManyRelatedField):
+            if isinstance(field.child_relation, PreloadedPrimaryKeyRelatedField):
+                yield field.field_name, field.child_relation, True
+        elif isinstance(field, PreloadedPrimaryKeyRelatedField):
+            yield field.field_name, field, False
+
+
+@contextmanager
+def preload_related(serializer, rows):
+    """
+    Load every object referenced by the relation fields of `serializer` in `rows`
+    with one query per field, plus one per field given slugs, for the duration of
+    the block.
+    """
+    fields = list(_preloadable_fields(serializer))
+    for name, field, many in fields:
+        keys, slugs = set(), set()
+        for row in rows:
+            value = row.get(name) if isinstance(row, Mapping) else None
+            for item in value if many and isinstance(value, list) else [value]:
+                if field.is_slug(item):
+                    # Invalid slugs are left for to_internal_value to report
+                    slugs.add(item.strip())
+                    continue
+                key = field.to_key(item) if item is not None else None
+                if key is not None:
+                    keys.add(key)
+        field.preloaded = field.get_queryset().in_bulk(keys) if keys else {}
+        field.preloaded_slugs = field.load_slugs(slugs) if slugs else {}
+    try:
+        yield
+    finally:
+        for _name, field, _many in fields:
+            field.preloaded = field.preloaded_slugs = None
@@ -0,0 +1,196 @@
+from functools import reduce
+from operator import or_
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, TrigramWordSimilarity
+from django.db import connections
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_migrate, post_save
+from rest_framework import serializers
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from backend.authentication import PublicReadMixin
+from backend.bulk import rows_written
+from backend.cache import CachedResponseMixin, bump_generation
+from tasks.queue import enqueue, register_task
+
+# Searchable models by result type, filled by `register_search` from each app's signals module
+SEARCH_TYPES = {}
+
+
+class Searchable:
+    """How one model is searched: weighted vector columns, trigram columns and the result title."""
+
+    def __init__(self, model, weights, trigram, title):
+        self.model = model
+        self.weights = weights
+        self.trigram = trigram
+        self.title = title
+
+    def vector(self):
+        config = settings.SEARCH_CONFIG
+        return reduce(
+            lambda left, right: left + right,
+            [SearchVector(field, weight=weight, config=config) for field, weight in self.weights.items()],
+        )
+
+    def update_vectors(self, queryset):
+        """
+        Store the search vector of every row of `queryset` with one UPDATE, on
+        Postgres only. Returns the number of rows updated.
+        """
+        if connections[queryset.db].vendor != "postgresql":
+            return 0
+        return queryset.update(search_vector=self.vector())
+
+    def search(self, query, limit):
+        """Return up to `limit` result dicts for `query`, best first."""
+        queryset = self.model._default_manager.all()
+        if connections[queryset.db].vendor != "postgresql":
+            # Without search indexes, e.g. under the SQLite test settings, fall back to substring matches
+            match = reduce(or_, [Q(**{f"{field}__icontains": query}) for field in {*self.weights, *self.trigram}])
+            queryset = queryset.filter(match).annotate(score=Value(0.0, output_field=FloatField())).order_by("pk")
+        else:
+            search_query = SearchQuery(query, config=settings.SEARCH_CONFIG, search_type="websearch")
+            # `@@` on the vector and `<%` on the trigram columns, both answered by GIN indexes
+            match = Q(search_vector=search_query)
+            score = SearchRank(F("search_vector"), search_query)
+            for field in self.trigram:
+                match |= Q(**{f"{field}__trigram_word_similar": query})
+            similarities = [TrigramWordSimilarity(query, field) for field in self.trigram]
+            if similarities:
+                score += Greatest(*similarities) if len(similarities) > 1 else similarities[0]
+            queryset = queryset.filter(match).annotate(score=score).order_by("-score", "pk")
+        return [
+            {"id": row["id"], "title": row[self.title], "score": row["score"]}
+            for row in queryset.values("id", "score", self.title)[:limit]
+        ]
+
+
+@register_task("search.update")
+def update_search_vectors(result_type, ids, children=()):
+    """
+    Refresh the vectors of the `result_type` rows `ids` and of the rows of their
+    `children` relations. On the worker this runs after the write has committed
+    and its cache generations were bumped, so every model whose vectors changed is
+    bumped again, or search responses cached in between would keep stale results.
+    """
+    searchable = SEARCH_TYPES[result_type]
+    model = searchable.model
+    if searchable.update_vectors(model._default_manager.filter(pk__in=ids)):
+        bump_generation(model)
+    for name in children:
+        related = model._meta.get_field(name)
+        child = next(item for item in SEARCH_TYPES.values() if item.model is related.related_model)
+        if child.update_vectors(related.related_model._default_manager.filter(**{f"{related.field.name}__in": ids})):
+            bump_generation(related.related_model)
+
+
+def schedule_vector_update(result_type, ids, children=()):
+    """Update search vectors now, or queue the update for the worker with `TASKS_ENABLED`."""
+    if settings.TASKS_ENABLED:
+        enqueue("search.update", key=result_type, result_type=result_type, ids=sorted(ids), children=list(children))
+    else:
+        update_search_vectors(result_type, ids, children)
+
+
+def register_search(result_type, model, weights, trigram, title, children=()):
+    """
+    Make `model` searchable as `result_type`. Its `search_vector` column is
+    refreshed after every save and bulk write, together with the vectors of the
+    `children` relations (reverse foreign keys written along with it).
+    """
+    searchable = Searchable(model, weights, trigram, title)
+    SEARCH_TYPES[result_type] = searchable
+
+    def saved(sender, instance, raw=False, **kwargs):
+        if not raw:
+            schedule_vector_update(result_type, [instance.pk])
+
+    def written(sender, objects, **kwargs):
+        schedule_vector_update(result_type, [obj.pk for obj in objects], children)
+
+    post_save.connect(saved, sender=model, weak=False, dispatch_uid=f"search:{result_type}")
+    rows_written.connect(written, sender=model, weak=False, dispatch_uid=f"search:{result_type}")
+    app_config = model._meta.app_config
+    post_migrate.connect(install_search_indexes, sender=app_config, dispatch_uid=f"search:install:{app_config.label}")
+
+
+def install_search_indexes(app_config, using="default", **kwargs):
+    """
+    Create the pg_trgm extension and the GIN indexes behind search for the
+    searchable models of `app_config`, and fill their missing vectors. Runs
+    after every migrate of an app with searchable models and is idempotent; the
+    indexes are Postgres-specific, so other databases are skipped.
+    """
+    searchables = [
+        searchable for searchable in SEARCH_TYPES.values() if searchable.model._meta.app_config is app_config
+    ]
+    if not searchables or connections[using].vendor != "postgresql":
+        return
+    with connections[using].cursor() as cursor:
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for searchable in searchables:
+            table = searchable.model._meta.db_table
+            cursor.execute(f'CREATE INDEX IF NOT EXISTS "{table}_search_idx" ON "{table}" USING gin (search_vector)')
+            for field in searchable.trigram:
+                column = searchable.model._meta.get_field(field).column
+                cursor.execute(
+                    f'CREATE INDEX IF NOT EXISTS "{table}_{column}_trgm_idx" '
+                    f'ON "{table}" USING gin ("{column}" gin_trgm_ops)'
+                )
+    for searchable in searchables:
+        searchable.update_vectors(searchable.model._default_manager.using(using).filter(search_vector=None))
+
+
+class SearchView(PublicReadMixin, CachedResponseMixin, APIView):
+    """
+    Ranked search over projects, jobs, achievements and technologies:
+    `?q=` (websearch syntax, typos matched by trigram similarity), optional
+    `?type=project,job` and `?limit=`. Results of all types are merged by score.
+    """
+
+    basename = "search"
+    action = "list"
+    # Ranking queries cost more than cached reads
+    throttle_rates = {"read": "120/min"}
+
+    @property
+    def cache_models(self):
+        return tuple(searchable.model for searchable in SEARCH_TYPES.values())
+
+    def get(self, request):
+        return self.cached_response(self.search, request)
+
+    def search(self, request):
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            raise serializers.ValidationError({"q": ["This parameter is required."]})
+        types = request.query_params.get("type")
+        types = types.split(",") if types else list(SEARCH_TYPES)
+        unknown = [name for name in types if name not in SEARCH_TYPES]
+        if unknown:
+            raise serializers.ValidationError({"type": [f"Unknown type: {name}." for name in unknown]})
+        try:
+            limit = min(max(int(request.query_params.get("limit", 20)), 1), settings.SEARCH_MAX_RESULTS)
+        except ValueError:
+            raise serializers.ValidationError({"limit": ["A valid integer is required."]})
+
+        results = [{"type": name, **row} for name in types for row in SEARCH_TYPES[name].search(query, limit)]
+        results.sort(key=lambda row: -row["score"])
+        return Response({"query": query, "results": results[:limit]})
+
+
+class SearchVectorAdminMixin:
+    """
+    ModelAdmin mixin that also matches the search term against the indexed
+    search vector on Postgres, for stemmed word matches. The usual `icontains`
+    search is kept alongside it, so partial words still find rows.
+    """
+
+    def get_search_results(self, request, queryset, search_term):
+        results, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        if not search_term or connections[queryset.db].vendor != "postgresql":
+            return results, may_have_duplicates
+        query = SearchQuery(search_term, config=settings.SEARCH_CONFIG, search_type="websearch")
+        return results | queryset.filter(search_vector=query), may_have_duplicates
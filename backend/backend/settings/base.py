@@ -19,9 +19,39 @@ DATABASES = {
         "PASSWORD": os.environ.get("DB_PASSWORD"),
         "HOST": os.environ.get("DB_HOST"),
         "PORT": os.environ.get("DB_PORT", "5432"),
+        # Keep connections open between requests, checking them before reuse
+        "CONN_MAX_AGE": int(os.environ.get("DB_CONN_MAX_AGE", 60)),
+        "CONN_HEALTH_CHECKS": os.environ.get("DB_CONN_HEALTH_CHECKS", "True").lower() in ("true", "1"),
+        "OPTIONS": {},
     }
 }
 
+# Optional psycopg connection pool shared by the threads of a worker process.
+# Pooled connections are returned to the pool after each request, so Django's
+# persistent connections are turned off when the pool is enabled.
+DB_POOL_MAX_SIZE = int(os.environ.get("DB_POOL_MAX_SIZE", 0))
+if DB_POOL_MAX_SIZE:
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["OPTIONS"]["pool"] = {
+        "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", 1)),
+        "max_size": DB_POOL_MAX_SIZE,
+        "timeout": int(os.environ.get("DB_POOL_TIMEOUT", 10)),
+    }
+
+# Optional read replica: safe-method API requests read from it, everything else uses the primary
+if os.environ.get("DB_REPLICA_HOST"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "HOST": os.environ.get("DB_REPLICA_HOST"),
+        "PORT": os.environ.get("DB_REPLICA_PORT", DATABASES["default"]["PORT"]),
+        "OPTIONS": {**DATABASES["default"]["OPTIONS"]},
+        "TEST": {"MIRROR": "default"},
+    }
+DATABASE_ROUTERS = ["backend.db_routers.ReplicaRouter"]
+
+# Seconds reads stay on the primary after a write, while the replica catches up
+DB_REPLICA_LAG = int(os.environ.get("DB_REPLICA_LAG", 5))
+
 # Application definition
 INSTALLED_APPS = [
     "django.contrib.admin",
@@ -30,17 +60,22 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     # Third-party apps
     "rest_framework",
+    "rest_framework.authtoken",
     "corsheaders",
     # Local apps
     "projects",
     "about",
+    "tasks",
 ]
 
 # Middleware configuration
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "backend.instrumentation.PerformanceMiddleware",
+    "backend.compression.CompressionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -76,6 +111,17 @@ TEMPLATES = [
 # WSGI configuration
 WSGI_APPLICATION = "backend.wsgi.application"
 
+# Serving mode: "wsgi" (sync gunicorn workers) or "asgi" (uvicorn workers with async read views)
+SERVER_MODE = os.environ.get("SERVER_MODE", "wsgi")
+ASYNC_READS = SERVER_MODE == "asgi"
+
+# Under ASGI, queries run on executor threads that the request_finished cleanup
+# does not reach, so persistent connections would leak; without the pool, close
+# each connection at the end of its request.
+if ASYNC_READS and not DB_POOL_MAX_SIZE:
+    for database in DATABASES.values():
+        database["CONN_MAX_AGE"] = 0
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -110,17 +156,104 @@ MEDIA_ROOT = BASE_DIR / "media"
 # Default primary key field type
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
-# REST Framework settings
+# REST Framework settings: public reads, writes authenticated by token (or session, for the admin
+# and the browsable API). Basic authentication is left out, as it hashes the password on every request.
 REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
-        "rest_framework.permissions.IsAuthenticated",
+        "rest_framework.permissions.IsAuthenticatedOrReadOnly",
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
+        "backend.authentication.CachedTokenAuthentication",
         "rest_framework.authentication.SessionAuthentication",
-        "rest_framework.authentication.BasicAuthentication",
     ],
+    "DEFAULT_PAGINATION_CLASS": "backend.pagination.KeysetPagination",
+    "PAGE_SIZE": int(os.environ.get("API_PAGE_SIZE", 50)),
 }
 
+# Lifetime of cached API token lookups in seconds; deleting a token or saving its user evicts them
+API_TOKEN_CACHE_TIMEOUT = int(os.environ.get("API_TOKEN_CACHE_TIMEOUT", 300))
+
+# Upper bound for the ?page_size= query parameter
+API_MAX_PAGE_SIZE = int(os.environ.get("API_MAX_PAGE_SIZE", 200))
+
+# Upper bound for the number of rows in one bulk/ request
+API_MAX_BULK_SIZE = int(os.environ.get("API_MAX_BULK_SIZE", 1000))
+
+# Lifetime of cached API responses in seconds. Entries are keyed by model generation,
+# so this only bounds memory use; edits invalidate them immediately.
+API_CACHE_TIMEOUT = int(os.environ.get("API_CACHE_TIMEOUT", 3600))
+
+# Serve list/retrieve from value rows instead of model instances and serializer fields
+API_FAST_READS = os.environ.get("API_FAST_READS", "False").lower() in ("true", "1")
+
+# Token-bucket rate limits (backend.throttling.RedisRateThrottle) by action or by "read"/"write",
+# overridable per view with `throttle_rates`; buckets live in Redis when a URL is set, else per process
+API_THROTTLE_RATES = {
+    "read": os.environ.get("API_THROTTLE_READ_RATE", "600/min"),
+    "write": os.environ.get("API_THROTTLE_WRITE_RATE", "30/min"),
+}
+API_THROTTLE_REDIS_URL = os.environ.get("API_THROTTLE_REDIS_URL", "")
+API_THROTTLE_TIMEOUT = float(os.environ.get("API_THROTTLE_TIMEOUT", 0.1))
+
+# Brotli/gzip compression of responses negotiated with Accept-Encoding: bodies under the minimum
+# size are sent as they are; the levels trade CPU on cache misses for size
+API_COMPRESSION = os.environ.get("API_COMPRESSION", "True").lower() in ("true", "1")
+API_COMPRESSION_MIN_SIZE = int(os.environ.get("API_COMPRESSION_MIN_SIZE", 1024))
+API_COMPRESSION_BROTLI_QUALITY = int(os.environ.get("API_COMPRESSION_BROTLI_QUALITY", 5))
+API_COMPRESSION_GZIP_LEVEL = int(os.environ.get("API_COMPRESSION_GZIP_LEVEL", 6))
+
+# Serve project list/retrieve from the denormalized ProjectReadModel table, which model signals
+# keep current while this is enabled (backfilled by manage.py rebuild_project_read_model)
+API_PROJECT_READ_MODEL = os.environ.get("API_PROJECT_READ_MODEL", "False").lower() in ("true", "1")
+
+# Background tasks (manage.py run_worker): with TASKS_ENABLED, snapshot and export rebuilds and the
+# usage, read model and search refreshes are queued in the database instead of running on commit.
+# Triggers within TASKS_DEBOUNCE seconds of each other collapse into one run, started at most
+# TASKS_MAX_WAIT seconds after the first; failures are retried with exponential backoff.
+TASKS_ENABLED = os.environ.get("TASKS_ENABLED", "False").lower() in ("true", "1")
+TASKS_DEBOUNCE = float(os.environ.get("TASKS_DEBOUNCE", 1.0))
+TASKS_MAX_WAIT = float(os.environ.get("TASKS_MAX_WAIT", 10.0))
+TASKS_MAX_ATTEMPTS = int(os.environ.get("TASKS_MAX_ATTEMPTS", 5))
+TASKS_RETRY_DELAY = float(os.environ.get("TASKS_RETRY_DELAY", 5.0))
+TASKS_POLL_INTERVAL = float(os.environ.get("TASKS_POLL_INTERVAL", 1.0))
+TASKS_LOCK_TIMEOUT = int(os.environ.get("TASKS_LOCK_TIMEOUT", 600))
+
+# Static export of the public GET endpoints (manage.py export_api): output directory, the
+# host the pages are rendered for (the first ALLOWED_HOSTS name by default; links in the
+# exported pages are relative), and whether every committed change re-exports in the background
+API_EXPORT_ROOT = os.environ.get("API_EXPORT_ROOT", str(BASE_DIR / "export"))
+API_EXPORT_HOST = os.environ.get(
+    "API_EXPORT_HOST", next((host for host in ALLOWED_HOSTS if not host.startswith((".", "*"))), "localhost")
+)
+API_EXPORT_ON_CHANGE = os.environ.get("API_EXPORT_ON_CHANGE", "False").lower() in ("true", "1")
+
+# Per-request Server-Timing header and timing log lines, flagged when over budget
+PERF_INSTRUMENTATION = os.environ.get("PERF_INSTRUMENTATION", "True").lower() in ("true", "1")
+PERF_QUERY_BUDGET = int(os.environ.get("PERF_QUERY_BUDGET", 20))
+PERF_LATENCY_BUDGET_MS = int(os.environ.get("PERF_LATENCY_BUDGET_MS", 500))
+
+# Readiness checks: per-dependency timeout and how long results are reused, in seconds
+HEALTH_CHECK_TIMEOUT = float(os.environ.get("HEALTH_CHECK_TIMEOUT", 2))
+HEALTH_CHECK_CACHE_SECONDS = float(os.environ.get("HEALTH_CHECK_CACHE_SECONDS", 5))
+
+# Startup warmup: with STARTUP_WARMUP, the gunicorn master (with GUNICORN_PRELOAD) primes the
+# response caches of the WARMUP_URL_NAMES routes, as requested on WARMUP_HOSTS, once before forking
+# the workers; processes that are not warm yet warm up on their readiness check, which waits for it.
+# The first response of those routes within WARMUP_FAST_RESPONSE_MS sets backend_first_fast_response_seconds.
+STARTUP_WARMUP = os.environ.get("STARTUP_WARMUP", "False").lower() in ("true", "1")
+WARMUP_URL_NAMES = os.environ.get("WARMUP_URL_NAMES", "project-list,category-list,job-list").split(",")
+WARMUP_HOSTS = os.environ.get(
+    "WARMUP_HOSTS", ",".join(host for host in ALLOWED_HOSTS if not host.startswith((".", "*")))
+).split(",")
+WARMUP_FAST_RESPONSE_MS = int(os.environ.get("WARMUP_FAST_RESPONSE_MS", 50))
+
+# Text search configuration of the search vectors, and the most results /api/search/ returns
+SEARCH_CONFIG = os.environ.get("SEARCH_CONFIG", "english")
+SEARCH_MAX_RESULTS = int(os.environ.get("SEARCH_MAX_RESULTS", 50))
+
+# Bearer token required by /metrics when set
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+
 # CORS settings (to be overridden in dev/prod)
 CORS_ALLOW_CREDENTIALS = True
 CORS_ALLOWED_ORIGINS = []
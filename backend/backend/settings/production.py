@@ -1,15 +1,18 @@
-from .base import INSTALLED_APPS, MIDDLEWARE, os, BASE_DIR, REST_FRAMEWORK
+from .base import INSTALLED_APPS, MIDDLEWARE, SERVER_MODE, os, BASE_DIR, REST_FRAMEWORK
 
 # Debug settings
 DEBUG = False
 
 # Production apps
-INSTALLED_APPS += [
+INSTALLED_APPS = [
+    *INSTALLED_APPS,
     "whitenoise.runserver_nostatic",  # Static file handling
 ]
 
-# Production middleware
-MIDDLEWARE.insert(1, "whitenoise.middleware.WhiteNoiseMiddleware")
+# Production middleware. WhiteNoise is sync-only, and one sync middleware makes Django run the
+# whole chain in a thread under ASGI, one request at a time; nginx serves /static/ there instead.
+if SERVER_MODE != "asgi":
+    MIDDLEWARE = [MIDDLEWARE[0], "whitenoise.middleware.WhiteNoiseMiddleware", *MIDDLEWARE[1:]]
 
 # Security settings
 SECURE_SSL_REDIRECT = True
@@ -88,15 +91,18 @@ DATA_UPLOAD_MAX_MEMORY_SIZE = 2621440  # 2.5MB
 REST_FRAMEWORK = {
     **REST_FRAMEWORK,  # Include base settings
     "DEFAULT_RENDERER_CLASSES": [
-        "rest_framework.renderers.JSONRenderer",  # Only JSON renderer in production
+        "backend.renderers.FastJSONRenderer",  # Only JSON renderer in production
     ],
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "backend.throttling.RedisRateThrottle",
     ],
-    "DEFAULT_THROTTLE_RATES": {"anon": "100/day", "user": "1000/day"},
 }
 
+# Rate limit buckets shared by every worker and container
+API_THROTTLE_REDIS_URL = os.environ.get(
+    "API_THROTTLE_REDIS_URL", os.environ.get("REDIS_URL", "redis://localhost:6379/0")
+)
+
 # Production-specific password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -0,0 +1,114 @@
+import hashlib
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.renderers import JSONRenderer
+from rest_framework.views import APIView
+from backend.authentication import PublicReadMixin
+from backend.cache import get_change_markers, on_commit_after_bumps
+from backend.compression import compress, negotiate_encoding, set_encoding_headers, supported_encodings
+from backend.export import schedule_export
+from backend.query_plan import apply_query_plan
+from about.models import Job, Achievement
+from projects.models import Category, Subcategory, Technology, Project
+from tasks.queue import enqueue, register_task
+
+SNAPSHOT_MODELS = (Category, Subcategory, Technology, Project, Job, Achievement)
+
+
+def snapshot_key(generations):
+    return "snapshot:" + ".".join(str(generation) for generation in generations)
+
+
+def _serialize(serializer_class, queryset):
+    queryset = apply_query_plan(queryset, serializer_class())
+    return serializer_class(queryset, many=True).data
+
+
+def build_snapshot():
+    """Serialize the whole portfolio graph, in the order of the list endpoints, to JSON bytes."""
+    # Imported here because the serializers' bulk writes schedule snapshot builds
+    from about.serializers import JobSerializer
+    from projects.serializers import CategorySerializer, SubcategorySerializer, TechnologySerializer, ProjectSerializer
+
+    return JSONRenderer().render(
+        {
+            "categories": _serialize(CategorySerializer, Category.objects.order_by("id")),
+            "subcategories": _serialize(SubcategorySerializer, Subcategory.objects.order_by("id")),
+            "technologies": _serialize(TechnologySerializer, Technology.objects.order_by("id")),
+            "projects": _serialize(ProjectSerializer, Project.objects.order_by("id")),
+            "jobs": _serialize(JobSerializer, Job.objects.order_by("-start_date", "-id")),
+        }
+    )
+
+
+def get_snapshot(generations, encoding=None):
+    """
+    Return the snapshot for `generations`, compressed with `encoding` if given,
+    building and storing it if it is missing. Each encoding is stored on its
+    own, so it is compressed once per change rather than once per request.
+    """
+    key = snapshot_key(generations)
+    if encoding is not None:
+        content = cache.get(f"{key}:{encoding}")
+        if content is None:
+            content = compress(get_snapshot(generations), encoding)
+            cache.set(f"{key}:{encoding}", content, settings.API_CACHE_TIMEOUT)
+        return content
+    content = cache.get(key)
+    if content is None:
+        content = build_snapshot()
+        cache.set(key, content, settings.API_CACHE_TIMEOUT)
+    return content
+
+
+@register_task("snapshot.build")
+def build_current_snapshot():
+    generations = get_change_markers(SNAPSHOT_MODELS)[0]
+    get_snapshot(generations)
+    if settings.API_COMPRESSION:
+        for encoding in supported_encodings():
+            get_snapshot(generations, encoding)
+
+
+def schedule_snapshot_build():
+    """
+    Rebuild the snapshot once the current transaction commits, so readers never
+    build it inline, and re-export the static API when `API_EXPORT_ON_CHANGE` is set.
+    With `TASKS_ENABLED` both are queued for the worker instead.
+    """
+    if settings.TASKS_ENABLED:
+        enqueue("snapshot.build")
+        if settings.API_EXPORT_ON_CHANGE:
+            enqueue("api.export")
+        return
+    on_commit_after_bumps(build_current_snapshot)
+    if settings.API_EXPORT_ON_CHANGE:
+        on_commit_after_bumps(schedule_export)
+
+
+class SnapshotView(PublicReadMixin, APIView):
+    """
+    Serve the whole portfolio in one response.
+    The body is prebuilt JSON stored in the cache under the current model
+    generations, so this path runs neither ORM queries nor serializers. It is
+    also stored precompressed for each accepted encoding.
+    """
+
+    def get(self, request):
+        encoding = negotiate_encoding(request)
+        generations, last_modified = get_change_markers(SNAPSHOT_MODELS)
+        key = f"{snapshot_key(generations)}:{encoding or 'identity'}"
+        etag = quote_etag(hashlib.sha1(key.encode()).hexdigest())
+        last_modified = int(last_modified)
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = HttpResponse(get_snapshot(generations, encoding), content_type="application/json")
+        set_encoding_headers(response, encoding if response.status_code == 200 else None)
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        response["Cache-Control"] = "no-cache"
+        return response
@@ -0,0 +1,80 @@
+from rest_framework import serializers
+from backend.query_plan import get_nested_serializer
+
+
+def parse_paths(value):
+    """Parse a comma-separated list of dotted paths, e.g. "id,subcategories.name", into a tree of dicts."""
+    tree = {}
+    for path in value.split(","):
+        if path.strip():
+            node = tree
+            for name in path.strip().split("."):
+                node = node.setdefault(name, {})
+    return tree
+
+
+def prune_fields(serializer, fields=None, expand=None, prefix=""):
+    """
+    Remove the fields of `serializer` that were not asked for, recursively.
+
+    `fields` keeps only the named fields (None keeps all, a name without children
+    keeps that nested serializer whole). `expand` keeps only the named nested
+    relations (None keeps all, an empty tree none). Unknown names raise a
+    ValidationError keyed by the query parameter.
+    """
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    available = serializer.fields
+    nested = {name: get_nested_serializer(field) for name, field in available.items()}
+    unknown = [f"{prefix}{name}" for name in fields or () if name not in available]
+    if unknown:
+        raise serializers.ValidationError({"fields": [f"Unknown field: {name}." for name in unknown]})
+    unknown = [f"{prefix}{name}" for name in expand or () if nested.get(name) is None]
+    if unknown:
+        raise serializers.ValidationError({"expand": [f"Unknown relation: {name}." for name in unknown]})
+
+    for name in list(available):
+        if fields is not None and name not in fields:
+            del available[name]
+        elif nested[name] is not None:
+            if expand is not None and name not in expand:
+                del available[name]
+            else:
+                prune_fields(
+                    nested[name],
+                    (fields[name] or None) if fields is not None else None,
+                    expand[name] if expand is not None else None,
+                    prefix=f"{prefix}{name}.",
+                )
+
+
+class SparseFieldsMixin:
+    """
+    Viewset mixin for the `?fields=` and `?expand=` query parameters of GET requests.
+
+    `fields=id,name,subcategories.name` selects fields, with dotted paths into
+    nested serializers. `expand=subcategories` selects the nested relations to
+    embed (all of them by default; `expand=` embeds none). Pruned relations are
+    neither serialized nor loaded, since the query plan is built from the pruned
+    serializer. The fast readers always build whole objects, so requests using
+    either parameter take the serializer path.
+    """
+
+    def sparse_params(self):
+        request = getattr(self, "request", None)
+        if request is None or request.method not in ("GET", "HEAD"):
+            return None, None
+        # An empty ?fields= selects nothing useful and is ignored; an empty ?expand= embeds no relations
+        fields = parse_paths(request.query_params.get("fields", "")) or None
+        expand = request.query_params.get("expand")
+        return fields, parse_paths(expand) if expand is not None else None
+
+    def use_fast_reads(self):
+        return super().use_fast_reads() and self.sparse_params() == (None, None)
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        fields, expand = self.sparse_params()
+        if fields is not None or expand is not None:
+            prune_fields(serializer, fields, expand)
+        return serializer
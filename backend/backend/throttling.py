@@ -0,0 +1,148 @@
+import logging
+import threading
+import time
+import redis
+from django.conf import settings
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import BaseThrottle
+from backend.internal import is_internal
+from backend.metrics import record_throttled
+
+logger = logging.getLogger("backend.throttling")
+
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+# Token bucket in one round trip. Refills from the Redis clock, so workers and
+# containers with drifting clocks share one view of every bucket. Returns whether
+# the request is allowed and, as a string since Lua numbers become integers, the
+# seconds until enough tokens are back.
+TOKEN_BUCKET = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call("TIME")
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call("HMGET", KEYS[1], "tokens", "updated")
+local tokens = tonumber(bucket[1]) or capacity
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local allowed, wait = 0, 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    wait = (cost - tokens) / rate
+end
+redis.call("HSET", KEYS[1], "tokens", tostring(tokens), "updated", tostring(now))
+redis.call("PEXPIRE", KEYS[1], math.ceil((capacity - tokens) / rate * 1000) + 1000)
+return {allowed, tostring(wait)}
+"""
+
+
+def parse_rate(rate):
+    """Parse a DRF-style rate such as "100/min" into (requests, period in seconds)."""
+    num, period = rate.split("/")
+    return int(num), PERIODS[period[0]]
+
+
+class RedisBuckets:
+    """Token buckets shared by every process through one Lua script call per request."""
+
+    def __init__(self, url):
+        self.client = redis.Redis.from_url(
+            url, socket_timeout=settings.API_THROTTLE_TIMEOUT, socket_connect_timeout=settings.API_THROTTLE_TIMEOUT
+        )
+        self.script = self.client.register_script(TOKEN_BUCKET)
+
+    def take(self, key, capacity, rate, cost=1):
+        allowed, wait = self.script(keys=[key], args=[capacity, rate, cost])
+        return bool(allowed), float(wait)
+
+
+class LocalBuckets:
+    """
+    In-process counterpart of RedisBuckets, used when no Redis URL is set, e.g.
+    in development and tests. Buckets are per process, so limits multiply with workers.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.buckets = {}
+
+    def take(self, key, capacity, rate, cost=1):
+        now = time.monotonic()
+        with self.lock:
+            tokens, updated = self.buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + max(0.0, now - updated) * rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self.buckets[key] = (tokens, now)
+        return allowed, 0.0 if allowed else (cost - tokens) / rate
+
+
+_buckets = None
+_buckets_lock = threading.Lock()
+
+
+def get_buckets():
+    global _buckets
+    with _buckets_lock:
+        if _buckets is None:
+            url = settings.API_THROTTLE_REDIS_URL
+            _buckets = RedisBuckets(url) if url else LocalBuckets()
+        return _buckets
+
+
+class RedisRateThrottle(BaseThrottle):
+    """
+    Token-bucket throttle with one bucket per client, view and rate name, kept in
+    Redis so every gunicorn worker and container enforces the same limit.
+
+    The rate is looked up by action, then by kind ("read" for safe methods,
+    "write" otherwise), first in the view's `throttle_rates` and then in
+    `API_THROTTLE_RATES`; without a rate the request is not throttled. A bucket
+    holds a full period's worth of requests, so short bursts pass while the
+    sustained rate is capped. Clients are authenticated users, or IP addresses.
+    If Redis cannot be reached the request is allowed rather than failed.
+    Internal renders (the static export and the warmup) are never throttled.
+    """
+
+    def get_rate(self, request, view):
+        """Return the (rate name, rate) that applies to `request`, or (None, None)."""
+        names = (getattr(view, "action", None), "read" if request.method in SAFE_METHODS else "write")
+        for rates in (getattr(view, "throttle_rates", {}), settings.API_THROTTLE_RATES):
+            for name in names:
+                if name and rates.get(name):
+                    return name, rates[name]
+        return None, None
+
+    def get_bucket_key(self, request, view, name):
+        scope = getattr(view, "throttle_scope", None) or getattr(view, "basename", None) or type(view).__name__
+        if request.user and request.user.is_authenticated:
+            ident = f"user:{request.user.pk}"
+        else:
+            ident = f"ip:{self.get_ident(request)}"
+        return f"throttle:{scope}:{name}:{ident}", f"{scope}:{name}"
+
+    def allow_request(self, request, view):
+        self.wait_seconds = None
+        if is_internal(request):
+            return True
+        name, rate = self.get_rate(request, view)
+        if rate is None:
+            return True
+        num, period = parse_rate(rate)
+        key, scope = self.get_bucket_key(request, view, name)
+        try:
+            allowed, wait = get_buckets().take(key, num, num / period)
+        except redis.RedisError as exc:
+            logger.warning("Throttle backend unavailable, allowing request: %s", exc)
+            return True
+        if not allowed:
+            self.wait_seconds = wait
+            record_throttled(scope)
+        return allowed
+
+    def wait(self):
+        return self.wait_seconds
@@ -0,0 +1,13 @@
+from rest_framework.authtoken.views import ObtainAuthToken
+from backend.throttling import RedisRateThrottle
+
+
+class ObtainTokenView(ObtainAuthToken):
+    """
+    Exchange a username and password for an API token, the only request that
+    hashes a password. Kept apart from `backend.authentication`, which DRF
+    imports while loading its views.
+    """
+
+    throttle_classes = [RedisRateThrottle]
+    throttle_rates = {"write": "5/min"}
@@ -1,8 +1,16 @@
 from django.contrib import admin
 from django.urls import include, path
+from backend.metrics import MetricsView
+from backend.search import SearchView
+from backend.snapshot import SnapshotView
+from backend.tokens import ObtainTokenView
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/projects/", include("projects.urls")),
     path("api/about/", include("about.urls")),
+    path("api/snapshot/", SnapshotView.as_view(), name="snapshot"),
+    path("api/search/", SearchView.as_view(), name="search"),
+    path("api/auth/token/", ObtainTokenView.as_view(), name="auth-token"),
+    path("metrics", MetricsView.as_view(), name="metrics"),
 ]
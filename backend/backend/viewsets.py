@@ -0,0 +1,31 @@
+from rest_framework import viewsets
+from backend.async_views import AsyncReadMixin
+from backend.authentication import PublicReadMixin
+from backend.bulk import BulkWriteMixin
+from backend.cache import CachedResponseMixin
+from backend.db_routers import ReplicaReadMixin
+from backend.fast import FastReadMixin
+from backend.query_plan import QueryPlanMixin
+from backend.sparse import SparseFieldsMixin
+
+
+class PortfolioViewSet(
+    PublicReadMixin,
+    ReplicaReadMixin,
+    AsyncReadMixin,
+    CachedResponseMixin,
+    SparseFieldsMixin,
+    FastReadMixin,
+    BulkWriteMixin,
+    QueryPlanMixin,
+    viewsets.ModelViewSet,
+):
+    """
+    ModelViewSet with the read path shared by every portfolio endpoint:
+    anonymous reads without authentication, replica routing for safe methods, async reads under ASGI,
+    response caching with conditional GET, `?fields=`/`?expand=` selection, the optional fast reader
+    and query plans derived from the serializer.
+    Writes also accept lists on `bulk/`, rate limited more tightly than single-object writes.
+    """
+
+    throttle_rates = {"bulk": "10/min", "bulk_update": "10/min", "bulk_destroy": "10/min"}
@@ -0,0 +1,120 @@
+import logging
+import os
+import threading
+import time
+from django.conf import settings
+from django.db import connections
+from django.urls import get_resolver, reverse
+from backend.compression import supported_encodings
+from backend.internal import InternalClient
+from backend.snapshot import build_current_snapshot
+
+logger = logging.getLogger("backend.warmup")
+
+# Exported by docker-entrypoint.sh; processes started otherwise count from their own start
+PROCESS_STARTED_AT = time.time()
+
+_lock = threading.Lock()
+_warm = False
+
+
+class WarmupError(Exception):
+    """A warmed route did not answer 200, so its cache is not primed and the process stays cold."""
+
+
+def container_started_at():
+    """Epoch seconds the container started at, or this process when not started by the entrypoint."""
+    try:
+        return float(os.environ["CONTAINER_STARTED_AT"])
+    except (KeyError, ValueError):
+        return PROCESS_STARTED_AT
+
+
+def is_warm():
+    return _warm
+
+
+def warm_caches():
+    """
+    Build the snapshot and GET every `WARMUP_URL_NAMES` route as an anonymous
+    client for each `WARMUP_HOSTS` host, once per response encoding, so every
+    cached variant a browser asks for is stored. Returns (path, host, encoding,
+    status, ms) for each request; any response but 200 raises WarmupError.
+    """
+    encodings = [None, *supported_encodings()] if settings.API_COMPRESSION else [None]
+    results = []
+    build_current_snapshot()
+    for host in settings.WARMUP_HOSTS:
+        client = InternalClient(host)
+        for name in settings.WARMUP_URL_NAMES:
+            path = reverse(name)
+            for encoding in encodings:
+                started = time.perf_counter()
+                response = client.get(path, HTTP_ACCEPT="application/json", HTTP_ACCEPT_ENCODING=encoding or "identity")
+                elapsed = round((time.perf_counter() - started) * 1000, 2)
+                if response.status_code != 200:
+                    raise WarmupError(f"GET {host}{path} answered {response.status_code}")
+                results.append((path, host, encoding or "identity", response.status_code, elapsed))
+    return results
+
+
+def ensure_warm():
+    """Warm the caches once per process; concurrent callers wait for the run in progress."""
+    global _warm
+    with _lock:
+        if not _warm:
+            warm_caches()
+            _warm = True
+
+
+def connect_databases():
+    """
+    Open a connection to every configured database ahead of the first request.
+    Pooled connections go back to the pool open; others stay open for this
+    thread, which serves the requests of a sync worker, for `CONN_MAX_AGE`.
+    Not used under asgi, where the ORM runs on an executor thread.
+    """
+    for connection in connections.all():
+        connection.ensure_connection()
+        if connection.settings_dict["OPTIONS"].get("pool"):
+            connection.close()
+
+
+def release_connections():
+    """Close every database connection and pool of this process, so forked workers never share a socket."""
+    for connection in connections.all(initialized_only=True):
+        connection.close()
+        if connection.alias in getattr(connection, "_connection_pools", {}):
+            connection.close_pool()
+
+
+def preload():
+    """
+    Called in the gunicorn master once the application is imported with
+    `preload_app`: import every view, serializer and reader through the URLconf
+    and run the warmup, so workers fork with them loaded and already warm, then
+    drop the connections it opened.
+    """
+    # Resolving the URLconf imports every URL module and the views behind them
+    get_resolver().url_patterns
+    try:
+        if settings.STARTUP_WARMUP:
+            ensure_warm()
+    finally:
+        release_connections()
+
+
+def warm_worker():
+    """
+    Called in each sync gunicorn worker before it accepts requests: connect to
+    the databases on the thread that serves them. The caches are warmed once,
+    by `preload` in the master, and workers fork from it already warm; without
+    preload, or when that failed, the readiness check warms the process.
+    Failures are logged, and the worker connects on its first request instead.
+    """
+    if settings.SERVER_MODE == "asgi":
+        return
+    try:
+        connect_databases()
+    except Exception:
+        logger.exception("Worker warmup failed")
@@ -1,9 +1,32 @@
 #!/bin/bash
 
+# Start of the container, for the time-to-first-fast-response metric
+export CONTAINER_STARTED_AT="$(date +%s.%N)"
+
+# Start from an empty Prometheus multiprocess directory, so samples of old workers are not
+# reported. Every process importing backend.metrics writes there, manage.py commands included.
+if [ -n "$PROMETHEUS_MULTIPROC_DIR" ]; then
+    rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+    mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+fi
+
 # Apply database migrations
 echo "Applying database migrations..."
 python manage.py migrate
 
+# Backfill the technology usage summary, which signals keep current from here on
+python manage.py rebuild_technology_usage
+
+# Backfill the project read model when it serves reads
+case "${API_PROJECT_READ_MODEL,,}" in
+    true|1) python manage.py rebuild_project_read_model ;;
+esac
+
+# Export the public API for nginx when changes keep it current
+case "${API_EXPORT_ON_CHANGE,,}" in
+    true|1) python manage.py export_api ;;
+esac
+
 # Start server
 echo "Starting server..."
 exec "$@"
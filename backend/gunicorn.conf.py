@@ -0,0 +1,48 @@
+import os
+
+# SERVER_MODE=asgi runs uvicorn workers over backend.asgi, where list and
+# retrieve reads are served by coroutines; the default keeps sync WSGI workers.
+server_mode = os.environ.get("SERVER_MODE", "wsgi")
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("GUNICORN_WORKERS", "3"))
+
+# GUNICORN_PRELOAD imports the application, and warms it up, once in the master
+# before forking, so workers share its memory and start serving straight away;
+# it is the only place STARTUP_WARMUP warms up before the workers start
+preload_app = os.environ.get("GUNICORN_PRELOAD", "False").lower() in ("true", "1")
+
+if server_mode == "asgi":
+    wsgi_app = "backend.asgi:application"
+    worker_class = "uvicorn.workers.UvicornWorker"
+else:
+    wsgi_app = "backend.wsgi:application"
+    worker_class = "sync"
+
+
+def when_ready(server):
+    if server.cfg.preload_app:
+        from backend.warmup import preload
+
+        preload()
+
+
+def post_fork(server, worker):
+    from backend.metrics import worker_started
+
+    worker_started()
+
+
+def post_worker_init(worker):
+    # Runs once the worker has loaded the application, before it accepts requests;
+    # sync workers connect to the databases there
+    from backend.warmup import warm_worker
+
+    warm_worker()
+
+
+def child_exit(server, worker):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -1,4 +1,5 @@
 from django.contrib import admin
+from backend.search import SearchVectorAdminMixin
 from .models import Category, Subcategory, Project, Technology
 
 
@@ -31,7 +32,7 @@ class TechnologyAdmin(admin.ModelAdmin):
     list_filter = ["subcategory__category", "subcategory"]
 
 
-class ProjectAdmin(admin.ModelAdmin):
+class ProjectAdmin(SearchVectorAdminMixin, admin.ModelAdmin):
     list_display = ("name", "github")
     search_fields = ["name", "description"]
     filter_horizontal = ["technology"]
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class ProjectsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "projects"
+
+    def ready(self):
+        from . import read_model, signals, usage  # noqa: F401
+
+        # Connects the token cache eviction in every process, not only those that served a request
+        import backend.authentication  # noqa: F401
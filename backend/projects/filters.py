@@ -0,0 +1,39 @@
+from django.db.models import Q
+from rest_framework.filters import BaseFilterBackend
+from .models import Project
+
+# Largest primary key of the BigAutoField ids; longer numbers can only be names
+MAX_ID = 2**63 - 1
+
+
+def id_or_name(field, value):
+    """
+    Match a related object by exact name, or by primary key when `value` is a
+    plain ASCII number in the id range. Names made of digits still match.
+    """
+    lookup = Q(**{f"{field}__name": value})
+    if value.isascii() and value.isdigit() and int(value) <= MAX_ID:
+        lookup |= Q(**{field: int(value)})
+    return lookup
+
+
+class ProjectFilterBackend(BaseFilterBackend):
+    """
+    Filter projects by `category`, `subcategory` and `technology`.
+    Each parameter takes either an id or an exact name, so lookups hit the name indexes.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+        if params.get("category"):
+            queryset = queryset.filter(id_or_name("category", params["category"]))
+
+        # Filter through the M2M table with a subquery so projects are never duplicated
+        through = Project.technology.through.objects
+        if params.get("technology"):
+            technology = id_or_name("technology", params["technology"])
+            queryset = queryset.filter(pk__in=through.filter(technology).values("project_id"))
+        if params.get("subcategory"):
+            subcategory = id_or_name("technology__subcategory", params["subcategory"])
+            queryset = queryset.filter(pk__in=through.filter(subcategory).values("project_id"))
+        return queryset
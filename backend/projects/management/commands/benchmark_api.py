@@ -0,0 +1,108 @@
+import json
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test.runner import DiscoverRunner
+from django.test.utils import setup_test_environment, teardown_test_environment
+from backend.benchmark import check_results, load_baseline, measure_auth, measure_writes, run_benchmark
+
+DEFAULT_BASELINE = settings.BASE_DIR / "benchmarks" / "baseline.json"
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark every router endpoint against synthetic datasets in a throwaway test database. "
+        "Fails when queries per request grow with the dataset or exceed the stored baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scales", default="10,1000", help="Comma-separated dataset sizes, e.g. 10,1000,100000")
+        parser.add_argument("--requests", type=int, default=20, help="Requests per endpoint and scale")
+        parser.add_argument("--warm", action="store_true", help="Keep the response cache between requests")
+        parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline JSON file")
+        parser.add_argument("--update-baseline", action="store_true", help="Write the results as the new baseline")
+        parser.add_argument(
+            "--writes", type=int, default=0, help="Also compare one-by-one and bulk creation of this many projects"
+        )
+        parser.add_argument(
+            "--auth",
+            type=int,
+            default=0,
+            help="Also compare CPU per request of this many anonymous, token and basic reads",
+        )
+        parser.add_argument(
+            "--latency-tolerance",
+            type=float,
+            default=None,
+            help="Also fail when p95 latency exceeds the baseline by this fraction, e.g. 0.5",
+        )
+
+    def handle(self, *args, **options):
+        scales = [int(scale) for scale in options["scales"].split(",")]
+        setup_test_environment()
+        runner = DiscoverRunner(verbosity=0, interactive=False)
+        old_config = runner.setup_databases()
+        try:
+            results = {str(scale): self.run_scale(scale, options) for scale in scales}
+            if options["writes"]:
+                self.run_writes(options["writes"])
+            if options["auth"]:
+                self.run_auth(options["auth"])
+        finally:
+            runner.teardown_databases(old_config)
+            teardown_test_environment()
+
+        if options["update_baseline"]:
+            with open(options["baseline"], "w") as file:
+                json.dump(results, file, indent=2, sort_keys=True)
+                file.write("\n")
+            self.stdout.write(self.style.SUCCESS(f"Baseline written to {options['baseline']}"))
+            return
+
+        failures = check_results(results, load_baseline(options["baseline"]), options["latency_tolerance"])
+        for failure in failures:
+            self.stderr.write(self.style.ERROR(failure))
+        if failures:
+            raise CommandError(f"{len(failures)} benchmark check(s) failed")
+        self.stdout.write(self.style.SUCCESS("All benchmark checks passed"))
+
+    def run_scale(self, scale, options):
+        # Every scale starts from an empty database and cache
+        cache.clear()
+        with transaction.atomic():
+            results = run_benchmark(scale, options["requests"], options["warm"])
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"\nScale {scale}")
+        self.stdout.write(f"{'endpoint':<32}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'queries':>9}{'bytes':>10}")
+        for endpoint, metrics in results.items():
+            self.stdout.write(
+                f"{endpoint:<32}{metrics['p50']:>10}{metrics['p95']:>10}{metrics['p99']:>10}"
+                f"{metrics['queries']:>9}{metrics['bytes']:>10}"
+            )
+        return results
+
+    def run_writes(self, rows):
+        cache.clear()
+        with transaction.atomic():
+            results = measure_writes(rows)
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"\nCreating {rows} projects")
+        for path, metrics in results.items():
+            self.stdout.write(f"{path:<32}{metrics['rows_per_second']:>10} rows/s{metrics['queries']:>9} queries")
+        speedup = results["bulk"]["rows_per_second"] / results["one-by-one"]["rows_per_second"]
+        self.stdout.write(f"bulk/ is {speedup:.1f}x faster")
+
+    def run_auth(self, requests):
+        cache.clear()
+        with transaction.atomic():
+            results = measure_auth(requests)
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"\nCPU per warm project list read ({requests} requests)")
+        for scheme, metrics in results.items():
+            self.stdout.write(f"{scheme:<32}{metrics['cpu_ms']:>10} ms")
+        saved = results["basic"]["cpu_ms"] - results["anonymous"]["cpu_ms"]
+        self.stdout.write(f"public reads save {saved:.3f} ms of CPU per request over basic authentication")
@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from backend.export import export_api
+
+
+class Command(BaseCommand):
+    help = (
+        "Render every public GET endpoint of the projects and about APIs to static JSON files, "
+        "with gzip and brotli variants, content-hashed names and a manifest, for nginx or a CDN."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", default=settings.API_EXPORT_ROOT, help="Export directory")
+        parser.add_argument("--host", default=settings.API_EXPORT_HOST, help="Host the pages are rendered for")
+
+    def handle(self, *args, **options):
+        manifest = export_api(options["output"], options["host"])
+        for path, entry in manifest["paths"].items():
+            sizes = " ".join(f"{encoding}={size}" for encoding, size in entry["bytes"].items())
+            self.stdout.write(f"{path:<48}{sizes}")
+        self.stdout.write(self.style.SUCCESS(f"Exported {len(manifest['paths'])} endpoints to {options['output']}"))
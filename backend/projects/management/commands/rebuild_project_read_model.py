@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from projects.models import Project, ProjectReadModel
+from projects.read_model import refresh_read_models
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the read model of every project. While API_PROJECT_READ_MODEL is enabled, signals keep it "
+        "current; this backfills it after enabling the setting and repairs it after writes that bypass signals."
+    )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            ids = set(Project.objects.values_list("pk", flat=True))
+            # Also drops rows left behind by projects deleted while the setting was off
+            refresh_read_models(ids | set(ProjectReadModel.objects.values_list("pk", flat=True)))
+        self.stdout.write(self.style.SUCCESS(f"Read model of {len(ids)} projects rebuilt"))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from projects.models import Technology
+from projects.usage import refresh_usage
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the usage summary of every technology. Link changes keep it current; "
+        "this backfills it and repairs it after writes that bypass signals, such as raw SQL."
+    )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            ids = list(Technology.objects.values_list("pk", flat=True))
+            refresh_usage(ids)
+        self.stdout.write(self.style.SUCCESS(f"Usage of {len(ids)} technologies rebuilt"))
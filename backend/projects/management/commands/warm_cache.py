@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from backend.warmup import warm_caches
+
+
+class Command(BaseCommand):
+    help = (
+        "Prime the snapshot and the response caches of the WARMUP_URL_NAMES routes in every encoding. "
+        "The gunicorn master runs the same warmup when STARTUP_WARMUP and GUNICORN_PRELOAD are set."
+    )
+
+    def handle(self, *args, **options):
+        results = warm_caches()
+        for path, host, encoding, status, elapsed in results:
+            self.stdout.write(f"{host}{path} [{encoding}] {status} in {elapsed} ms")
+        self.stdout.write(self.style.SUCCESS(f"Warmed {len(results)} responses"))
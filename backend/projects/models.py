@@ -1,8 +1,9 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 
 
 class Category(models.Model):
-    name = models.CharField(max_length=50)
+    name = models.CharField(max_length=50, db_index=True)
 
     def __str__(self):
         return self.name
@@ -12,7 +13,7 @@ class Category(models.Model):
 
 
 class Subcategory(models.Model):
-    name = models.CharField(max_length=50)
+    name = models.CharField(max_length=50, db_index=True)
     category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name="subcategories")
 
     def __str__(self):
@@ -23,7 +24,8 @@ class Subcategory(models.Model):
 
 
 class Technology(models.Model):
-    name = models.CharField(max_length=50)
+    name = models.CharField(max_length=50, unique=True)
+    search_vector = SearchVectorField(null=True, editable=False)
     subcategory = models.ForeignKey(
         Subcategory,
         on_delete=models.CASCADE,
@@ -40,11 +42,59 @@ class Technology(models.Model):
 
 
 class Project(models.Model):
-    name = models.CharField(max_length=20)
+    name = models.CharField(max_length=20, db_index=True)
     description = models.TextField()
     category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name="projects", null=True)
     technology = models.ManyToManyField(Technology, related_name="projects")
     github = models.URLField(max_length=200)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    def __str__(self):
+        return self.name
+
+
+class TechnologyUsage(models.Model):
+    """
+    How much a technology is used, kept up to date by `projects.usage` whenever
+    its project or job links change, so the usage API never aggregates.
+    """
+
+    technology = models.OneToOneField(Technology, on_delete=models.CASCADE, primary_key=True, related_name="usage")
+    project_count = models.PositiveIntegerField(default=0)
+    job_count = models.PositiveIntegerField(default=0)
+    current_job_count = models.PositiveIntegerField(default=0)
+    first_used = models.DateField(null=True)
+    # NULL while a job without an end date uses it, read as today
+    last_used = models.DateField(null=True)
+
+    class Meta:
+        verbose_name_plural = "Technology usage"
+
+    def __str__(self):
+        return f"{self.technology_id}: {self.project_count} projects, {self.job_count} jobs"
+
+
+class ProjectReadModel(models.Model):
+    """
+    A project as the API renders it, kept up to date by `projects.read_model`
+    from model signals: category name, technologies and their subcategory names
+    are resolved ahead of time, so reading a page is one scan of this table.
+    `id` is the project's id, so keyset pagination and lookups are unchanged.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    name = models.CharField(max_length=20)
+    description = models.TextField()
+    technology = models.JSONField(default=list)
+    github = models.URLField(max_length=200)
+    category = models.CharField(max_length=50, null=True)
+    category_id = models.BigIntegerField(null=True, db_index=True)
+    technology_ids = models.JSONField(default=list)
+    technology_names = models.JSONField(default=list)
+    subcategory_tags = models.JSONField(default=list)
+
+    class Meta:
+        verbose_name = "project read model"
 
     def __str__(self):
         return self.name
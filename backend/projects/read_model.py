@@ -0,0 +1,155 @@
+from django.conf import settings
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from backend.bulk import rows_written
+from backend.cache import bump_generation, on_commit_with_ids
+from backend.fast import Reader, group_by
+from tasks.queue import enqueue, register_task
+from .models import Category, Project, ProjectReadModel, Subcategory, Technology
+
+ProjectTechnology = Project.technology.through
+READ_FIELDS = ["name", "description", "technology", "github", "category", "category_id"]
+TAG_FIELDS = ["technology_ids", "technology_names", "subcategory_tags"]
+
+
+@register_task("read_model.refresh")
+def run_refresh(ids):
+    refresh_read_models(ids)
+
+
+def refresh_read_models(project_ids):
+    """
+    Rebuild the ProjectReadModel rows of `project_ids` with three queries and one
+    upsert, however many projects changed, and drop the rows of deleted projects.
+    """
+    ids = set(project_ids)
+    if not ids:
+        return
+    projects = list(
+        Project.objects.filter(pk__in=ids).values("id", "name", "description", "github", "category", "category__name")
+    )
+    technologies = group_by(
+        Technology.objects.filter(projects__in=ids).values(
+            "id", "name", "subcategory", "subcategory__name", owner=F("projects")
+        ),
+        "owner",
+    )
+    rows = []
+    for project in projects:
+        linked = technologies.get(project["id"], [])
+        tags = [technology.pop("subcategory__name") for technology in linked]
+        rows.append(
+            ProjectReadModel(
+                id=project["id"],
+                name=project["name"],
+                description=project["description"],
+                technology=linked,
+                github=project["github"],
+                category=project["category__name"],
+                category_id=project["category"],
+                technology_ids=[technology["id"] for technology in linked],
+                technology_names=[technology["name"] for technology in linked],
+                subcategory_tags=list(dict.fromkeys(tag for tag in tags if tag is not None)),
+            )
+        )
+    ProjectReadModel.objects.bulk_create(
+        rows, update_conflicts=True, unique_fields=["id"], update_fields=READ_FIELDS + TAG_FIELDS
+    )
+    ProjectReadModel.objects.filter(pk__in=ids - {project["id"] for project in projects}).delete()
+    bump_generation(ProjectReadModel)
+
+
+def schedule_read_model_refresh(project_ids, fan_out=False):
+    """
+    Refresh the read models of `project_ids` when the current transaction
+    commits, if `API_PROJECT_READ_MODEL` is enabled. Changes made in the same
+    transaction share one refresh, through `on_commit_with_ids`.
+    Written projects are always refreshed on commit, so a client reads its own
+    writes; with `TASKS_ENABLED`, `fan_out` refreshes (the projects of a renamed
+    category, subcategory or technology) are queued for the worker instead.
+    """
+    if not project_ids or not settings.API_PROJECT_READ_MODEL:
+        return
+    if settings.TASKS_ENABLED and fan_out:
+        enqueue("read_model.refresh", ids=sorted(project_ids))
+        return
+    on_commit_with_ids(refresh_read_models, project_ids)
+
+
+def projects_using(**lookup):
+    """Ids of the projects linked to the technologies matching `lookup`."""
+    return set(ProjectTechnology.objects.filter(**lookup).values_list("project_id", flat=True))
+
+
+def project_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        schedule_read_model_refresh({instance.pk})
+
+
+def projects_written(sender, objects, **kwargs):
+    schedule_read_model_refresh({obj.pk for obj in objects})
+
+
+def links_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action in ("post_add", "post_remove"):
+        schedule_read_model_refresh(pk_set if reverse else {instance.pk})
+    elif action == "pre_clear":
+        schedule_read_model_refresh(projects_using(technology=instance) if reverse else {instance.pk})
+
+
+def technology_changed(sender, instance, created=False, raw=False, **kwargs):
+    # Names and subcategories are copied into the rows; deletes drop links without m2m_changed
+    if not created and not raw:
+        schedule_read_model_refresh(projects_using(technology=instance), fan_out=True)
+
+
+def subcategory_changed(sender, instance, created=False, raw=False, **kwargs):
+    if not created and not raw:
+        schedule_read_model_refresh(projects_using(technology__subcategory=instance), fan_out=True)
+
+
+def category_changed(sender, instance, created=False, raw=False, **kwargs):
+    if not created and not raw:
+        schedule_read_model_refresh(set(instance.projects.values_list("pk", flat=True)), fan_out=True)
+
+
+def related_written(sender, objects, created, **kwargs):
+    if created:
+        return
+    if sender is Category:
+        project_ids = set(Project.objects.filter(category__in=objects).values_list("pk", flat=True))
+    else:
+        lookup = "technology__in" if sender is Technology else "technology__subcategory__in"
+        project_ids = projects_using(**{lookup: objects})
+    schedule_read_model_refresh(project_ids, fan_out=True)
+
+
+class ProjectReadModelReader(Reader):
+    """
+    Reads projects from ProjectReadModel rows instead of joining technologies,
+    subcategories and categories. Unfiltered lists scan the table by its primary
+    key; filters from ProjectFilterBackend apply to the projects through a subquery.
+    """
+
+    values = ("id", "name", "description", "technology", "github", "category")
+
+    def rows(self, queryset):
+        source = ProjectReadModel.objects.all()
+        if queryset.query.where:
+            source = source.filter(pk__in=queryset.values("pk"))
+        return source.values(*self.values)
+
+    def assemble(self, rows):
+        return list(rows)
+
+
+post_save.connect(project_changed, sender=Project)
+post_delete.connect(project_changed, sender=Project)
+rows_written.connect(projects_written, sender=Project)
+m2m_changed.connect(links_changed, sender=ProjectTechnology)
+post_save.connect(technology_changed, sender=Technology)
+pre_delete.connect(technology_changed, sender=Technology)
+post_save.connect(subcategory_changed, sender=Subcategory)
+post_save.connect(category_changed, sender=Category)
+for model in (Category, Subcategory, Technology):
+    rows_written.connect(related_written, sender=model)
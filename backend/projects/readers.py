@@ -0,0 +1,65 @@
+from django.db.models import F
+from backend.fast import Reader, group_by
+from .models import Subcategory, Technology
+
+
+def technologies_by_owner(relation, ids):
+    """
+    Return TechnologySerializer rows grouped by owner id for a technologies M2M.
+    `relation` is the query name from Technology to the owner, e.g. "projects".
+    """
+    rows = Technology.objects.filter(**{f"{relation}__in": ids}).values("id", "name", "subcategory", owner=F(relation))
+    return group_by(rows, "owner")
+
+
+class TechnologyReader(Reader):
+    values = ("id", "name", "subcategory")
+
+    def assemble(self, rows):
+        return list(rows)
+
+
+class SubcategoryReader(Reader):
+    values = ("id", "name", "category")
+
+    def assemble(self, rows):
+        technologies = group_by(
+            Technology.objects.filter(subcategory__in=[row["id"] for row in rows]).values(
+                "id", "name", "subcategory", owner=F("subcategory")
+            ),
+            "owner",
+        )
+        return [{**row, "technologies": technologies.get(row["id"], [])} for row in rows]
+
+
+class CategoryReader(Reader):
+    values = ("id", "name")
+
+    def assemble(self, rows):
+        subcategories = SubcategoryReader().assemble(
+            list(
+                Subcategory.objects.filter(category__in=[row["id"] for row in rows]).values(
+                    "id", "name", "category", owner=F("category")
+                )
+            )
+        )
+        subcategories = group_by(subcategories, "owner")
+        return [{**row, "subcategories": subcategories.get(row["id"], [])} for row in rows]
+
+
+class ProjectReader(Reader):
+    values = ("id", "name", "description", "github", "category__name")
+
+    def assemble(self, rows):
+        technologies = technologies_by_owner("projects", [row["id"] for row in rows])
+        return [
+            {
+                "id": row["id"],
+                "name": row["name"],
+                "description": row["description"],
+                "technology": technologies.get(row["id"], []),
+                "github": row["github"],
+                "category": row["category__name"],
+            }
+            for row in rows
+        ]
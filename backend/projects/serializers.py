@@ -1,33 +1,48 @@
 from rest_framework import serializers
+from backend.bulk import BulkListSerializer, BulkModelSerializer
+from backend.relations import NestedRelatedField, PreloadedPrimaryKeyRelatedField
 from .models import Category, Subcategory, Project, Technology
 
 
-class TechnologySerializer(serializers.ModelSerializer):
+class TechnologySerializer(BulkModelSerializer):
     class Meta:
         model = Technology
         fields = ["id", "name", "subcategory"]
+        list_serializer_class = BulkListSerializer
 
 
-class SubcategorySerializer(serializers.ModelSerializer):
+class SubcategorySerializer(BulkModelSerializer):
     technologies = TechnologySerializer(many=True, read_only=True)
 
     class Meta:
         model = Subcategory
         fields = ["id", "name", "category", "technologies"]
+        prefetch_related = ["technologies"]
+        list_serializer_class = BulkListSerializer
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(BulkModelSerializer):
     subcategories = SubcategorySerializer(many=True, read_only=True)
 
     class Meta:
         model = Category
         fields = ["id", "name", "subcategories"]
+        prefetch_related = ["subcategories"]
+        list_serializer_class = BulkListSerializer
 
 
-class ProjectSerializer(serializers.ModelSerializer):
-    technology = TechnologySerializer(many=True, read_only=True)
+class ProjectSerializer(BulkModelSerializer):
+    technology = NestedRelatedField(
+        TechnologySerializer(many=True), queryset=Technology.objects.all(), slug_field="name", required=False
+    )
     category = serializers.StringRelatedField()
+    category_id = PreloadedPrimaryKeyRelatedField(
+        queryset=Category.objects.all(), source="category", write_only=True, required=False, allow_null=True
+    )
 
     class Meta:
         model = Project
-        fields = ["id", "name", "description", "technology", "github", "category"]
+        fields = ["id", "name", "description", "technology", "github", "category", "category_id"]
+        select_related = ["category"]
+        prefetch_related = ["technology"]
+        list_serializer_class = BulkListSerializer
@@ -0,0 +1,24 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from backend.cache import bump_generation
+from backend.search import register_search
+from backend.snapshot import schedule_snapshot_build
+from .models import Category, Subcategory, Technology, Project
+
+
+def invalidate_model(sender, **kwargs):
+    bump_generation(sender)
+    schedule_snapshot_build()
+
+
+def invalidate_project_technologies(sender, action, **kwargs):
+    if action.startswith("post_"):
+        bump_generation(Project)
+        schedule_snapshot_build()
+
+
+for model in (Category, Subcategory, Technology, Project):
+    post_save.connect(invalidate_model, sender=model)
+    post_delete.connect(invalidate_model, sender=model)
+m2m_changed.connect(invalidate_project_technologies, sender=Project.technology.through)
+register_search("project", Project, {"name": "A", "description": "B"}, trigram=("name",), title="name")
+register_search("technology", Technology, {"name": "A"}, trigram=("name",), title="name")
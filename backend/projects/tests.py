@@ -1,8 +1,50 @@
-from django.test import TestCase
-from rest_framework.test import APITestCase
+import asyncio
+import fcntl
+import gzip
+import hashlib
+import importlib
+import io
+import json
+import shutil
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+from unittest import mock
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.sql import emit_post_migrate_signal
+from django.db import connection, transaction
+from django.db.models.signals import post_save
+from redis.exceptions import ConnectionError as RedisConnectionError
+from django.test import AsyncClient, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.permissions import BasePermission, IsAuthenticatedOrReadOnly
+from rest_framework.test import APITestCase, APIRequestFactory, APITransactionTestCase
 from rest_framework import status
 from django.urls import reverse
-from .models import Category, Subcategory, Technology, Project
+from about.models import Achievement, Job
+from backend import health, metrics, search, warmup
+from backend.authentication import CachedTokenAuthentication, token_cache_key
+from backend.benchmark import check_results, measure_auth, run_benchmark
+from backend.cache import bump_generation, generation_key, on_commit_after_bumps
+from backend.compression import negotiate_encoding, supported_encodings
+from backend.export import ExportError, brotli, export_api
+from backend.db_routers import PIN_PRIMARY_KEY, ReplicaRouter, use_replica
+from backend.pagination import KeysetPagination
+from backend.relations import PreloadedPrimaryKeyRelatedField
+from backend.settings import base as base_settings
+from backend.snapshot import build_snapshot, schedule_snapshot_build
+from backend.throttling import LocalBuckets, RedisBuckets, RedisRateThrottle, parse_rate
+from tasks.models import Task
+from .models import Category, Subcategory, Technology, TechnologyUsage, Project, ProjectReadModel
+from .read_model import refresh_read_models
+from .usage import refresh_usage
+from .views import CategoryViewSet, ProjectViewSet, TechnologyViewSet
 from .serializers import CategorySerializer, SubcategorySerializer, TechnologySerializer, ProjectSerializer
 
 
@@ -115,9 +157,9 @@ class APITests(APITestCase):
         """
         response = self.client.get(self.category_list_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["name"], "Programming")
-        self.assertTrue("subcategories" in response.data[0])
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["name"], "Programming")
+        self.assertTrue("subcategories" in response.data["results"][0])
 
     def test_create_category(self):
         """
@@ -143,9 +185,9 @@ class APITests(APITestCase):
         """
         response = self.client.get(self.subcategory_list_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["name"], "Web Development")
-        self.assertTrue("technologies" in response.data[0])
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["name"], "Web Development")
+        self.assertTrue("technologies" in response.data["results"][0])
 
     def test_create_subcategory(self):
         """
@@ -246,3 +288,1902 @@ class SerializerTests(TestCase):
         self.assertEqual(data["name"], "Portfolio")
         self.assertEqual(data["description"], "My portfolio website")
         self.assertTrue("technology" in data)
+
+
+class QueryCountTests(APITestCase):
+    """
+    Test suite for the query plan of the list endpoints.
+    Each endpoint must run a fixed number of queries no matter how many rows
+    it returns, so nested serializers never fall back to per-row lookups.
+    """
+
+    def create_portfolio(self, size):
+        """
+        Create `size` categories, each with `size` subcategories holding `size`
+        technologies, plus `size` projects using every technology of their category.
+        """
+        for i in range(size):
+            category = Category.objects.create(name=f"Category {i}")
+            technologies = []
+            for j in range(size):
+                subcategory = Subcategory.objects.create(name=f"Subcategory {i}.{j}", category=category)
+                for k in range(size):
+                    technologies.append(
+                        Technology.objects.create(name=f"Technology {size}.{i}.{j}.{k}", subcategory=subcategory)
+                    )
+            for j in range(size):
+                project = Project.objects.create(
+                    name=f"Project {i}.{j}",
+                    description="Description",
+                    category=category,
+                    github="https://github.com/user/project",
+                )
+                project.technology.add(*technologies)
+
+    def assertListQueries(self, url_name, num):
+        """Assert that the list endpoint runs `num` queries for both a small and a large portfolio"""
+        url = reverse(url_name)
+        for size in (1, 4):
+            self.create_portfolio(size)
+            with self.assertNumQueries(num):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_project_list_queries(self):
+        """Projects, their category and their technologies"""
+        self.assertListQueries("project-list", 2)
+
+    def test_category_list_queries(self):
+        """Categories, subcategories and technologies"""
+        self.assertListQueries("category-list", 3)
+
+    def test_subcategory_list_queries(self):
+        """Subcategories and technologies"""
+        self.assertListQueries("subcategory-list", 2)
+
+    def test_technology_list_queries(self):
+        """Technologies only, the subcategory is rendered from its foreign key"""
+        self.assertListQueries("technology-list", 1)
+
+    def test_category_projects_queries(self):
+        """Category lookup alone, then projects with category and technologies"""
+        self.create_portfolio(3)
+        category = Category.objects.first()
+        url = reverse("category-projects", kwargs={"pk": category.pk})
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 3)
+
+
+class ProjectFilterTests(APITestCase):
+    """
+    Test suite for server-side project filtering.
+    Verifies that category, subcategory, technology and search parameters
+    only return matching projects, whether given as ids or names.
+    """
+
+    def setUp(self):
+        """
+        Create two categories with one project each.
+        The infrastructure project uses two technologies to check that
+        M2M filters never return duplicate rows.
+        """
+        self.infra = Category.objects.create(name="Infrastructure & Cloud")
+        self.ml = Category.objects.create(name="Machine Learning & AI")
+        cloud = Subcategory.objects.create(name="Cloud", category=self.infra)
+        models = Subcategory.objects.create(name="Models", category=self.ml)
+        self.terraform = Technology.objects.create(name="Terraform", subcategory=cloud)
+        self.aws = Technology.objects.create(name="AWS", subcategory=cloud)
+        self.pytorch = Technology.objects.create(name="PyTorch", subcategory=models)
+
+        self.infra_project = Project.objects.create(
+            name="Cluster", description="Kubernetes cluster", category=self.infra, github="https://github.com/u/a"
+        )
+        self.infra_project.technology.add(self.terraform, self.aws)
+        self.ml_project = Project.objects.create(
+            name="Classifier", description="Image classifier", category=self.ml, github="https://github.com/u/b"
+        )
+        self.ml_project.technology.add(self.pytorch)
+        self.url = reverse("project-list")
+
+    def get_names(self, params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [project["name"] for project in response.data["results"]]
+
+    def test_filter_by_category_name(self):
+        """Test filtering by the category display name sent by the frontend"""
+        self.assertEqual(self.get_names({"category": "Infrastructure & Cloud"}), ["Cluster"])
+
+    def test_filter_by_category_id(self):
+        """Test filtering by category primary key"""
+        self.assertEqual(self.get_names({"category": self.ml.id}), ["Classifier"])
+
+    def test_filter_by_technology(self):
+        """Test filtering by technology name and id"""
+        self.assertEqual(self.get_names({"technology": "PyTorch"}), ["Classifier"])
+        self.assertEqual(self.get_names({"technology": self.aws.id}), ["Cluster"])
+
+    def test_filter_by_numeric_names_and_bad_ids(self):
+        """Test that digit-only names match, and that non-ASCII digits or out-of-range ids match nothing"""
+        numbered = Category.objects.create(name="2024")
+        Project.objects.create(name="Recent", description="d", category=numbered, github="https://github.com/u/c")
+        self.assertEqual(self.get_names({"category": "2024"}), ["Recent"])
+        self.assertEqual(self.get_names({"category": "²"}), [])
+        self.assertEqual(self.get_names({"technology": "99999999999999999999999"}), [])
+
+    def test_filter_by_subcategory_has_no_duplicates(self):
+        """Test that a project matching through several technologies is returned once"""
+        self.assertEqual(self.get_names({"subcategory": "Cloud"}), ["Cluster"])
+
+    def test_search(self):
+        """Test free text search over name and description"""
+        self.assertEqual(self.get_names({"search": "kubernetes"}), ["Cluster"])
+        self.assertEqual(self.get_names({"search": "classifier"}), ["Classifier"])
+
+    def test_unknown_category_returns_nothing(self):
+        """Test that an unknown category yields an empty list instead of every project"""
+        self.assertEqual(self.get_names({"category": "Unknown"}), [])
+
+
+class PaginationTests(APITestCase):
+    """
+    Test suite for cursor pagination on the list endpoints.
+    Verifies page envelopes, page size control and stable traversal.
+    """
+
+    def setUp(self):
+        self.projects = [
+            Project.objects.create(name=f"Project {i}", description="Description", github="https://github.com/u/p")
+            for i in range(5)
+        ]
+        self.url = reverse("project-list")
+
+    def test_page_envelope(self):
+        """Test that list responses carry next/previous cursors and results"""
+        response = self.client.get(self.url, {"page_size": 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data), {"next", "previous", "results"})
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertIsNone(response.data["previous"])
+        self.assertIsNotNone(response.data["next"])
+
+    def test_walk_all_pages(self):
+        """
+        Test following next cursors.
+        Verifies:
+        1. Every project is returned exactly once in id order
+        2. Later pages run the same number of queries as the first
+        """
+        ids = []
+        url = f"{self.url}?page_size=2"
+        while url:
+            with self.assertNumQueries(2):
+                response = self.client.get(url)
+            ids += [project["id"] for project in response.data["results"]]
+            url = response.data["next"]
+        self.assertEqual(ids, [project.id for project in self.projects])
+
+    def test_max_page_size(self):
+        """Test that page_size is capped by API_MAX_PAGE_SIZE"""
+        with mock.patch.object(KeysetPagination, "max_page_size", 3):
+            response = self.client.get(self.url, {"page_size": 100})
+        self.assertEqual(len(response.data["results"]), 3)
+
+
+class ResponseCacheTests(APITestCase):
+    """
+    Test suite for the versioned response cache.
+    Verifies that repeated reads are served from the cache and that any
+    change to a model the response depends on invalidates it.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name="Programming")
+        self.subcategory = Subcategory.objects.create(name="Web Development", category=self.category)
+        self.technology = Technology.objects.create(name="Python", subcategory=self.subcategory)
+        self.project = Project.objects.create(
+            name="Portfolio", description="My portfolio website", category=self.category, github="https://g.com/p"
+        )
+        self.url = reverse("project-list")
+
+    def test_repeated_read_is_a_hit(self):
+        """Test that the second identical request runs no queries"""
+        first = self.client.get(self.url)
+        self.assertEqual(first["X-Cache"], "MISS")
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(second.content, first.content)
+
+    def test_save_invalidates(self):
+        """Test that saving a project outside the API is visible on the next read"""
+        self.client.get(self.url)
+        self.project.name = "Renamed"
+        self.project.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["results"][0]["name"], "Renamed")
+
+    def test_related_model_change_invalidates(self):
+        """Test that renaming the category invalidates cached projects"""
+        self.client.get(self.url)
+        self.category.name = "Design"
+        self.category.save()
+        self.assertEqual(self.client.get(self.url).data["results"][0]["category"], "Design")
+
+    def test_m2m_change_invalidates(self):
+        """Test that adding a technology to a project invalidates cached projects"""
+        self.client.get(self.url)
+        self.project.technology.add(self.technology)
+        self.assertEqual(len(self.client.get(self.url).data["results"][0]["technology"]), 1)
+
+    def test_delete_invalidates(self):
+        """Test that deleting a technology invalidates cached categories"""
+        url = reverse("category-list")
+        self.client.get(url)
+        self.technology.delete()
+        self.assertEqual(self.client.get(url).data["results"][0]["subcategories"][0]["technologies"], [])
+
+    def test_cache_stats(self):
+        """
+        Test the cache statistics endpoint.
+        Verifies:
+        1. Only staff users can read it
+        2. Hits and misses are counted
+        """
+        self.client.get(self.url)
+        self.client.get(self.url)
+        stats_url = reverse("cache-stats")
+        # Token authentication challenges anonymous requests with 401
+        self.assertEqual(self.client.get(stats_url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+        admin = User.objects.create_superuser("admin", "admin@example.com", "password")
+        self.client.force_authenticate(admin)
+        response = self.client.get(stats_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["hits"], 1)
+        self.assertEqual(response.data["misses"], 1)
+        self.assertEqual(response.data["hit_ratio"], 0.5)
+
+
+class ConditionalRequestTests(APITestCase):
+    """
+    Test suite for ETag and Last-Modified validators.
+    Verifies that unchanged resources are answered with 304 without touching
+    the database and that edits produce new validators.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name="Programming")
+        self.url = reverse("category-detail", kwargs={"pk": self.category.pk})
+
+    def test_validators_present(self):
+        """Test that reads carry a strong ETag and a Last-Modified date"""
+        response = self.client.get(self.url)
+        self.assertTrue(response["ETag"].startswith('"'))
+        self.assertIn("Last-Modified", response)
+        self.assertEqual(response["Cache-Control"], "no-cache")
+
+    def test_if_none_match(self):
+        """Test that a matching If-None-Match is answered with 304 and no queries"""
+        etag = self.client.get(self.url)["ETag"]
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_if_modified_since(self):
+        """Test that If-Modified-Since equal to Last-Modified is answered with 304"""
+        last_modified = self.client.get(self.url)["Last-Modified"]
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_edit_changes_etag(self):
+        """Test that an edit invalidates the previous ETag"""
+        etag = self.client.get(self.url)["ETag"]
+        Subcategory.objects.create(name="Web Development", category=self.category)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(len(response.data["subcategories"]), 1)
+
+    def test_etag_differs_per_url(self):
+        """Test that list and detail responses never share an ETag"""
+        self.assertNotEqual(self.client.get(self.url)["ETag"], self.client.get(reverse("category-list"))["ETag"])
+
+
+class SnapshotTests(APITestCase):
+    """
+    Test suite for the aggregated portfolio snapshot endpoint.
+    Verifies the document contents, that warm reads skip the database entirely
+    and that model changes produce a new document.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name="Programming")
+        self.subcategory = Subcategory.objects.create(name="Web Development", category=self.category)
+        self.technology = Technology.objects.create(name="Python", subcategory=self.subcategory)
+        self.project = Project.objects.create(
+            name="Portfolio", description="My portfolio website", category=self.category, github="https://g.com/p"
+        )
+        self.project.technology.add(self.technology)
+        self.job = Job.objects.create(company="Test Company", title="Engineer", start_date="2020-01-01")
+        self.url = reverse("snapshot")
+
+    def test_snapshot_contents(self):
+        """Test that the snapshot holds every collection rendered by the regular serializers"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(set(data), {"categories", "subcategories", "technologies", "projects", "jobs"})
+        self.assertEqual(data["projects"], [dict(ProjectSerializer(self.project).data)])
+        self.assertEqual(data["categories"][0]["subcategories"][0]["technologies"][0]["name"], "Python")
+        self.assertEqual(data["jobs"][0]["company"], "Test Company")
+
+    def test_warm_snapshot_runs_no_queries(self):
+        """Test that once built, the snapshot is served without touching the database"""
+        first = self.client.get(self.url)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+        self.assertEqual(second.content, first.content)
+
+    def test_change_rebuilds_snapshot(self):
+        """Test that a model change is reflected in the next snapshot"""
+        self.client.get(self.url)
+        self.job.title = "Senior Engineer"
+        self.job.save()
+        self.assertEqual(self.client.get(self.url).json()["jobs"][0]["title"], "Senior Engineer")
+
+    def test_commit_builds_snapshot_ahead_of_readers(self):
+        """Test that committing a change stores the new snapshot before anyone reads it"""
+        with self.captureOnCommitCallbacks(execute=True):
+            Technology.objects.create(name="Go", subcategory=self.subcategory)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.json()["technologies"]), 2)
+
+    def test_rebuild_runs_once_after_the_last_bump(self):
+        """Test that a rebuild scheduled several times in a transaction runs once, after every bump"""
+        seen = []
+
+        def rebuild():
+            seen.append(cache.get(generation_key(Technology)))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            on_commit_after_bumps(rebuild)
+            bump_generation(Technology)
+            on_commit_after_bumps(rebuild)
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                on_commit_after_bumps(rebuild)
+                raise RuntimeError
+            on_commit_after_bumps(rebuild)
+        self.assertEqual(seen, [cache.get(generation_key(Technology))])
+
+    def test_conditional_get(self):
+        """Test that a matching ETag is answered with 304"""
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_build_snapshot_is_json(self):
+        """Test that the prebuilt document is raw JSON bytes"""
+        self.assertTrue(build_snapshot().startswith(b"{"))
+
+
+class FastReadParityTests(APITestCase):
+    """
+    Test suite for the fast read path.
+    Every list and detail response built from value rows must be byte-for-byte
+    identical to the one produced by the serializers.
+    """
+
+    def setUp(self):
+        """
+        Create a portfolio covering the edge cases of the serializers:
+        empty categories, technologies without subcategory, projects without
+        category or technologies, and non-ASCII text.
+        """
+        programming = Category.objects.create(name="Programming")
+        Category.objects.create(name="Empty")
+        web = Subcategory.objects.create(name="Web Development", category=programming)
+        Subcategory.objects.create(name="Empty", category=programming)
+        python = Technology.objects.create(name="Python", subcategory=web)
+        django = Technology.objects.create(name="Django", subcategory=web)
+        loose = Technology.objects.create(name="Café ✓")
+        first = Project.objects.create(
+            name="Portfolio", description="Ünïcode text", category=programming, github="https://g.com/p"
+        )
+        first.technology.add(python, django, loose)
+        Project.objects.create(name="Bare", description="No relations", github="https://g.com/b")
+        third = Project.objects.create(
+            name="Third", description="Third", category=programming, github="https://g.com/t"
+        )
+        third.technology.add(django)
+
+    def assertParity(self, url, params=None):
+        cache.clear()
+        with self.settings(API_FAST_READS=False):
+            expected = self.client.get(url, params)
+        cache.clear()
+        with self.settings(API_FAST_READS=True):
+            actual = self.client.get(url, params)
+        self.assertEqual(actual.status_code, expected.status_code)
+        self.assertEqual(actual.content, expected.content)
+
+    def test_list_parity(self):
+        """Test every list endpoint, with and without pagination parameters"""
+        for name in ("project-list", "category-list", "subcategory-list", "technology-list"):
+            with self.subTest(name):
+                self.assertParity(reverse(name))
+                self.assertParity(reverse(name), {"page_size": 1})
+
+    def test_detail_parity(self):
+        """Test every detail endpoint for each object, plus a missing object and a malformed id"""
+        for name, model in (
+            ("project-detail", Project),
+            ("category-detail", Category),
+            ("subcategory-detail", Subcategory),
+            ("technology-detail", Technology),
+        ):
+            for pk in list(model.objects.values_list("pk", flat=True)) + [0, "abc"]:
+                with self.subTest(name, pk=pk):
+                    self.assertParity(reverse(name, kwargs={"pk": pk}))
+
+    def test_object_permissions_get_instances(self):
+        """Test that a viewset checking object permissions is retrieved with model instances"""
+
+        class InstancesOnly(BasePermission):
+            def has_object_permission(self, request, view, obj):
+                return isinstance(obj, Project)
+
+        project = Project.objects.get(name="Portfolio")
+        with mock.patch.object(ProjectViewSet, "permission_classes", [InstancesOnly]):
+            self.assertParity(reverse("project-detail", kwargs={"pk": project.pk}))
+            with self.settings(API_FAST_READS=True):
+                response = self.client.get(reverse("project-detail", kwargs={"pk": project.pk}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_filtered_parity(self):
+        """Test that project filters apply to the fast path"""
+        self.assertParity(reverse("project-list"), {"technology": "Django"})
+        self.assertParity(reverse("project-list"), {"category": "Programming", "search": "portfolio"})
+
+    def test_fast_path_queries(self):
+        """Test that the fast path keeps one query per level"""
+        with self.settings(API_FAST_READS=True):
+            for name, num in (("project-list", 2), ("category-list", 3), ("subcategory-list", 2)):
+                cache.clear()
+                with self.subTest(name), self.assertNumQueries(num):
+                    self.client.get(reverse(name))
+
+
+class FastJSONRendererTests(TestCase):
+    """
+    Test suite for the orjson-backed renderer.
+    Its output must match the default JSONRenderer.
+    """
+
+    def test_matches_json_renderer(self):
+        """Test nested data with unicode, line separators, dates and non-string keys"""
+        from datetime import date, datetime
+        from decimal import Decimal
+        from rest_framework.renderers import JSONRenderer
+        from backend.renderers import FastJSONRenderer
+
+        data = {
+            "text": "Café     ✓",
+            "nested": [{"id": 1, "ok": True, "none": None, "float": 1.5}],
+            "date": date(2020, 1, 2),
+            "datetime": datetime(2020, 1, 2, 3, 4, 5, 678901),
+            "decimal": Decimal("1.10"),
+            1: "integer key",
+        }
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(FastJSONRenderer().render(None), b"")
+
+    def test_indent_falls_back(self):
+        """Test that indented output is delegated to the standard encoder"""
+        from rest_framework.renderers import JSONRenderer
+        from backend.renderers import FastJSONRenderer
+
+        media_type = "application/json; indent=4"
+        data = {"a": [1, 2]}
+        self.assertEqual(FastJSONRenderer().render(data, media_type), JSONRenderer().render(data, media_type))
+
+
+class AsyncReadTests(APITestCase):
+    """
+    Test suite for the ASGI read path.
+    Views built with ASYNC_READS enabled must answer reads from coroutines with
+    the same bodies, cache behaviour and status codes as the sync views.
+    """
+
+    def setUp(self):
+        cache.clear()
+        programming = Category.objects.create(name="Programming")
+        web = Subcategory.objects.create(name="Web Development", category=programming)
+        python = Technology.objects.create(name="Python", subcategory=web)
+        project = Project.objects.create(
+            name="Portfolio", description="My portfolio", category=programming, github="https://g.com/p"
+        )
+        project.technology.add(python)
+        Project.objects.create(name="Bare", description="No relations", github="https://g.com/b")
+        self.factory = APIRequestFactory()
+
+    def async_view(self, viewset, actions):
+        with self.settings(ASYNC_READS=True):
+            view = viewset.as_view(actions)
+        self.assertTrue(asyncio.iscoroutinefunction(view))
+        return view
+
+    def test_sync_views_by_default(self):
+        """Test that views stay synchronous unless ASYNC_READS is enabled"""
+        self.assertFalse(asyncio.iscoroutinefunction(ProjectViewSet.as_view({"get": "list"})))
+        with self.settings(ASYNC_READS=True):
+            write_view = ProjectViewSet.as_view({"post": "create"})
+        self.assertFalse(asyncio.iscoroutinefunction(write_view))
+
+    async def test_list_parity(self):
+        """Test that async list responses match the sync ones, with and without pagination"""
+        url = reverse("project-list")
+        view = self.async_view(ProjectViewSet, {"get": "list", "post": "create"})
+        for path in (url, url + "?page_size=1"):
+            with self.subTest(path):
+                await cache.aclear()
+                expected = await sync_to_async(self.client.get)(path)
+                await cache.aclear()
+                response = await view(self.factory.get(path))
+                response.render()
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(response.content, expected.content)
+
+    async def test_retrieve(self):
+        """Test async retrieve, including the 404 for a missing object or a malformed id"""
+        view = self.async_view(CategoryViewSet, {"get": "retrieve"})
+        category = await Category.objects.aget(name="Programming")
+        url = reverse("category-detail", kwargs={"pk": category.pk})
+        expected = await sync_to_async(self.client.get)(url)
+        await cache.aclear()
+
+        response = await view(self.factory.get(url), pk=category.pk)
+        response.render()
+        self.assertEqual(response.content, expected.content)
+
+        response = await view(self.factory.get(reverse("category-detail", kwargs={"pk": 0})), pk=0)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        url = reverse("category-detail", kwargs={"pk": "abc"})
+        expected = await sync_to_async(self.client.get)(url)
+        response = await view(self.factory.get(url), pk="abc")
+        response.render()
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.content, expected.content)
+
+    async def test_cache_and_conditional_requests(self):
+        """Test that the async path shares the response cache and answers 304"""
+        view = self.async_view(TechnologyViewSet, {"get": "list"})
+        first = await view(self.factory.get("/"))
+        first.render()
+        self.assertEqual(first["X-Cache"], "MISS")
+        second = await view(self.factory.get("/"))
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(second.content, first.content)
+        revalidated = await view(self.factory.get("/", HTTP_IF_NONE_MATCH=first["ETag"]))
+        self.assertEqual(revalidated.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    async def test_fast_reads(self):
+        """Test that the async path uses the fast reader when it is enabled"""
+        view = self.async_view(ProjectViewSet, {"get": "list"})
+        expected = await sync_to_async(self.client.get)(reverse("project-list"))
+        await cache.aclear()
+        with self.settings(API_FAST_READS=True):
+            response = await view(self.factory.get(reverse("project-list")))
+            response.render()
+        self.assertEqual(response.content, expected.content)
+
+    async def test_writes_use_sync_view(self):
+        """Test that non-read methods on an async view still run the sync handlers"""
+        view = self.async_view(CategoryViewSet, {"get": "list", "post": "create"})
+        response = await view(self.factory.post("/", {"name": "Design"}, format="json"))
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(await Category.objects.filter(name="Design").aexists())
+
+    async def test_health_check(self):
+        """Test the async health check"""
+        response = await self.async_client.get(reverse("health-check"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {"status": "ok"})
+
+    async def test_page_loaded_with_async_orm(self):
+        """Test that paginated async lists load their page without the sync paginator"""
+        view = self.async_view(ProjectViewSet, {"get": "list"})
+        with mock.patch.object(KeysetPagination, "paginate_queryset", side_effect=AssertionError("sync page")):
+            response = await view(self.factory.get(reverse("project-list") + "?page_size=1"))
+            response.render()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertIsNotNone(response.data["next"])
+
+    def production_middleware(self, server_mode):
+        with mock.patch.object(base_settings, "SERVER_MODE", server_mode):
+            sys.modules.pop("backend.settings.production", None)
+            try:
+                return importlib.import_module("backend.settings.production").MIDDLEWARE
+            finally:
+                sys.modules.pop("backend.settings.production", None)
+
+    async def test_production_middleware_is_async(self):
+        """Test that the ASGI handler runs the production middleware without sync adapters"""
+        # Each client builds its middleware chain on its first request; adapters are logged with DEBUG
+        with self.settings(MIDDLEWARE=self.production_middleware("asgi"), DEBUG=True):
+            client = AsyncClient()
+            with self.assertNoLogs("django.request", "DEBUG"):
+                response = await client.get(reverse("health-check"))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            response = await client.get(reverse("technology-list"))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # The WSGI stack keeps WhiteNoise, which the ASGI handler could only run in a thread
+        with self.settings(MIDDLEWARE=self.production_middleware("wsgi"), DEBUG=True):
+            with self.assertLogs("django.request", "DEBUG") as logs:
+                await AsyncClient().get(reverse("health-check"))
+        self.assertIn("WhiteNoiseMiddleware", "\n".join(logs.output))
+
+
+class ReplicaRoutingTests(APITestCase):
+    """
+    Test suite for read-replica routing.
+    A replica is simulated by pointing the replica alias at the test database,
+    and every query of a request records whether the router chose the replica.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name="Programming")
+        self.router = ReplicaRouter()
+
+    def read_from_replica(self, method, url, data=None):
+        routed = []
+
+        def record(execute, sql, params, many, context):
+            if sql.lstrip().upper().startswith("SELECT"):
+                routed.append(self.router.db_for_read(Category) is not None)
+            return execute(sql, params, many, context)
+
+        with self.simulated_replica(), connection.execute_wrapper(record):
+            response = getattr(self.client, method)(url, data, format="json")
+        self.assertLess(response.status_code, 400)
+        return set(routed)
+
+    def simulated_replica(self):
+        return mock.patch.multiple(
+            "backend.db_routers", REPLICA_ALIAS="default", replica_configured=mock.Mock(return_value=True)
+        )
+
+    def test_router_without_replica(self):
+        """Test that the router leaves routing to Django when no replica is configured"""
+        with use_replica():
+            self.assertIsNone(self.router.db_for_read(Category))
+        self.assertIsNone(self.router.db_for_write(Category))
+        self.assertFalse(self.router.allow_migrate("replica", "projects"))
+        self.assertTrue(self.router.allow_migrate("default", "projects"))
+
+    def test_reads_use_replica(self):
+        """Test that list and detail reads go to the replica"""
+        self.assertEqual(self.read_from_replica("get", reverse("category-list")), {True})
+        detail = reverse("category-detail", kwargs={"pk": self.category.pk})
+        self.assertEqual(self.read_from_replica("get", detail), {True})
+
+    def test_writes_use_primary(self):
+        """Test that reads made while handling a write stay on the primary"""
+        detail = reverse("category-detail", kwargs={"pk": self.category.pk})
+        self.assertEqual(self.read_from_replica("patch", detail, {"name": "Code"}), {False})
+
+    def test_reads_pinned_after_write(self):
+        """Test that reads use the primary until the replica lag has passed"""
+        with self.simulated_replica():
+            Category.objects.create(name="Design")
+        self.assertEqual(self.read_from_replica("get", reverse("category-list")), {False})
+        cache.delete(PIN_PRIMARY_KEY)
+        detail = reverse("category-detail", kwargs={"pk": self.category.pk})
+        self.assertEqual(self.read_from_replica("get", detail), {True})
+
+
+class BenchmarkTests(APITestCase):
+    """
+    Test suite for the API benchmark harness.
+    Runs every router endpoint at two small scales and checks that queries per
+    request stay constant, and that an N+1 regression is reported.
+    """
+
+    def run_scales(self, *scales):
+        results = {}
+        for scale in scales:
+            cache.clear()
+            with transaction.atomic():
+                results[str(scale)] = run_benchmark(scale, requests=1)
+                transaction.set_rollback(True)
+        return results
+
+    def test_query_counts_constant(self):
+        """Test that no router endpoint issues more queries on a bigger dataset"""
+        results = self.run_scales(3, 30)
+        self.assertIn("category-projects", results["3"])
+        self.assertEqual(check_results(results), [])
+
+    def test_detects_n_plus_one(self):
+        """Test that dropping the query plans makes the checks fail"""
+        # Instrumentation is off so the over-budget warnings stay out of the test output
+        with self.settings(PERF_INSTRUMENTATION=False):
+            with mock.patch("backend.query_plan.get_query_plan", return_value=([], [])):
+                results = self.run_scales(3, 30)
+        failures = check_results(results)
+        self.assertTrue(any(failure.startswith("project-list:") for failure in failures))
+
+    def test_baseline_comparison(self):
+        """Test query and latency regressions against a baseline"""
+        metrics = {"p50": 1.0, "p95": 2.0, "p99": 3.0, "queries": 2, "bytes": 100}
+        baseline = {"10": {"project-list": metrics}}
+        self.assertEqual(check_results(baseline, baseline, latency_tolerance=0.5), [])
+        slower = {"10": {"project-list": {**metrics, "queries": 3, "p95": 4.0}}}
+        self.assertEqual(len(check_results(slower, baseline)), 1)
+        self.assertEqual(len(check_results(slower, baseline, latency_tolerance=0.5)), 2)
+
+
+class PerformanceMiddlewareTests(APITestCase):
+    """
+    Test suite for the request instrumentation middleware.
+    Verifies the Server-Timing header, the log line and the budget warnings.
+    """
+
+    def setUp(self):
+        cache.clear()
+        Technology.objects.create(name="Python")
+
+    def server_timing(self, response):
+        return dict(entry.split(";", 1) for entry in response["Server-Timing"].split(", "))
+
+    def test_server_timing(self):
+        """Test that query counts and cache results are reported per request"""
+        timing = self.server_timing(self.client.get(reverse("technology-list")))
+        self.assertEqual(set(timing), {"db", "serialize", "render", "cache", "total"})
+        self.assertIn('desc="1 queries"', timing["db"])
+        self.assertEqual(timing["cache"], 'desc="0 hits 1 misses"')
+
+        timing = self.server_timing(self.client.get(reverse("technology-list")))
+        self.assertIn('desc="0 queries"', timing["db"])
+        self.assertEqual(timing["cache"], 'desc="1 hits 0 misses"')
+
+    def test_log_line_and_budget(self):
+        """Test that each request is logged, at WARNING once it exceeds the query budget"""
+        with self.assertLogs("backend.performance", "INFO") as logs:
+            self.client.get(reverse("technology-list"))
+        self.assertIn("queries=1", logs.output[0])
+        self.assertIn("over_budget=none", logs.output[0])
+
+        cache.clear()
+        with self.settings(PERF_QUERY_BUDGET=0), self.assertLogs("backend.performance", "WARNING") as logs:
+            self.client.get(reverse("technology-list"))
+        self.assertIn("over_budget=queries", logs.output[0])
+
+    async def test_async_requests(self):
+        """Test that requests served through the ASGI handler are measured too"""
+        response = await self.async_client.get(reverse("health-check"))
+        self.assertIn('desc="0 queries"', self.server_timing(response)["db"])
+
+
+class MetricsTests(APITestCase):
+    """
+    Test suite for the Prometheus metrics endpoint.
+    Verifies per-route samples and the optional bearer token.
+    """
+
+    def setUp(self):
+        cache.clear()
+        Technology.objects.create(name="Python")
+
+    def test_route_metrics(self):
+        """Test that API requests are exported under their route name"""
+        self.client.get(reverse("technology-list"))
+        self.client.get(reverse("technology-list"))
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = response.content.decode()
+        self.assertIn('backend_request_duration_seconds_count{method="GET",route="technology-list",status="2xx"}', body)
+        self.assertIn('backend_request_serialize_seconds_bucket{le="0.005",route="technology-list"}', body)
+        self.assertIn('backend_request_queries_bucket{le="1.0",route="technology-list"}', body)
+        self.assertIn('backend_api_cache_results_total{result="hit"}', body)
+
+    def test_token(self):
+        """Test that a configured token is required"""
+        with self.settings(METRICS_TOKEN="secret"):
+            self.assertEqual(self.client.get(reverse("metrics")).status_code, status.HTTP_403_FORBIDDEN)
+            response = self.client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer secret")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class ReadinessCheckTests(APITestCase):
+    """
+    Test suite for the liveness and readiness endpoints.
+    Verifies the dependency checks, their timeouts and the result cache.
+    """
+
+    def setUp(self):
+        health.reset()
+        self.addCleanup(health.reset)
+
+    def test_liveness(self):
+        """Test that liveness does not depend on anything"""
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("health-check"))
+        self.assertEqual(response.json(), {"status": "ok"})
+
+    def test_ready(self):
+        """Test that every dependency is checked and timed"""
+        response = self.client.get(reverse("readiness-check"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.json()["checks"]), {"database", "migrations", "cache", "warmup"})
+        for check in response.json()["checks"].values():
+            self.assertTrue(check["ok"])
+            self.assertGreaterEqual(check["latency_ms"], 0)
+
+    def test_failing_and_slow_dependencies(self):
+        """Test that a failing or hung dependency makes the container unready"""
+
+        def broken():
+            raise ConnectionError("connection refused")
+
+        checks = (("database", "database", broken), ("cache", "cache", lambda: time.sleep(0.5)))
+        with mock.patch.object(health, "CHECKS", checks), self.settings(HEALTH_CHECK_TIMEOUT=0.05):
+            response = self.client.get(reverse("readiness-check"))
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response.json()["checks"]["database"]["error"], "connection refused")
+        self.assertEqual(response.json()["checks"]["cache"]["error"], "timed out after 0.05s")
+
+    def test_results_reused(self):
+        """Test that polling within the cache window does not run the checks again"""
+        check = mock.Mock()
+        with mock.patch.object(health, "CHECKS", (("database", "database", check),)):
+            self.client.get(reverse("readiness-check"))
+            self.client.get(reverse("readiness-check"))
+            self.assertEqual(check.call_count, 1)
+            with self.settings(HEALTH_CHECK_CACHE_SECONDS=0):
+                self.client.get(reverse("readiness-check"))
+            self.assertEqual(check.call_count, 2)
+
+
+@override_settings(STARTUP_WARMUP=True, WARMUP_HOSTS=["testserver"])
+class StartupWarmupTests(APITransactionTestCase):
+    """
+    Test suite for the startup warmup.
+    Verifies cache priming, the readiness gate and the time-to-first-fast-response metric.
+    Data is committed so that the readiness check thread can warm up.
+    """
+
+    def setUp(self):
+        cache.clear()
+        health.reset()
+        self.addCleanup(health.reset)
+        category = Category.objects.create(name="Programming")
+        Project.objects.create(name="Portfolio", description="d", category=category, github="https://g.com/p")
+        Job.objects.create(title="Engineer", company="Acme", start_date=date(2020, 1, 1))
+        patcher = mock.patch.object(warmup, "_warm", False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_every_encoding_is_primed(self):
+        """Test that after warming, the hot lists are cache hits in every encoding"""
+        results = warmup.warm_caches()
+        self.assertEqual({status for *_, status, _ in results}, {200})
+        self.assertEqual(len(results), 3 * (1 + len(supported_encodings())))
+        for encoding in (*supported_encodings(), "identity"):
+            for name in ("project-list", "category-list", "job-list"):
+                with self.assertNumQueries(0):
+                    response = self.client.get(reverse(name), secure=True, HTTP_ACCEPT_ENCODING=encoding)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_readiness_waits_for_warmup(self):
+        """Test that readiness fails while the warmup fails, and warms the process once it can"""
+        with mock.patch.object(warmup, "warm_caches", side_effect=ConnectionError("cache down")):
+            response = self.client.get(reverse("readiness-check"))
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response.json()["checks"]["warmup"]["error"], "cache down")
+        self.assertFalse(warmup.is_warm())
+        health.reset()
+        response = self.client.get(reverse("readiness-check"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(warmup.is_warm())
+
+    def test_failed_route_fails_the_warmup(self):
+        """Test that a warmed route answering anything but 200 leaves the process cold"""
+        with mock.patch.object(ProjectViewSet, "list", side_effect=RuntimeError("boom")):
+            with (
+                self.assertRaisesMessage(warmup.WarmupError, reverse("project-list")),
+                self.assertLogs("django.request"),
+            ):
+                warmup.ensure_warm()
+        self.assertFalse(warmup.is_warm())
+
+    @override_settings(API_THROTTLE_RATES={"read": "1/min"})
+    def test_warmup_is_not_throttled(self):
+        """Test that the warmup requests skip the rate limit"""
+        with (
+            mock.patch.object(ProjectViewSet, "throttle_classes", [RedisRateThrottle]),
+            mock.patch("backend.throttling._buckets", LocalBuckets()),
+        ):
+            results = warmup.warm_caches()
+        self.assertEqual({status for *_, status, _ in results}, {200})
+
+    def test_worker_warmup_failure_is_logged(self):
+        """Test that a failed worker warmup is logged instead of crashing the worker"""
+        with mock.patch.object(warmup, "connect_databases", side_effect=ConnectionError("refused")):
+            with self.assertLogs("backend.warmup", "ERROR"):
+                warmup.warm_worker()
+
+    def test_workers_do_not_warm_again(self):
+        """Test that workers leave the warmup to the master, and only sync workers open connections"""
+        with (
+            mock.patch.object(warmup, "warm_caches") as warm_caches,
+            mock.patch.object(warmup, "connect_databases") as connect_databases,
+        ):
+            warmup.warm_worker()
+            self.assertEqual(connect_databases.call_count, 1)
+            with self.settings(SERVER_MODE="asgi"):
+                warmup.warm_worker()
+            self.assertEqual(connect_databases.call_count, 1)
+            warmup.preload()
+        self.assertEqual(warm_caches.call_count, 1)
+        self.assertTrue(warmup.is_warm())
+
+    @override_settings(WARMUP_FAST_RESPONSE_MS=60000)
+    def test_first_fast_response_metric(self):
+        """Test that the first fast hot-route response, and not warmup requests, sets the startup metric"""
+        with (
+            mock.patch.object(metrics, "_first_fast_response", None),
+            mock.patch.dict("os.environ", {"CONTAINER_STARTED_AT": str(time.time() - 30)}),
+        ):
+            warmup.warm_caches()
+            self.assertIsNone(metrics._first_fast_response)
+            self.client.get(reverse("technology-list"))
+            self.assertIsNone(metrics._first_fast_response)
+            with self.assertLogs("backend.metrics", "INFO"):
+                self.client.get(reverse("project-list"))
+            self.assertGreaterEqual(metrics._first_fast_response, 30)
+            body = self.client.get(reverse("metrics")).content.decode()
+        self.assertIn("backend_first_fast_response_seconds", body)
+
+    def test_warm_cache_command(self):
+        """Test that the warm_cache command reports every primed response"""
+        out = io.StringIO()
+        call_command("warm_cache", stdout=out)
+        self.assertIn("testserver/api/projects/projects/ [gzip] 200", out.getvalue())
+
+
+class BulkWriteTests(APITestCase):
+    """
+    Test suite for the bulk/ endpoints.
+    Verifies batch validation, constant query counts, M2M writes and cache invalidation.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name="Programming")
+        self.subcategory = Subcategory.objects.create(name="Web Development", category=self.category)
+        self.python = Technology.objects.create(name="Python", subcategory=self.subcategory)
+        self.django = Technology.objects.create(name="Django", subcategory=self.subcategory)
+        self.url = reverse("project-bulk")
+
+    def project(self, index, **fields):
+        return {
+            "name": f"Project {index}",
+            "description": "Imported",
+            "github": f"https://g.com/{index}",
+            "category_id": self.category.pk,
+            "technology": [self.python.pk, self.django.pk],
+            **fields,
+        }
+
+    def test_bulk_create(self):
+        """Test that projects and their technologies are created and returned"""
+        response = self.client.post(self.url, [self.project(1), self.project(2, technology=[])], format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([project["name"] for project in response.data], ["Project 1", "Project 2"])
+        self.assertEqual(response.data[0]["category"], "Programming")
+        self.assertEqual([tech["name"] for tech in response.data[0]["technology"]], ["Python", "Django"])
+        self.assertEqual(Project.objects.get(name="Project 1").technology.count(), 2)
+
+    def test_bulk_create_queries_constant(self):
+        """Test that the number of queries does not depend on the number of rows"""
+        counts = []
+        for size in (2, 20):
+            rows = [self.project(f"{size}-{index}") for index in range(size)]
+            with CaptureQueriesContext(connection) as queries:
+                self.client.post(self.url, rows, format="json")
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_bulk_validation_is_atomic(self):
+        """Test that one invalid row rejects the whole batch with per-row errors"""
+        rows = [self.project(1), self.project(2, technology=[0]), self.project(3, category_id="x")]
+        response = self.client.post(self.url, rows, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        # Errors are keyed by row index (a list of rows before DRF's dict format)
+        errors = response.data if isinstance(response.data, dict) else dict(enumerate(response.data))
+        self.assertFalse(errors.get(0))
+        self.assertIn("technology", errors[1])
+        self.assertIn("category_id", errors[2])
+        self.assertFalse(Project.objects.exists())
+
+    def test_bulk_size_limit(self):
+        """Test that batches above API_MAX_BULK_SIZE are rejected"""
+        with self.settings(API_MAX_BULK_SIZE=1):
+            response = self.client.post(self.url, [self.project(1), self.project(2)], format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_update(self):
+        """Test that updates replace columns and technologies of every listed project"""
+        first, second = (Project.objects.create(name=name, description="d", github="https://g.com") for name in "ab")
+        first.technology.add(self.python)
+        rows = [{"id": first.pk, "name": "First", "technology": [self.django.pk]}, {"id": second.pk, "name": "Second"}]
+        response = self.client.patch(self.url, rows, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        first.refresh_from_db()
+        self.assertEqual(first.name, "First")
+        self.assertEqual(list(first.technology.all()), [self.django])
+        self.assertEqual(Project.objects.get(pk=second.pk).name, "Second")
+
+        response = self.client.patch(self.url, [{"id": 0, "name": "Missing"}], format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_update_string_ids(self):
+        """Test that ids given as strings find their objects and malformed ids are rejected as invalid"""
+        project = Project.objects.create(name="a", description="d", github="https://g.com")
+        response = self.client.patch(self.url, [{"id": str(project.pk), "name": "Renamed"}], format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Project.objects.get(pk=project.pk).name, "Renamed")
+
+        for pk in ("abc", None, True):
+            response = self.client.patch(self.url, [{"id": pk, "name": "Invalid"}], format="json")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(response.data[0]["id"], ["A valid id is required."])
+
+    def test_bulk_update_rejects_duplicate_ids(self):
+        """Test that a project listed twice in one bulk update is rejected instead of the last row winning"""
+        project = Project.objects.create(name="a", description="d", github="https://g.com")
+        rows = [{"id": project.pk, "name": "First"}, {"id": project.pk, "name": "Second"}]
+        response = self.client.patch(self.url, rows, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = response.data if isinstance(response.data, dict) else dict(enumerate(response.data))
+        self.assertIn("id", errors[1])
+        self.assertEqual(Project.objects.get(pk=project.pk).name, "a")
+
+    def test_bulk_update_writes_submitted_columns(self):
+        """Test that a bulk update only writes the columns given in its rows"""
+        project = Project.objects.create(name="a", description="d", github="https://g.com")
+        with CaptureQueriesContext(connection) as queries:
+            self.client.patch(self.url, [{"id": project.pk, "name": "Renamed"}], format="json")
+        update = next(query["sql"] for query in queries if query["sql"].startswith("UPDATE"))
+        self.assertIn('"name"', update)
+        self.assertNotIn('"description"', update)
+
+    def test_bulk_delete(self):
+        """Test that listed technologies are deleted in one request"""
+        response = self.client.delete(reverse("technology-bulk"), [self.python.pk, self.django.pk, 0], format="json")
+        self.assertEqual(response.data, {"deleted": 2})
+        self.assertFalse(Technology.objects.exists())
+        response = self.client.delete(reverse("technology-bulk"), {"ids": 1}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_write_invalidates_cache(self):
+        """Test that a bulk write is visible in the next cached read"""
+        self.client.get(reverse("project-list"))
+        self.client.post(self.url, [self.project(1)], format="json")
+        response = self.client.get(reverse("project-list"))
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(len(response.data["results"]), 1)
+
+    def test_single_create_accepts_technology_ids(self):
+        """Test that the regular create endpoint writes technologies by id"""
+        response = self.client.post(reverse("project-list"), self.project(1), format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data["technology"]), 2)
+
+
+class NestedWriteTests(APITestCase):
+    """
+    Test suite for writing project technologies by id or name in one request.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.python = Technology.objects.create(name="Python")
+        self.url = reverse("project-list")
+
+    def project(self, technology, **fields):
+        return {"name": "Portfolio", "description": "d", "github": "https://g.com", "technology": technology, **fields}
+
+    def test_create_with_ids_and_names(self):
+        """Test that names reuse existing technologies and create missing ones"""
+        response = self.client.post(self.url, self.project([self.python.pk, "Python", " Django "]), format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([tech["name"] for tech in response.data["technology"]], ["Python", "Django"])
+        self.assertEqual(Technology.objects.filter(name="Python").count(), 1)
+        self.assertTrue(Technology.objects.filter(name="Django").exists())
+
+    def test_single_writes_save(self):
+        """Test that single creates and updates go through save(), so post_save receivers run"""
+        saved = mock.Mock()
+        post_save.connect(saved, sender=Project)
+        self.addCleanup(post_save.disconnect, saved, sender=Project)
+        response = self.client.post(self.url, self.project(["Go"]), format="json")
+        detail = reverse("project-detail", kwargs={"pk": response.data["id"]})
+        self.client.patch(detail, {"name": "Renamed"}, format="json")
+        self.assertEqual([call.kwargs["created"] for call in saved.call_args_list], [True, False])
+
+    def test_name_created_concurrently(self):
+        """Test that a technology another request created after the name lookup is reused, not duplicated"""
+        rust = Technology.objects.create(name="Rust")
+        missing = {"load_slugs": lambda field, slugs: {slug: Technology(name=slug) for slug in slugs}}
+        with mock.patch.multiple(PreloadedPrimaryKeyRelatedField, **missing):
+            response = self.client.post(self.url, self.project(["Rust", "Go"]), format="json")
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            rows = [self.project(["Rust"], name=f"Project {index}") for index in range(2)]
+            response = self.client.post(reverse("project-bulk"), rows, format="json")
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Technology.objects.filter(name="Rust").count(), 1)
+        self.assertEqual(rust.projects.count(), 3)
+
+    def test_create_queries_constant(self):
+        """Test that the number of queries does not depend on the number of technologies"""
+        counts = []
+        for size in (2, 10):
+            names = [f"Tech {size}-{index}" for index in range(size)]
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(self.url, self.project([self.python.pk, *names]), format="json")
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_bulk_create_shares_new_technologies(self):
+        """Test that a name used by several rows creates one technology"""
+        rows = [self.project(["Rust"], name=f"Project {index}") for index in range(3)]
+        response = self.client.post(reverse("project-bulk"), rows, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        rust = Technology.objects.get(name="Rust")
+        self.assertEqual(rust.projects.count(), 3)
+
+    def test_update_replaces_technologies(self):
+        """Test that a partial update replaces the technologies it is given"""
+        project = Project.objects.create(name="Portfolio", description="d", github="https://g.com")
+        project.technology.add(self.python)
+        url = reverse("project-detail", kwargs={"pk": project.pk})
+        response = self.client.patch(url, {"technology": ["Go"]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([tech["name"] for tech in response.data["technology"]], ["Go"])
+        response = self.client.patch(url, {"name": "Renamed"}, format="json")
+        self.assertEqual([tech["name"] for tech in response.data["technology"]], ["Go"])
+
+    def test_invalid_name_creates_nothing(self):
+        """Test that an invalid name rejects the request without creating technologies"""
+        response = self.client.post(self.url, self.project(["Valid", "x" * 51]), format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("technology", response.data)
+        self.assertFalse(Technology.objects.filter(name="Valid").exists())
+        self.assertFalse(Project.objects.exists())
+
+    def test_new_technology_invalidates_cache(self):
+        """Test that technologies created by name appear in the next cached read"""
+        self.client.get(reverse("technology-list"))
+        self.client.post(self.url, self.project(["Django"]), format="json")
+        response = self.client.get(reverse("technology-list"))
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(len(response.data["results"]), 2)
+
+
+class SparseFieldsTests(APITestCase):
+    """
+    Test suite for the ?fields= and ?expand= query parameters.
+    Verifies that unrequested fields are dropped and unrequested relations are not loaded.
+    """
+
+    def setUp(self):
+        cache.clear()
+        category = Category.objects.create(name="Programming")
+        subcategory = Subcategory.objects.create(name="Web Development", category=category)
+        Technology.objects.create(name="Django", subcategory=subcategory)
+        self.url = reverse("category-list")
+
+    def get(self, params, queries):
+        with self.assertNumQueries(queries):
+            response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data["results"][0]
+
+    def test_fields(self):
+        """Test that only the listed fields are rendered and no relation is loaded"""
+        self.assertEqual(self.get({"fields": "id,name"}, 1), {"id": mock.ANY, "name": "Programming"})
+
+    def test_nested_fields(self):
+        """Test that dotted paths select fields of nested serializers"""
+        category = self.get({"fields": "name,subcategories.name"}, 2)
+        self.assertEqual(category, {"name": "Programming", "subcategories": [{"name": "Web Development"}]})
+
+    def test_expand(self):
+        """Test that only the listed relations are embedded"""
+        category = self.get({"expand": "subcategories"}, 2)
+        self.assertNotIn("technologies", category["subcategories"][0])
+        category = self.get({"expand": ""}, 1)
+        self.assertNotIn("subcategories", category)
+        category = self.get({"expand": "subcategories.technologies"}, 3)
+        self.assertEqual(category["subcategories"][0]["technologies"][0]["name"], "Django")
+
+    def test_unknown_names(self):
+        """Test that unknown fields and relations are rejected"""
+        for params in ({"fields": "id,missing"}, {"expand": "name"}, {"fields": "subcategories.missing"}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn(next(iter(params)), response.data)
+
+    def test_fast_reads_fall_back(self):
+        """Test that the fast reader is bypassed when fields are selected"""
+        with self.settings(API_FAST_READS=True):
+            category = self.get({"fields": "name"}, 1)
+        self.assertEqual(category, {"name": "Programming"})
+
+    def test_detail(self):
+        """Test that retrieve accepts the same parameters"""
+        category = Category.objects.get()
+        response = self.client.get(reverse("category-detail", kwargs={"pk": category.pk}), {"expand": ""})
+        self.assertEqual(set(response.data), {"id", "name"})
+
+
+class TechnologyUsageTests(APITransactionTestCase):
+    """
+    Test suite for the technology usage summary and its API.
+    Verifies that link changes update the summary on commit and that reads never aggregate.
+    Transactions really commit here, so the on-commit refreshes run as in production.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.subcategory = Subcategory.objects.create(name="Web", category=Category.objects.create(name="Programming"))
+        self.python = Technology.objects.create(name="Python", subcategory=self.subcategory)
+        self.django = Technology.objects.create(name="Django", subcategory=self.subcategory)
+        self.project = Project.objects.create(name="Portfolio", description="d", github="https://g.com")
+
+    def usage(self, technology):
+        return TechnologyUsage.objects.filter(technology=technology).first()
+
+    def test_links_update_counts(self):
+        """Test that adding, removing and clearing project links update the counts"""
+        self.project.technology.add(self.python, self.django)
+        self.assertEqual(self.usage(self.python).project_count, 1)
+        self.project.technology.remove(self.python)
+        self.assertEqual(self.usage(self.python).project_count, 0)
+        self.python.projects.add(self.project)
+        self.project.technology.clear()
+        self.assertEqual((self.usage(self.python).project_count, self.usage(self.django).project_count), (0, 0))
+
+    def test_job_dates(self):
+        """Test that job links and job edits update the counts and dates"""
+        old = Job.objects.create(company="A", title="Dev", start_date=date(2015, 1, 1), end_date=date(2018, 6, 30))
+        current = Job.objects.create(company="B", title="Lead", start_date=date(2019, 1, 1))
+        self.python.jobs.add(old, current)
+        usage = self.usage(self.python)
+        self.assertEqual((usage.job_count, usage.current_job_count), (2, 0))
+        # A job without an end date is still going on, which is resolved when the summary is read
+        self.assertEqual((usage.first_used, usage.last_used), (date(2015, 1, 1), None))
+        self.django.jobs.add(old)
+        self.assertEqual(self.usage(self.django).last_used, date(2018, 6, 30))
+        current.is_current = True
+        current.save()
+        self.assertEqual(self.usage(self.python).current_job_count, 1)
+        with mock.patch("django.utils.timezone.localdate", return_value=date(2030, 1, 1)):
+            python = self.client.get(reverse("technology-usage")).data["technologies"][0]
+        self.assertEqual(python["last_used"], date(2030, 1, 1))
+
+    def test_api_writes_refresh_once(self):
+        """Test that a bulk create and a bulk delete each refresh the summary in one callback"""
+        rows = [
+            {"name": f"P{index}", "description": "d", "github": "https://g.com", "technology": ["Python"]}
+            for index in range(3)
+        ]
+        # The snapshot rebuild and usage refresh run on commit, inside the request
+        with self.settings(PERF_INSTRUMENTATION=False):
+            with mock.patch("projects.usage.refresh_usage", wraps=refresh_usage) as refresh:
+                self.client.post(reverse("project-bulk"), rows, format="json")
+        self.assertEqual(refresh.call_count, 1)
+        self.assertEqual(self.usage(self.python).project_count, 3)
+
+        ids = list(Project.objects.filter(name__startswith="P").values_list("pk", flat=True))
+        with self.settings(PERF_INSTRUMENTATION=False):
+            with mock.patch("projects.usage.refresh_usage", wraps=refresh_usage) as refresh:
+                self.client.delete(reverse("project-bulk"), ids, format="json")
+        self.assertEqual(refresh.call_count, 1)
+        self.assertEqual(self.usage(self.python).project_count, 0)
+
+    def test_writes_refresh_only_affected_technologies(self):
+        """Test that writes and deletes refresh the technologies they link or unlink, and no others"""
+        rust = Technology.objects.create(name="Rust", subcategory=self.subcategory)
+        rust.projects.add(Project.objects.create(name="Other", description="d", github="https://g.com"))
+        self.project.technology.add(self.python)
+        detail = reverse("project-detail", kwargs={"pk": self.project.pk})
+        with (
+            self.settings(PERF_INSTRUMENTATION=False),
+            mock.patch("projects.usage.refresh_usage", wraps=refresh_usage) as refresh,
+        ):
+            # A rename links and unlinks nothing
+            self.client.patch(detail, {"name": "Renamed"}, format="json")
+            refresh.assert_not_called()
+            self.client.patch(
+                reverse("project-bulk"), [{"id": self.project.pk, "technology": ["Django"]}], format="json"
+            )
+            self.assertEqual(refresh.call_args.args[0], {self.python.pk, self.django.pk})
+            self.project.delete()
+            self.assertEqual(refresh.call_args.args[0], {self.django.pk})
+        self.assertEqual((self.usage(self.python).project_count, self.usage(self.django).project_count), (0, 0))
+        self.assertEqual(self.usage(rust).project_count, 1)
+
+    def test_refresh_survives_rolled_back_savepoint(self):
+        """Test that a refresh dropped with a rolled-back savepoint does not swallow later changes"""
+        with transaction.atomic():
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                self.project.technology.add(self.django)
+                raise RuntimeError
+            self.project.technology.add(self.python)
+        self.assertEqual(self.usage(self.python).project_count, 1)
+        self.assertIsNone(self.usage(self.django))
+
+    def test_usage_endpoint(self):
+        """Test the per-technology counts and the subcategory rollups"""
+        job = Job.objects.create(company="A", title="Dev", start_date=date(2020, 1, 1), is_current=True)
+        self.project.technology.add(self.python, self.django)
+        job.technologies.add(self.python)
+        # Markers and the two summary reads, no aggregation
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("technology-usage"))
+        python = response.data["technologies"][0]
+        self.assertEqual((python["name"], python["project_count"], python["job_count"]), ("Python", 1, 1))
+        self.assertTrue(python["in_current_job"])
+        self.assertEqual(python["first_used"], date(2020, 1, 1))
+        rollup = response.data["subcategories"][0]
+        self.assertEqual((rollup["technology_count"], rollup["project_uses"], rollup["job_uses"]), (2, 2, 1))
+        self.assertTrue(rollup["in_current_job"])
+
+    def test_usage_endpoint_cached(self):
+        """Test that the usage response is cached until the summary changes"""
+        self.client.get(reverse("technology-usage"))
+        self.assertEqual(self.client.get(reverse("technology-usage"))["X-Cache"], "HIT")
+        self.project.technology.add(self.python)
+        response = self.client.get(reverse("technology-usage"))
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["technologies"][0]["project_count"], 1)
+
+    def test_usage_cache_expires_at_midnight(self):
+        """Test that an ongoing job is reported as used on the day of the request, not of the cached render"""
+        self.python.jobs.add(Job.objects.create(company="B", title="Lead", start_date=date(2019, 1, 1)))
+        with mock.patch("django.utils.timezone.localdate", return_value=date(2030, 1, 1)):
+            first = self.client.get(reverse("technology-usage"))
+        with mock.patch("django.utils.timezone.localdate", return_value=date(2030, 1, 2)):
+            response = self.client.get(reverse("technology-usage"), HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["technologies"][0]["last_used"], date(2030, 1, 2))
+
+    def test_rebuild_command(self):
+        """Test that the rebuild command backfills links made without signals"""
+        Project.technology.through.objects.create(project=self.project, technology=self.python)
+        call_command("rebuild_technology_usage", stdout=io.StringIO())
+        self.assertEqual(self.usage(self.python).project_count, 1)
+        self.assertEqual(self.usage(self.django).project_count, 0)
+
+
+class SearchTests(APITestCase):
+    """
+    Test suite for /api/search/.
+    Runs on the substring fallback used without Postgres; ranking and trigram matching need Postgres.
+    """
+
+    def setUp(self):
+        cache.clear()
+        Project.objects.create(name="Portfolio", description="Built with Django", github="https://g.com")
+        Technology.objects.create(name="Django")
+        job = Job.objects.create(company="Acme", title="Django Developer", start_date=date(2020, 1, 1))
+        job.achievements.create(description="Migrated the API to Django REST framework")
+        self.url = reverse("search")
+
+    def test_search_all_types(self):
+        """Test that every searchable type contributes results"""
+        with self.assertNumQueries(4):
+            response = self.client.get(self.url, {"q": "django"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            sorted(result["type"] for result in response.data["results"]),
+            ["achievement", "job", "project", "technology"],
+        )
+        project = next(result for result in response.data["results"] if result["type"] == "project")
+        self.assertEqual(project["title"], "Portfolio")
+
+    def test_type_and_limit(self):
+        """Test that results can be restricted by type and count"""
+        response = self.client.get(self.url, {"q": "django", "type": "job,technology", "limit": 1})
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertIn(response.data["results"][0]["type"], ("job", "technology"))
+
+    def test_invalid_parameters(self):
+        """Test that a missing query, an unknown type or a bad limit is rejected"""
+        for params in ({}, {"q": " "}, {"q": "django", "type": "user"}, {"q": "django", "limit": "x"}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_results_cached_until_edit(self):
+        """Test that search responses are cached and invalidated by writes"""
+        self.client.get(self.url, {"q": "django"})
+        self.assertEqual(self.client.get(self.url, {"q": "django"})["X-Cache"], "HIT")
+        Technology.objects.create(name="Django Channels")
+        response = self.client.get(self.url, {"q": "django"})
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(len(response.data["results"]), 5)
+
+    def test_vector_update_invalidates_cached_results(self):
+        """Test that a search vector update bumps the generations of the parent and child models"""
+        job = Job.objects.get()
+        before = {model: cache.get(generation_key(model)) for model in (Job, Achievement)}
+        with mock.patch.object(search.Searchable, "update_vectors", return_value=1):
+            search.update_search_vectors("job", [job.pk], ["achievements"])
+        for model, generation in before.items():
+            self.assertNotEqual(cache.get(generation_key(model)), generation)
+
+    def test_indexes_installed_once_per_migrate(self):
+        """Test that a migrate installs the indexes of each searchable model once, not once per app"""
+        database = mock.MagicMock(vendor="postgresql")
+        with (
+            mock.patch.object(search, "connections", {"default": database}),
+            mock.patch.object(search.Searchable, "update_vectors") as update_vectors,
+        ):
+            emit_post_migrate_signal(verbosity=0, interactive=False, db="default")
+        statements = [call.args[0] for call in database.cursor().__enter__().execute.call_args_list]
+        indexes = [statement for statement in statements if "_search_idx" in statement]
+        self.assertEqual(len(indexes), len(search.SEARCH_TYPES))
+        self.assertEqual(len(set(indexes)), len(indexes))
+        self.assertEqual(update_vectors.call_count, len(search.SEARCH_TYPES))
+
+
+class ApiExportTests(APITestCase):
+    """Test suite for the static API export behind nginx."""
+
+    def setUp(self):
+        cache.clear()
+        self.root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.root)
+        self.technology = Technology.objects.create(name="Python")
+        self.project = Project.objects.create(name="Portfolio", description="Site", github="https://g.com")
+        self.project.technology.add(self.technology)
+
+    def test_exports_list_detail_and_summary_routes(self):
+        """Test that list, detail and summary routes are exported with their API responses"""
+        manifest = export_api(self.root)
+        detail = reverse("project-detail", kwargs={"pk": self.project.pk})
+        for path in (reverse("project-list"), detail, reverse("technology-usage"), reverse("job-list")):
+            self.assertIn(path, manifest["paths"])
+        self.assertNotIn(reverse("api-root"), manifest["paths"])
+
+        link = self.root / "current" / detail.lstrip("/") / "index.json"
+        self.assertTrue(link.is_symlink())
+        self.assertEqual(json.loads(link.read_bytes()), self.client.get(detail).json())
+        self.assertEqual(json.loads((self.root / "current/manifest.json").read_text())["paths"], manifest["paths"])
+
+    def test_compressed_variants(self):
+        """Test that the gzip and brotli variants decompress to the exported JSON"""
+        manifest = export_api(self.root)
+        entry = manifest["paths"][reverse("project-list")]
+        file = self.root / "current" / entry["file"]
+        content = file.read_bytes()
+        self.assertEqual(hashlib.sha256(content).hexdigest(), entry["sha256"])
+        self.assertEqual(gzip.decompress(file.with_name(file.name + ".gz").read_bytes()), content)
+        if brotli is not None:
+            self.assertEqual(brotli.decompress(file.with_name(file.name + ".br").read_bytes()), content)
+
+    def test_reexport_prunes_stale_files(self):
+        """Test that a re-export replaces changed files and drops deleted objects"""
+        first = export_api(self.root)
+        detail = reverse("project-detail", kwargs={"pk": self.project.pk})
+        self.project.delete()
+        second = export_api(self.root)
+
+        self.assertNotIn(detail, second["paths"])
+        self.assertFalse((self.root / "current" / detail.lstrip("/") / "index.json").exists())
+        list_path = reverse("project-list")
+        self.assertNotEqual(first["paths"][list_path]["file"], second["paths"][list_path]["file"])
+        self.assertTrue((self.root / "current" / second["paths"][list_path]["file"]).exists())
+        # Only the published build is kept
+        self.assertEqual(len(list((self.root / "builds").iterdir())), 1)
+
+    def test_pagination_links_are_relative(self):
+        """Test that exported pages link to the following page by path, not by the render host"""
+        Technology.objects.create(name="Rust")
+        with mock.patch.object(KeysetPagination, "page_size", 1), self.settings(ALLOWED_HOSTS=["api.example"]):
+            manifest = export_api(self.root, host="api.example")
+        path = reverse("technology-list")
+        page = json.loads((self.root / "current" / manifest["paths"][path]["file"]).read_bytes())
+        self.assertTrue(page["next"].startswith(f"{path}?cursor="), page["next"])
+        self.assertIsNone(page["previous"])
+
+    def test_failed_endpoint_fails_the_export(self):
+        """Test that an endpoint answering anything but 200 JSON fails the export and keeps the previous one"""
+        first = export_api(self.root)
+        published = (self.root / "current").resolve()
+        with mock.patch.object(ProjectViewSet, "list", side_effect=RuntimeError("boom")):
+            with self.assertRaisesMessage(ExportError, reverse("project-list")), self.assertLogs("django.request"):
+                export_api(self.root)
+        # The previous build stays published, whole
+        self.assertEqual((self.root / "current").resolve(), published)
+        self.assertEqual(list((self.root / "builds").iterdir()), [published])
+        self.assertTrue((published / first["paths"][reverse("project-list")]["file"]).exists())
+
+    def test_exports_are_serialized(self):
+        """Test that an export holds a lock on the export directory shared with other processes"""
+        with mock.patch("backend.export.fcntl.flock") as flock:
+            export_api(self.root)
+        self.assertEqual([call.args[1] for call in flock.call_args_list], [fcntl.LOCK_EX, fcntl.LOCK_UN])
+
+    @override_settings(API_THROTTLE_RATES={"read": "1/min"})
+    def test_export_is_not_throttled(self):
+        """Test that internal renders bypass the rate limits outside requests are held to"""
+        with (
+            mock.patch.object(TechnologyViewSet, "throttle_classes", [RedisRateThrottle]),
+            mock.patch("backend.throttling._buckets", LocalBuckets()),
+        ):
+            self.client.get(reverse("technology-list"))
+            self.assertEqual(self.client.get(reverse("technology-list")).status_code, 429)
+            manifest = export_api(self.root)
+        self.assertIn(reverse("technology-list"), manifest["paths"])
+
+    def test_changes_schedule_export(self):
+        """Test that committed changes re-export only when API_EXPORT_ON_CHANGE is set"""
+        for enabled, calls in ((False, 0), (True, 1)):
+            with self.settings(API_EXPORT_ON_CHANGE=enabled), mock.patch("backend.snapshot.schedule_export") as export:
+                with self.captureOnCommitCallbacks(execute=True):
+                    schedule_snapshot_build()
+            self.assertEqual(export.call_count, calls)
+
+
+class CompressionTests(APITestCase):
+    """Test suite for negotiated brotli/gzip compression and precompressed cache entries."""
+
+    def setUp(self):
+        cache.clear()
+        for index in range(20):
+            Project.objects.create(
+                name=f"Project {index}", description="A portfolio project " * 5, github="https://g.com"
+            )
+        self.url = reverse("project-list")
+
+    def test_negotiate_encoding(self):
+        """Test that Accept-Encoding quality values, wildcards and refusals are honoured"""
+        factory = APIRequestFactory()
+        cases = {
+            "": None,
+            "gzip": "gzip",
+            "gzip, deflate, br": "br" if brotli is not None else "gzip",
+            "br;q=0.5, gzip;q=0.8": "gzip",
+            "br;q=0, gzip;q=0": None,
+            "*": "br" if brotli is not None else "gzip",
+            "identity": None,
+        }
+        for header, expected in cases.items():
+            self.assertEqual(negotiate_encoding(factory.get("/", HTTP_ACCEPT_ENCODING=header)), expected, header)
+        with self.settings(API_COMPRESSION=False):
+            self.assertIsNone(negotiate_encoding(factory.get("/", HTTP_ACCEPT_ENCODING="gzip")))
+
+    def test_gzip_response_matches_identity(self):
+        """Test that a gzip response decompresses to the uncompressed body and varies on Accept-Encoding"""
+        identity = self.client.get(self.url)
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(gzip.decompress(response.content), identity.content)
+        self.assertLess(len(response.content), len(identity.content))
+        self.assertNotEqual(response["ETag"], identity["ETag"])
+
+    def test_cache_hits_are_not_recompressed(self):
+        """Test that cached bodies are stored compressed and served without compressing again"""
+        miss = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")
+        with mock.patch("backend.compression.compress") as compress:
+            hit = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")
+        compress.assert_not_called()
+        self.assertEqual(hit["X-Cache"], "HIT")
+        self.assertEqual(hit["Content-Encoding"], "gzip")
+        self.assertEqual(hit.content, miss.content)
+
+    def test_small_responses_are_not_compressed(self):
+        """Test that bodies under API_COMPRESSION_MIN_SIZE are sent uncompressed"""
+        with self.settings(API_COMPRESSION_MIN_SIZE=1_000_000):
+            response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertEqual(len(response.json()["results"]), 20)
+
+    def test_middleware_compresses_uncached_responses(self):
+        """Test that responses outside the response cache are compressed by the middleware"""
+        rows = [{"name": f"New {index}", "description": "Site", "github": "https://g.com"} for index in range(20)]
+        response = self.client.post(reverse("project-bulk"), rows, format="json", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(len(json.loads(gzip.decompress(response.content))), 20)
+
+    def test_snapshot_served_precompressed(self):
+        """Test that the snapshot is stored per encoding when built, so reads compress nothing"""
+        with self.captureOnCommitCallbacks(execute=True):
+            Project.objects.create(name="Another", description="Site", github="https://g.com")
+        with mock.patch("backend.compression.compress") as compress, self.assertNumQueries(0):
+            response = self.client.get(reverse("snapshot"), HTTP_ACCEPT_ENCODING="gzip")
+        compress.assert_not_called()
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(len(json.loads(gzip.decompress(response.content))["projects"]), 21)
+
+
+class ThrottleTests(APITestCase):
+    """Test suite for the token-bucket rate limiter shared across workers."""
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse("project-list")
+        patches = (
+            mock.patch.object(ProjectViewSet, "throttle_classes", [RedisRateThrottle]),
+            mock.patch("backend.throttling._buckets", LocalBuckets()),
+        )
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_parse_rate(self):
+        """Test that DRF-style rates are parsed into requests and seconds"""
+        self.assertEqual(parse_rate("100/day"), (100, 86400))
+        self.assertEqual(parse_rate("30/min"), (30, 60))
+        self.assertEqual(parse_rate("5/s"), (5, 1))
+
+    def test_local_bucket_allows_burst_then_refuses(self):
+        """Test that a bucket passes a full burst, then refuses with the time until a token is back"""
+        buckets = LocalBuckets()
+        self.assertTrue(all(buckets.take("key", 3, 1.0)[0] for _ in range(3)))
+        allowed, wait = buckets.take("key", 3, 1.0)
+        self.assertFalse(allowed)
+        self.assertGreater(wait, 0)
+        self.assertLessEqual(wait, 1.0)
+
+    def test_reads_and_writes_use_separate_limits(self):
+        """Test that reads and writes are limited by their own rates"""
+        with self.settings(API_THROTTLE_RATES={"read": "3/min", "write": "1/min"}):
+            statuses = [self.client.get(self.url).status_code for _ in range(4)]
+            self.assertEqual(statuses, [200, 200, 200, 429])
+            self.assertIn("Retry-After", self.client.get(self.url))
+
+            data = {"name": "New", "description": "Site", "github": "https://g.com"}
+            self.assertEqual(self.client.post(self.url, data).status_code, status.HTTP_201_CREATED)
+            self.assertEqual(self.client.post(self.url, data).status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_action_and_view_rates_take_precedence(self):
+        """Test that a view's per-action rate overrides the read/write defaults"""
+        with (
+            self.settings(API_THROTTLE_RATES={"read": "100/min"}),
+            mock.patch.object(ProjectViewSet, "throttle_rates", {"retrieve": "1/min"}),
+        ):
+            project = Project.objects.create(name="Portfolio", description="Site", github="https://g.com")
+            detail = reverse("project-detail", kwargs={"pk": project.pk})
+            self.assertEqual(self.client.get(detail).status_code, status.HTTP_200_OK)
+            self.assertEqual(self.client.get(detail).status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+            self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+
+    def test_users_have_their_own_buckets(self):
+        """Test that an authenticated user is not limited by the anonymous bucket of their address"""
+        with self.settings(API_THROTTLE_RATES={"read": "1/min"}):
+            self.client.get(self.url)
+            self.assertEqual(self.client.get(self.url).status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+            token = Token.objects.create(user=User.objects.create_user("reader"))
+            self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+            self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+
+    def test_redis_bucket_runs_one_script_call(self):
+        """Test that a Redis bucket is taken with a single script call"""
+        with mock.patch("redis.Redis.from_url") as from_url:
+            script = from_url.return_value.register_script.return_value
+            script.return_value = [0, "2.5"]
+            buckets = RedisBuckets("redis://cache:6379/0")
+            self.assertEqual(buckets.take("throttle:key", 10, 0.5), (False, 2.5))
+        script.assert_called_once_with(keys=["throttle:key"], args=[10, 0.5, 1])
+
+    def test_unreachable_redis_allows_requests(self):
+        """Test that requests are let through when the throttle backend is down"""
+        with (
+            self.settings(API_THROTTLE_RATES={"read": "1/min"}),
+            mock.patch("backend.throttling.get_buckets") as get_buckets,
+            self.assertLogs("backend.throttling", "WARNING"),
+        ):
+            get_buckets.return_value.take.side_effect = RedisConnectionError("down")
+            self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+
+
+class AuthenticationTests(APITestCase):
+    """Test suite for public reads and cached token authentication."""
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse("project-list")
+        patch = mock.patch.object(ProjectViewSet, "permission_classes", [IsAuthenticatedOrReadOnly])
+        patch.start()
+        self.addCleanup(patch.stop)
+        self.user = User.objects.create_user("editor", password="password")
+        self.token = Token.objects.create(user=self.user)
+        self.data = {"name": "New", "description": "Site", "github": "https://g.com"}
+
+    def test_anonymous_reads_skip_authentication(self):
+        """Test that anonymous reads run no authenticator while anonymous writes are refused"""
+        with mock.patch.object(CachedTokenAuthentication, "authenticate") as authenticate:
+            self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+        authenticate.assert_not_called()
+        self.assertEqual(self.client.post(self.url, self.data).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_token_lookup_is_cached(self):
+        """Test that a token is looked up once and then served from the cache"""
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+        self.assertEqual(self.client.post(self.url, self.data).status_code, status.HTTP_201_CREATED)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.post(self.url, self.data).status_code, status.HTTP_201_CREATED)
+        self.assertFalse([query for query in queries if "authtoken_token" in query["sql"]])
+
+    def test_invalid_token_is_rejected(self):
+        """Test that an unknown token fails even for reads"""
+        self.client.credentials(HTTP_AUTHORIZATION="Token nope")
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_cached_token_evicted(self):
+        """Test that deleting a token or deactivating its user takes effect on the next request"""
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+        self.client.post(self.url, self.data)
+        self.assertIsNotNone(cache.get(token_cache_key(self.token.key)))
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.post(self.url, self.data).status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.user.is_active = True
+        self.user.save()
+        self.client.post(self.url, self.data)
+        self.token.delete()
+        self.assertEqual(self.client.post(self.url, self.data).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_obtain_token(self):
+        """Test that a username and password are exchanged for the user's token"""
+        response = self.client.post(reverse("auth-token"), {"username": "editor", "password": "password"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["token"], self.token.key)
+
+    def test_benchmark_reports_cpu_per_scheme(self):
+        """Test that the auth benchmark measures each scheme and basic authentication costs the most"""
+        with self.settings(PERF_INSTRUMENTATION=False):
+            results = measure_auth(requests=1)
+        self.assertEqual(set(results), {"anonymous", "token", "basic"})
+        self.assertGreater(results["basic"]["cpu_ms"], results["token"]["cpu_ms"])
+
+
+@override_settings(API_PROJECT_READ_MODEL=True)
+class ProjectReadModelTests(APITransactionTestCase):
+    """
+    Test suite for the denormalized project read model.
+    Transactions really commit here, so the on-commit refreshes run as in production.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name="Programming")
+        self.web = Subcategory.objects.create(name="Web", category=self.category)
+        self.python = Technology.objects.create(name="Python", subcategory=self.web)
+        self.loose = Technology.objects.create(name="Café ✓")
+        self.project = Project.objects.create(
+            name="Portfolio", description="Ünïcode", category=self.category, github="https://g.com/p"
+        )
+        self.project.technology.add(self.python, self.loose)
+        Project.objects.create(name="Bare", description="None", github="https://g.com/b")
+
+    def row(self, project=None):
+        return ProjectReadModel.objects.filter(pk=(project or self.project).pk).first()
+
+    def assertParity(self, url, params=None):
+        cache.clear()
+        with self.settings(API_PROJECT_READ_MODEL=False):
+            expected = self.client.get(url, params)
+        cache.clear()
+        actual = self.client.get(url, params)
+        self.assertEqual(actual.status_code, expected.status_code)
+        self.assertEqual(actual.content, expected.content)
+
+    def test_rows_hold_resolved_relations(self):
+        """Test that a row carries the category name, technologies and subcategory tags"""
+        row = self.row()
+        self.assertEqual(row.category, "Programming")
+        self.assertEqual(sorted(row.technology_names), ["Café ✓", "Python"])
+        self.assertEqual(sorted(row.technology_ids), sorted([self.python.pk, self.loose.pk]))
+        self.assertEqual(row.subcategory_tags, ["Web"])
+
+    def test_reads_match_serializers(self):
+        """Test that list, filtered list and detail responses are identical to the serializer path"""
+        self.assertParity(reverse("project-list"))
+        self.assertParity(reverse("project-list"), {"technology": "Python"})
+        self.assertParity(reverse("project-detail", kwargs={"pk": self.project.pk}))
+        self.assertParity(reverse("project-detail", kwargs={"pk": 0}))
+
+    def test_malformed_id_is_not_found(self):
+        """Test that a non-numeric id read from the read model answers 404 like the serializer path"""
+        url = reverse("project-detail", kwargs={"pk": "abc"})
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertParity(url)
+
+    def test_list_is_one_query(self):
+        """Test that a project page is read with a single query"""
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("project-list"))
+        self.assertEqual(len(response.data["results"]), 2)
+
+    def test_related_changes_refresh_rows(self):
+        """Test that renames, unlinks and deletes of related objects reach the rows"""
+        self.python.name = "Python 3"
+        self.python.save()
+        self.assertIn("Python 3", self.row().technology_names)
+        self.category.name = "Code"
+        self.category.save()
+        self.assertEqual(self.row().category, "Code")
+        self.project.technology.remove(self.loose)
+        self.assertEqual(self.row().technology_names, ["Python 3"])
+        self.web.delete()
+        self.assertEqual((self.row().technology, self.row().subcategory_tags), ([], []))
+
+    def test_project_writes_refresh_rows(self):
+        """Test that API writes, bulk writes and deletes keep the rows in step with the projects"""
+        rows = [
+            {"name": f"New {i}", "description": "d", "github": "https://g.com", "technology": ["Go"]} for i in range(3)
+        ]
+        # The usage, search and read model refreshes run on commit, inside the request
+        with self.settings(PERF_INSTRUMENTATION=False):
+            response = self.client.post(reverse("project-bulk"), rows, format="json")
+        for project in response.data:
+            self.assertEqual(self.row(Project(pk=project["id"])).technology_names, ["Go"])
+        self.project.delete()
+        self.assertIsNone(self.row())
+        self.assertEqual(ProjectReadModel.objects.count(), Project.objects.count())
+
+    def test_writes_in_one_transaction_refresh_once(self):
+        """Test that every project written in a transaction is refreshed by one callback on commit"""
+        with mock.patch("projects.read_model.refresh_read_models", wraps=refresh_read_models) as refresh:
+            with transaction.atomic():
+                self.project.name = "Renamed"
+                self.project.save()
+                with transaction.atomic():
+                    added = Project.objects.create(name="Added", description="d", github="https://g.com/a")
+                self.assertIsNone(self.row(added))
+        refresh.assert_called_once()
+        self.assertEqual((self.row().name, self.row(added).name), ("Renamed", "Added"))
+
+    @override_settings(TASKS_ENABLED=True, PERF_INSTRUMENTATION=False)
+    def test_writes_are_read_back_with_tasks(self):
+        """Test that with the task queue on, a created project is in its detail and list responses right away"""
+        data = {"name": "Queued", "description": "d", "github": "https://g.com", "technology": ["Python"]}
+        created = self.client.post(reverse("project-list"), data, format="json").data
+        response = self.client.get(reverse("project-detail", kwargs={"pk": created["id"]}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["name"], "Queued")
+        names = [project["name"] for project in self.client.get(reverse("project-list")).data["results"]]
+        self.assertIn("Queued", names)
+        self.assertFalse(Task.objects.filter(name="read_model.refresh").exists())
+
+    def test_rebuild_command(self):
+        """Test that the rebuild command backfills missing rows and drops stale ones"""
+        ProjectReadModel.objects.filter(pk=self.project.pk).delete()
+        ProjectReadModel.objects.create(id=999, name="Gone", description="", github="https://g.com")
+        call_command("rebuild_project_read_model", stdout=io.StringIO())
+        self.assertEqual(
+            set(ProjectReadModel.objects.values_list("pk", flat=True)),
+            set(Project.objects.values_list("pk", flat=True)),
+        )
@@ -9,5 +9,8 @@ router.register(r"subcategories", views.SubcategoryViewSet)
 router.register(r"technologies", views.TechnologyViewSet)
 
 urlpatterns = [
+    path("technologies/usage/", views.TechnologyUsageView.as_view(), name="technology-usage"),
     path("health/", views.HealthCheckView.as_view(), name="health-check"),
+    path("health/ready/", views.ReadinessCheckView.as_view(), name="readiness-check"),
+    path("cache-stats/", views.CacheStatsView.as_view(), name="cache-stats"),
 ] + router.urls
@@ -0,0 +1,168 @@
+from django.conf import settings
+from django.db.models import Count, F, Max, Min, Q
+from django.db.models.functions import Coalesce
+from django.db.models.signals import m2m_changed, post_save, pre_delete
+from django.utils import timezone
+from backend.bulk import links_replaced, rows_written
+from backend.cache import bump_generation, on_commit_with_ids
+from about.models import Job
+from tasks.queue import enqueue, register_task
+from .models import Project, Subcategory, Technology, TechnologyUsage
+
+ProjectTechnology = Project.technology.through
+JobTechnology = Job.technologies.through
+OWNER_FIELDS = {ProjectTechnology: "project", JobTechnology: "job"}
+
+
+def refresh_usage(technology_ids):
+    """
+    Recompute the TechnologyUsage rows of `technology_ids` from their links, with
+    one query per source and one upsert, however many technologies changed.
+    Jobs without an end date are still going on, so `last_used` is stored as NULL
+    for their technologies and resolved to today when the summary is read.
+    """
+    ids = set(Technology.objects.filter(pk__in=technology_ids).values_list("pk", flat=True))
+    if not ids:
+        return
+    projects = dict(
+        ProjectTechnology.objects.filter(technology__in=ids)
+        .values("technology")
+        .annotate(count=Count("project"))
+        .values_list("technology", "count")
+    )
+    jobs = {
+        row.pop("technology"): row
+        for row in JobTechnology.objects.filter(technology__in=ids)
+        .values("technology")
+        .annotate(
+            job_count=Count("job"),
+            current_job_count=Count("job", filter=Q(job__is_current=True)),
+            first_used=Min("job__start_date"),
+            last_used=Max("job__end_date"),
+            open_job_count=Count("job", filter=Q(job__end_date=None)),
+        )
+    }
+    for row in jobs.values():
+        if row.pop("open_job_count"):
+            row["last_used"] = None
+    TechnologyUsage.objects.bulk_create(
+        [TechnologyUsage(technology_id=pk, project_count=projects.get(pk, 0), **jobs.get(pk, {})) for pk in ids],
+        update_conflicts=True,
+        unique_fields=["technology"],
+        update_fields=["project_count", "job_count", "current_job_count", "first_used", "last_used"],
+    )
+    bump_generation(TechnologyUsage)
+
+
+def schedule_refresh(technology_ids):
+    """
+    Refresh the usage of `technology_ids` when the current transaction commits.
+    Changes made in the same transaction share one refresh, so a bulk write or a
+    cascading delete refreshes each technology once. With `TASKS_ENABLED`
+    the refresh is queued for the worker instead.
+    """
+    if not technology_ids:
+        return
+    if settings.TASKS_ENABLED:
+        enqueue("usage.refresh", ids=sorted(technology_ids))
+        return
+    on_commit_with_ids(refresh_usage, technology_ids)
+
+
+@register_task("usage.refresh")
+def run_refresh(ids):
+    refresh_usage(ids)
+
+
+def links_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action in ("post_add", "post_remove"):
+        schedule_refresh([instance.pk] if reverse else pk_set)
+    elif action == "pre_clear":
+        if reverse:
+            schedule_refresh([instance.pk])
+        else:
+            owner = OWNER_FIELDS[sender]
+            schedule_refresh(set(sender.objects.filter(**{owner: instance}).values_list("technology_id", flat=True)))
+
+
+def owners_written(sender, objects, created, **kwargs):
+    # Bulk writes insert links without m2m_changed; the links they replaced are reported to links_replaced
+    through = ProjectTechnology if sender is Project else JobTechnology
+    links = through.objects.filter(**{f"{OWNER_FIELDS[through]}__in": objects})
+    schedule_refresh(set(links.values_list("technology_id", flat=True)))
+
+
+def old_links_replaced(sender, links, **kwargs):
+    schedule_refresh(set(links.values_list("technology_id", flat=True)))
+
+
+def owner_deleted(sender, instance, **kwargs):
+    # Deletes drop the links of `instance` without m2m_changed, so they are read while they exist
+    through = ProjectTechnology if sender is Project else JobTechnology
+    schedule_refresh(
+        set(through.objects.filter(**{OWNER_FIELDS[through]: instance}).values_list("technology_id", flat=True))
+    )
+
+
+def job_saved(sender, instance, created, **kwargs):
+    # Dates and the current flag feed first_used, last_used and current_job_count
+    if not created:
+        schedule_refresh(set(instance.technologies.values_list("pk", flat=True)))
+
+
+def usage_summary():
+    """
+    Per-technology usage and per-subcategory rollups, read from the summary
+    table with one query each. Subcategory rollups add up their technologies'
+    usages, so a project using two of its technologies counts twice.
+    """
+    technologies = list(
+        Technology.objects.order_by("id").values(
+            "id",
+            "name",
+            "subcategory",
+            project_count=Coalesce("usage__project_count", 0),
+            job_count=Coalesce("usage__job_count", 0),
+            current_job_count=Coalesce("usage__current_job_count", 0),
+            first_used=F("usage__first_used"),
+            last_used=F("usage__last_used"),
+        )
+    )
+    subcategories = {
+        row["id"]: {
+            **row,
+            "technology_count": 0,
+            "project_uses": 0,
+            "job_uses": 0,
+            "in_current_job": False,
+            "first_used": None,
+            "last_used": None,
+        }
+        for row in Subcategory.objects.order_by("id").values("id", "name", "category")
+    }
+    today = timezone.localdate()
+    for row in technologies:
+        row["in_current_job"] = row.pop("current_job_count") > 0
+        if row["job_count"] and row["last_used"] is None:
+            # Stored as NULL while a job without an end date is still going on
+            row["last_used"] = today
+        rollup = subcategories.get(row["subcategory"])
+        if rollup is None:
+            continue
+        rollup["technology_count"] += 1
+        rollup["project_uses"] += row["project_count"]
+        rollup["job_uses"] += row["job_count"]
+        rollup["in_current_job"] = rollup["in_current_job"] or row["in_current_job"]
+        for key, pick in (("first_used", min), ("last_used", max)):
+            dates = [date for date in (rollup[key], row[key]) if date is not None]
+            rollup[key] = pick(dates) if dates else None
+    return {"technologies": technologies, "subcategories": list(subcategories.values())}
+
+
+for through in (ProjectTechnology, JobTechnology):
+    m2m_changed.connect(links_changed, sender=through)
+    links_replaced.connect(old_links_replaced, sender=through)
+for model in (Project, Job):
+    rows_written.connect(owners_written, sender=model)
+    pre_delete.connect(owner_deleted, sender=model)
+post_save.connect(job_saved, sender=Job)
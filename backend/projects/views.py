@@ -1,44 +1,117 @@
+from datetime import datetime, time
+from django.conf import settings
+from django.http import JsonResponse
+from django.utils import timezone
+from django.views import View
 from rest_framework.views import APIView
-from rest_framework import viewsets, status
+from rest_framework import filters, status
 from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
-from .models import Category, Subcategory, Project, Technology
+from backend.authentication import PublicReadMixin
+from backend.cache import CachedResponseMixin, get_cache_stats
+from backend.health import run_checks
+from backend.query_plan import apply_query_plan
+from backend.viewsets import PortfolioViewSet
+from .filters import ProjectFilterBackend
+from .models import Category, Subcategory, Project, ProjectReadModel, Technology, TechnologyUsage
+from .read_model import ProjectReadModelReader
+from .readers import CategoryReader, SubcategoryReader, ProjectReader, TechnologyReader
 from .serializers import (
     CategorySerializer,
     SubcategorySerializer,
     ProjectSerializer,
     TechnologySerializer,
 )
+from .usage import usage_summary
 
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(PortfolioViewSet):
     queryset = Project.objects.all()
     serializer_class = ProjectSerializer
+    reader = ProjectReader()
+    cache_models = (Project, Category, Technology, ProjectReadModel)
+    filter_backends = [ProjectFilterBackend, filters.SearchFilter]
+    search_fields = ["name", "description"]
+
+    def get_reader(self):
+        # The read model serves list and retrieve whether or not the other fast readers are enabled
+        if settings.API_PROJECT_READ_MODEL:
+            return ProjectReadModelReader()
+        return super().get_reader()
 
 
 # CategoryViewSet - add projects relationship
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(PortfolioViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    reader = CategoryReader()
+    cache_models = (Category, Subcategory, Technology)
 
     @action(detail=True, methods=["get"])
     def projects(self, request, pk=None):
-        category = self.get_object()
-        projects = Project.objects.filter(category=category)
-        serializer = ProjectSerializer(projects, many=True)
-        return Response(serializer.data)
+        # Only the projects are rendered, so look the category up without the query plan of get_object
+        category = get_object_or_404(Category.objects.all(), pk=pk)
+        self.check_object_permissions(request, category)
+        projects = apply_query_plan(Project.objects.filter(category=category), ProjectSerializer())
+        page = self.paginate_queryset(projects)
+        serializer = ProjectSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
 
-class SubcategoryViewSet(viewsets.ModelViewSet):
+class SubcategoryViewSet(PortfolioViewSet):
     queryset = Subcategory.objects.all()
     serializer_class = SubcategorySerializer
+    reader = SubcategoryReader()
+    cache_models = (Subcategory, Technology)
 
 
-class TechnologyViewSet(viewsets.ModelViewSet):
+class TechnologyViewSet(PortfolioViewSet):
     queryset = Technology.objects.all()
     serializer_class = TechnologySerializer
+    reader = TechnologyReader()
+    cache_models = (Technology,)
+
+
+class TechnologyUsageView(PublicReadMixin, CachedResponseMixin, APIView):
+    """Project and job counts and dates per technology, with subcategory rollups, from the usage table."""
+
+    basename = "technology-usage"
+    action = "list"
+    cache_models = (TechnologyUsage, Technology, Subcategory)
+
+    def get_validators(self, request, encoding, generations, last_modified):
+        # Ongoing jobs are rendered as used today, so the body also changes at midnight
+        today = timezone.localdate()
+        midnight = timezone.make_aware(datetime.combine(today, time.min)).timestamp()
+        return super().get_validators(
+            request, encoding, [*generations, today.isoformat()], max(last_modified or 0, midnight)
+        )
+
+    def get(self, request):
+        return self.cached_response(lambda request: Response(usage_summary()), request)
+
+
+class HealthCheckView(View):
+    # Liveness: a plain async view with no authentication, throttling or
+    # database access, and no thread hop when served by an ASGI worker
+    async def get(self, request):
+        return JsonResponse({"status": "ok"})
+
+
+class ReadinessCheckView(View):
+    # Readiness: 503 while the database, the cache or migrations are not usable
+    def get(self, request):
+        checks = run_checks()
+        ready = all(check["ok"] for check in checks.values())
+        return JsonResponse(
+            {"status": "ok" if ready else "unavailable", "checks": checks}, status=200 if ready else 503
+        )
+
 
+class CacheStatsView(APIView):
+    permission_classes = [IsAdminUser]
 
-class HealthCheckView(APIView):
     def get(self, request):
-        return Response({"status": "ok"}, status=status.HTTP_200_OK)
+        return Response(get_cache_stats(), status=status.HTTP_200_OK)
@@ -0,0 +1,11 @@
+from django.contrib import admin
+from .models import Task
+
+
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ("name", "key", "status", "attempts", "run_after", "locked_by")
+    list_filter = ["status", "name"]
+    readonly_fields = ["enqueued_at", "locked_at", "locked_by", "attempts", "last_error"]
+
+
+admin.site.register(Task, TaskAdmin)
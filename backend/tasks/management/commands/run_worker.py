@@ -0,0 +1,25 @@
+import signal
+from django.core.management.base import BaseCommand
+from tasks.queue import TASKS, run_worker
+
+
+class Command(BaseCommand):
+    help = (
+        "Run queued background tasks (snapshot and export rebuilds, usage, read model and search refreshes) "
+        "until stopped. SIGTERM and SIGINT stop the worker once the current task is done."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Exit once no task is due, e.g. from cron")
+
+    def handle(self, *args, **options):
+        stopping = []
+
+        def stop(signum, frame):
+            stopping.append(signum)
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+        self.stdout.write(f"Worker running tasks: {', '.join(sorted(TASKS))}")
+        count = run_worker(once=options["once"], should_stop=lambda: bool(stopping))
+        self.stdout.write(self.style.SUCCESS(f"Worker stopped after {count} tasks"))
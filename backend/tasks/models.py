@@ -0,0 +1,39 @@
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+
+class Task(models.Model):
+    """
+    A queued background job, written in the transaction that triggered it and
+    run by `manage.py run_worker` once that transaction commits. At most one
+    pending row exists per (name, key): later triggers merge their payload into
+    it, so a burst of edits runs the job once. Rows are deleted once they succeed.
+    """
+
+    PENDING = "pending"
+    RUNNING = "running"
+    FAILED = "failed"
+    STATUS_CHOICES = [(PENDING, "Pending"), (RUNNING, "Running"), (FAILED, "Failed")]
+
+    name = models.CharField(max_length=100)
+    key = models.CharField(max_length=200, blank=True, default="")
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    enqueued_at = models.DateTimeField(default=timezone.now)
+    run_after = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveIntegerField(default=0)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    locked_by = models.CharField(max_length=100, blank=True, default="")
+    last_error = models.TextField(blank=True, default="")
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "run_after"], name="tasks_task_due_idx")]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["name", "key"], condition=Q(status="pending"), name="tasks_task_one_pending"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.name}:{self.key}" if self.key else self.name
@@ -0,0 +1,191 @@
+import logging
+import os
+import socket
+import time
+import traceback
+from datetime import timedelta
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+from .models import Task
+
+logger = logging.getLogger("tasks")
+
+# Registered jobs by name, filled by `register_task` as the modules defining them are imported
+TASKS = {}
+
+
+class TaskSpec:
+    """A registered job: its function and how its triggers are debounced and retried."""
+
+    def __init__(self, name, func, debounce=None, max_wait=None, max_attempts=None):
+        self.name = name
+        self.func = func
+        self._debounce = debounce
+        self._max_wait = max_wait
+        self._max_attempts = max_attempts
+
+    @property
+    def debounce(self):
+        return self._debounce if self._debounce is not None else settings.TASKS_DEBOUNCE
+
+    @property
+    def max_wait(self):
+        return self._max_wait if self._max_wait is not None else settings.TASKS_MAX_WAIT
+
+    @property
+    def max_attempts(self):
+        return self._max_attempts if self._max_attempts is not None else settings.TASKS_MAX_ATTEMPTS
+
+
+def register_task(name, debounce=None, max_wait=None, max_attempts=None):
+    """
+    Decorator registering a function as the job `name`; it is called with the
+    task payload as keyword arguments. `debounce`, `max_wait` (seconds) and
+    `max_attempts` default to the TASKS_* settings.
+    """
+
+    def decorator(func):
+        TASKS[name] = TaskSpec(name, func, debounce, max_wait, max_attempts)
+        return func
+
+    return decorator
+
+
+def merge_payload(old, new):
+    """
+    Merge the payload of a new trigger into a pending one: lists are unioned in
+    order, booleans are OR-ed and other values are replaced.
+    """
+    merged = dict(old)
+    for name, value in new.items():
+        previous = merged.get(name)
+        if isinstance(value, list) and isinstance(previous, list):
+            merged[name] = list(dict.fromkeys(previous + value))
+        elif isinstance(value, bool) and isinstance(previous, bool):
+            merged[name] = previous or value
+        else:
+            merged[name] = value
+    return merged
+
+
+def _pending(name, key):
+    return Task.objects.select_for_update().filter(name=name, key=key, status=Task.PENDING).first()
+
+
+def enqueue(name, key="", **payload):
+    """
+    Queue the job `name` in the current transaction, so it becomes visible to
+    workers only if that transaction commits. A trigger for a (name, key) that
+    is already pending merges into it and pushes its start back by the job's
+    debounce, but never later than `max_wait` after the first trigger.
+    """
+    spec = TASKS[name]
+    now = timezone.now()
+    with transaction.atomic():
+        task = _pending(name, key)
+        if task is None:
+            try:
+                with transaction.atomic():
+                    return Task.objects.create(
+                        name=name,
+                        key=key,
+                        payload=payload,
+                        enqueued_at=now,
+                        run_after=now + timedelta(seconds=spec.debounce),
+                    )
+            except IntegrityError:
+                # Another transaction queued it first
+                task = _pending(name, key)
+        task.payload = merge_payload(task.payload, payload)
+        task.run_after = min(
+            now + timedelta(seconds=spec.debounce), task.enqueued_at + timedelta(seconds=spec.max_wait)
+        )
+        task.save(update_fields=["payload", "run_after"])
+        return task
+
+
+def claim(worker):
+    """
+    Lock the next due task for `worker` and mark it running, or return None.
+    Rows locked by other workers are skipped, and tasks left running by a worker
+    that died are taken over after TASKS_LOCK_TIMEOUT seconds.
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.TASKS_LOCK_TIMEOUT)
+    with transaction.atomic():
+        task = (
+            Task.objects.select_for_update(skip_locked=True)
+            .filter(Q(status=Task.PENDING, run_after__lte=now) | Q(status=Task.RUNNING, locked_at__lt=stale))
+            .order_by("run_after", "pk")
+            .first()
+        )
+        if task is None:
+            return None
+        task.status = Task.RUNNING
+        task.locked_at = now
+        task.locked_by = worker
+        task.attempts += 1
+        task.save(update_fields=["status", "locked_at", "locked_by", "attempts"])
+    return task
+
+
+def _retry(task, error):
+    """Queue `task` again after an exponential backoff, or merge it into a newer pending trigger."""
+    with transaction.atomic():
+        pending = _pending(task.name, task.key)
+        if pending is not None:
+            pending.payload = merge_payload(task.payload, pending.payload)
+            pending.save(update_fields=["payload"])
+            task.delete()
+            return
+        delay = settings.TASKS_RETRY_DELAY * 2 ** (task.attempts - 1)
+        task.status = Task.PENDING
+        task.run_after = timezone.now() + timedelta(seconds=delay)
+        task.locked_at = None
+        task.locked_by = ""
+        task.last_error = error
+        task.save(update_fields=["status", "run_after", "locked_at", "locked_by", "last_error"])
+
+
+def run_task(task):
+    """Run a claimed task: delete it on success, retry it or mark it failed on error. Returns success."""
+    spec = TASKS.get(task.name)
+    try:
+        if spec is None:
+            raise LookupError(f"Unknown task {task.name!r}")
+        spec.func(**task.payload)
+    except Exception:
+        error = traceback.format_exc()
+        logger.exception("Task %s failed (attempt %s)", task, task.attempts)
+        if spec is not None and task.attempts < spec.max_attempts:
+            _retry(task, error)
+        else:
+            task.status = Task.FAILED
+            task.last_error = error
+            task.save(update_fields=["status", "last_error"])
+        return False
+    task.delete()
+    return True
+
+
+def run_worker(once=False, should_stop=lambda: False):
+    """
+    Run due tasks until `should_stop()` is true, polling every TASKS_POLL_INTERVAL
+    seconds when the queue is empty; with `once`, return when nothing is due.
+    Returns the number of tasks run.
+    """
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+    count = 0
+    while not should_stop():
+        close_old_connections()
+        task = claim(worker)
+        if task is None:
+            if once:
+                break
+            time.sleep(settings.TASKS_POLL_INTERVAL)
+            continue
+        run_task(task)
+        count += 1
+    return count
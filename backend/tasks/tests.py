@@ -0,0 +1,150 @@
+import io
+from datetime import timedelta
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from projects.models import Project, ProjectReadModel, Technology, TechnologyUsage
+from .models import Task
+from .queue import TASKS, claim, enqueue, register_task, run_task, run_worker
+
+CALLS = []
+
+
+@register_task("tests.record", debounce=2.0, max_wait=5.0, max_attempts=2)
+def record(**payload):
+    CALLS.append(payload)
+    if payload.get("fail"):
+        raise ValueError("boom")
+
+
+@override_settings(TASKS_ENABLED=True, TASKS_DEBOUNCE=0, TASKS_RETRY_DELAY=5.0)
+class TaskQueueTests(TestCase):
+    """
+    Test suite for the background task queue.
+    """
+
+    def setUp(self):
+        CALLS.clear()
+
+    def make_due(self):
+        Task.objects.update(run_after=timezone.now() - timedelta(seconds=1))
+
+    def test_triggers_coalesce(self):
+        """Test that repeated triggers for a name and key merge into one pending task"""
+        enqueue("tests.record", ids=[1, 2], full=False)
+        enqueue("tests.record", ids=[2, 3], full=True)
+        enqueue("tests.record", key="other", ids=[9])
+        self.assertEqual(Task.objects.count(), 2)
+        task = Task.objects.get(key="")
+        self.assertEqual(task.payload, {"ids": [1, 2, 3], "full": True})
+
+    def test_debounce_is_capped_by_max_wait(self):
+        """Test that each trigger pushes the start back, but never past max_wait after the first"""
+        first = enqueue("tests.record")
+        self.assertAlmostEqual((first.run_after - first.enqueued_at).total_seconds(), 2.0, places=1)
+        Task.objects.update(enqueued_at=first.enqueued_at - timedelta(seconds=4))
+        task = enqueue("tests.record")
+        self.assertAlmostEqual((task.run_after - first.enqueued_at).total_seconds(), 1.0, places=1)
+
+    def test_tasks_wait_for_their_debounce(self):
+        """Test that a task is not claimed before it is due"""
+        enqueue("tests.record")
+        self.assertIsNone(claim("test"))
+        self.make_due()
+        self.assertIsNotNone(claim("test"))
+        self.assertIsNone(claim("test"))
+
+    def test_success_deletes_the_task(self):
+        """Test that a task runs once with its merged payload and is then deleted"""
+        enqueue("tests.record", ids=[1])
+        enqueue("tests.record", ids=[2])
+        self.make_due()
+        self.assertEqual(run_worker(once=True), 1)
+        self.assertEqual(CALLS, [{"ids": [1, 2]}])
+        self.assertFalse(Task.objects.exists())
+
+    def test_failures_retry_with_backoff(self):
+        """Test that a failing task is retried after a delay and marked failed after max_attempts"""
+        enqueue("tests.record", fail=True)
+        self.make_due()
+        with self.assertLogs("tasks", "ERROR"):
+            self.assertFalse(run_task(claim("test")))
+        task = Task.objects.get()
+        self.assertEqual((task.status, task.attempts), (Task.PENDING, 1))
+        self.assertIn("ValueError: boom", task.last_error)
+        self.assertGreater(task.run_after, timezone.now() + timedelta(seconds=4))
+        self.make_due()
+        with self.assertLogs("tasks", "ERROR"):
+            self.assertFalse(run_task(claim("test")))
+        task.refresh_from_db()
+        self.assertEqual((task.status, task.attempts), (Task.FAILED, 2))
+        self.assertIsNone(claim("test"))
+
+    def test_retry_merges_into_newer_trigger(self):
+        """Test that a failed run folds its payload into a trigger queued while it ran"""
+        enqueue("tests.record", ids=[1], fail=True)
+        self.make_due()
+        task = claim("test")
+        enqueue("tests.record", ids=[2])
+        with self.assertLogs("tasks", "ERROR"):
+            run_task(task)
+        pending = Task.objects.get()
+        self.assertEqual(pending.payload, {"ids": [1, 2], "fail": True})
+        self.assertEqual(pending.attempts, 0)
+
+    def test_unknown_task_fails(self):
+        """Test that a task without a registered job is marked failed instead of retried"""
+        Task.objects.create(name="tests.missing")
+        with self.assertLogs("tasks", "ERROR") as logs:
+            self.assertFalse(run_task(claim("test")))
+        self.assertIn("Unknown task", logs.output[0])
+        self.assertEqual(Task.objects.get().status, Task.FAILED)
+
+    @override_settings(TASKS_LOCK_TIMEOUT=60)
+    def test_stale_running_task_is_reclaimed(self):
+        """Test that a task left running by a dead worker is taken over after the lock timeout"""
+        enqueue("tests.record")
+        self.make_due()
+        claim("dead")
+        self.assertIsNone(claim("test"))
+        Task.objects.update(locked_at=timezone.now() - timedelta(seconds=61))
+        task = claim("test")
+        self.assertEqual((task.locked_by, task.attempts), ("test", 2))
+
+    def test_run_worker_command(self):
+        """Test that `run_worker --once` drains the due tasks and exits"""
+        for key in "abc":
+            enqueue("tests.record", key=key)
+        self.make_due()
+        call_command("run_worker", once=True, stdout=io.StringIO())
+        self.assertEqual(len(CALLS), 3)
+        self.assertFalse(Task.objects.exists())
+
+    @override_settings(API_PROJECT_READ_MODEL=True)
+    def test_saves_queue_rebuilds(self):
+        """Test that model saves queue the derived-data rebuilds and the worker applies them"""
+        python = Technology.objects.create(name="Python")
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(5):
+                project = Project.objects.create(name=f"P{i}", description="d", github="https://g.com")
+                project.technology.add(python)
+        self.assertFalse(TechnologyUsage.objects.exists())
+        names = set(Task.objects.values_list("name", flat=True))
+        self.assertTrue({"snapshot.build", "usage.refresh", "search.update"} <= names)
+        self.assertTrue(set(names) <= set(TASKS))
+        # Written projects are refreshed on commit, so their own endpoints read them back
+        self.assertNotIn("read_model.refresh", names)
+        self.assertEqual(ProjectReadModel.objects.count(), 5)
+        self.make_due()
+        run_worker(once=True)
+        self.assertFalse(Task.objects.exists())
+        self.assertEqual(TechnologyUsage.objects.get(technology=python).project_count, 5)
+
+        # Renames fan out to every project using them and are left to the worker
+        with self.captureOnCommitCallbacks(execute=True):
+            python.name = "CPython"
+            python.save()
+        self.assertEqual(Task.objects.filter(name="read_model.refresh").count(), 1)
+        self.make_due()
+        run_worker(once=True)
+        self.assertEqual(list(ProjectReadModel.objects.values_list("technology_names", flat=True)), [["CPython"]] * 5)
@@ -1,29 +1,22 @@
 import { Category } from '@/types';
 import { API_URL } from './config';
+import { fetchAllPages } from '@/utils/api';
 
 // Fetch all available categories
 export const fetchCategories = async (): Promise<Category[]> => {
-  const response = await fetch(`${API_URL}/projects/categories/`);
-  if (!response.ok) {
-    throw new Error('Failed to fetch categories');
-  }
-  return response.json();
+  return fetchAllPages<Category>(`${API_URL}/projects/categories/`);
 };
 
 // Fetch skills for a specific category by name
 export const fetchSkillsByCategory = async (
   categoryName: string
 ): Promise<Category> => {
-  const response = await fetch(`${API_URL}/projects/categories/`);
-  if (!response.ok) {
-    throw new Error('Failed to fetch skills');
-  }
-  const categories = await response.json();
+  const categories = await fetchAllPages<Category>(
+    `${API_URL}/projects/categories/`
+  );
 
   // Find matching category
-  const category = categories.find(
-    (cat: Category) => cat.name === categoryName
-  );
+  const category = categories.find(cat => cat.name === categoryName);
   if (!category) {
     throw new Error(`Category ${categoryName} not found`);
   }
@@ -32,9 +25,5 @@ export const fetchSkillsByCategory = async (
 
 // Fetch all categories with their skills
 export const fetchAllSkills = async (): Promise<Category[]> => {
-  const response = await fetch(`${API_URL}/projects/categories/`);
-  if (!response.ok) {
-    throw new Error('Failed to fetch skills');
-  }
-  return response.json();
+  return fetchAllPages<Category>(`${API_URL}/projects/categories/`);
 };
@@ -1,3 +1,6 @@
+// Whole portfolio in one request
+export { fetchSnapshot } from './snapshot';
+
 // Job-related API functions
 export { fetchJobs, fetchJobsByTechnology, fetchJobsByDateRange } from './jobs';
 
@@ -21,7 +24,14 @@ export {
 export { fetchTechnologies, getTechnologiesByCategory } from './technologies';
 
 // Core data types
-export type { Job, Project, Category, Subcategory, Technology } from '@/types';
+export type {
+  Job,
+  Project,
+  Category,
+  Subcategory,
+  Technology,
+  PortfolioSnapshot,
+} from '@/types';
 
 // Utility classes
 export { APIError } from '@/utils/errors';
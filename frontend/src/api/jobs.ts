@@ -1,6 +1,6 @@
 import { Job } from '@/types';
 import { API_URL } from './config';
-import { fetchWithRetry } from '@/utils/api';
+import { fetchAllPages } from '@/utils/api';
 import { Cache } from '@/utils/cache';
 import { APIError } from '@/utils/errors';
 import { validateDate, validateId } from '@/utils/validation';
@@ -14,7 +14,7 @@ export const fetchJobs = async (): Promise<Job[]> => {
   const cached = cache.get<Job[]>(cacheKey);
   if (cached) return cached;
 
-  const data = await fetchWithRetry<Job[]>(`${API_URL}/about/jobs/`);
+  const data = await fetchAllPages<Job>(`${API_URL}/about/jobs/`);
   cache.set(cacheKey, data);
   return data;
 };
@@ -27,7 +27,7 @@ export const fetchJobsByTechnology = async (
     throw new APIError('Invalid technology ID', 400);
   }
 
-  return fetchWithRetry<Job[]>(
+  return fetchAllPages<Job>(
     `${API_URL}/about/jobs/?technology=${technologyId}`
   );
 };
@@ -44,7 +44,7 @@ export const fetchJobsByDateRange = async (
     throw new APIError('Start date must be before end date', 400);
   }
 
-  return fetchWithRetry<Job[]>(
+  return fetchAllPages<Job>(
     `${API_URL}/about/jobs/?start_date=${startDate}&end_date=${endDate}`
   );
 };
@@ -1,6 +1,6 @@
 import { Project } from '@/types';
 import { API_URL } from './config';
-import { fetchWithRetry } from '@/utils/api';
+import { fetchAllPages } from '@/utils/api';
 import { Cache } from '@/utils/cache';
 import { APIError } from '@/utils/errors';
 
@@ -22,7 +22,7 @@ export const fetchProjects = async (): Promise<Project[]> => {
   const cached = cache.get<Project[]>(cacheKey);
   if (cached) return cached;
 
-  const data = await fetchWithRetry<Project[]>(`${API_URL}/projects/`);
+  const data = await fetchAllPages<Project>(`${API_URL}/projects/projects/`);
   cache.set(cacheKey, data);
   return data;
 };
@@ -40,8 +40,6 @@ export const fetchProjectsByCategory = async (
   const url = `${API_URL}/projects/projects/?category=${encodeURIComponent(
     mappedCategory
   )}`;
-  const data = await fetchWithRetry<Project[]>(url);
-
-  // Add a filter on the client side as well to ensure we only get relevant projects
-  return data.filter(project => project.category === mappedCategory);
+  // The API filters by category name, so only matching projects are returned
+  return fetchAllPages<Project>(url);
 };
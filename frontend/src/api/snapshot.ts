@@ -0,0 +1,18 @@
+import { PortfolioSnapshot } from '@/types';
+import { API_URL } from './config';
+import { fetchWithRetry } from '@/utils/api';
+import { Cache } from '@/utils/cache';
+
+// Initialize cache singleton
+const cache = Cache.getInstance();
+
+// Fetch the whole portfolio graph in a single request
+export const fetchSnapshot = async (): Promise<PortfolioSnapshot> => {
+  const cacheKey = 'snapshot';
+  const cached = cache.get<PortfolioSnapshot>(cacheKey);
+  if (cached) return cached;
+
+  const data = await fetchWithRetry<PortfolioSnapshot>(`${API_URL}/snapshot/`);
+  cache.set(cacheKey, data);
+  return data;
+};
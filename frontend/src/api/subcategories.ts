@@ -1,6 +1,6 @@
 import { Subcategory, Technology } from '@/types';
 import { API_URL } from './config';
-import { fetchWithRetry } from '@/utils/api';
+import { fetchAllPages } from '@/utils/api';
 import { Cache } from '@/utils/cache';
 import { APIError } from '@/utils/errors';
 import { validateId } from '@/utils/validation';
@@ -14,7 +14,7 @@ export const fetchSubcategories = async (): Promise<Subcategory[]> => {
   const cached = cache.get<Subcategory[]>(cacheKey);
   if (cached) return cached;
 
-  const data = await fetchWithRetry<Subcategory[]>(
+  const data = await fetchAllPages<Subcategory>(
     `${API_URL}/projects/subcategories/`
   );
   cache.set(cacheKey, data);
@@ -33,7 +33,7 @@ export const getTechnologiesBySubcategory = async (
   const cached = cache.get<Technology[]>(cacheKey);
   if (cached) return cached;
 
-  const data = await fetchWithRetry<Technology[]>(
+  const data = await fetchAllPages<Technology>(
     `${API_URL}/subcategories/${subcategoryId}/projects/technologies/`
   );
   cache.set(cacheKey, data);
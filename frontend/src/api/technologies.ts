@@ -1,6 +1,6 @@
 import { Technology } from '@/types';
 import { API_URL } from './config';
-import { fetchWithRetry } from '@/utils/api';
+import { fetchAllPages } from '@/utils/api';
 import { Cache } from '@/utils/cache';
 import { APIError } from '@/utils/errors';
 
@@ -13,7 +13,7 @@ export const fetchTechnologies = async (): Promise<Technology[]> => {
   const cached = cache.get<Technology[]>(cacheKey);
   if (cached) return cached;
 
-  const data = await fetchWithRetry<Technology[]>(
+  const data = await fetchAllPages<Technology>(
     `${API_URL}/projects/technologies/`
   );
   cache.set(cacheKey, data);
@@ -32,7 +32,7 @@ export const getTechnologiesByCategory = async (
   const cached = cache.get<Technology[]>(cacheKey);
   if (cached) return cached;
 
-  const data = await fetchWithRetry<Technology[]>(
+  const data = await fetchAllPages<Technology>(
     `${API_URL}/projects/technologies/?category=${encodeURIComponent(
       categoryName
     )}`
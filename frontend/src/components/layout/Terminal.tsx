@@ -12,7 +12,11 @@ import { AboutSection } from '@/components/sections/about';
 import { SkillsSection } from '@/components/sections/skills';
 import { ContactSection } from '@/components/sections/contact';
 import { Project, Category, Job } from '@/types';
-import { fetchProjectsByCategory, fetchAllSkills, fetchJobs } from '@/api';
+import {
+  fetchProjectsByCategory,
+  fetchAllSkills,
+  fetchSnapshot,
+} from '@/api';
 import { ProjectsSection } from '@/components/sections/projects';
 import { getProjectCategoryColor } from '@/components/sections/projects/utils';
 
@@ -376,14 +380,11 @@ const Terminal: React.FC = () => {
   useEffect(() => {
     const fetchInitialData = async () => {
       try {
-        const [skillsResponse, jobsResponse] = await Promise.all([
-          fetchAllSkills(),
-          fetchJobs(),
-        ]);
+        const snapshot = await fetchSnapshot();
         setState(prev => ({
           ...prev,
-          skillsData: skillsResponse,
-          jobs: jobsResponse,
+          skillsData: snapshot.categories,
+          jobs: snapshot.jobs,
           history: [headerMessage],
         }));
       } catch (error) {
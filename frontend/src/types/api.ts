@@ -1,3 +1,8 @@
+import { Technology } from './common';
+import { Project } from './projects';
+import { Category, Subcategory } from './skills';
+import { Job } from './work';
+
 export interface ErrorResponse {
   message?: string;
   errors?: Record<string, string[]>;
@@ -14,3 +19,17 @@ export class APIError extends Error {
     this.name = 'APIError';
   }
 }
+
+export interface Paginated<T> {
+  next: string | null;
+  previous: string | null;
+  results: T[];
+}
+
+export interface PortfolioSnapshot {
+  categories: Category[];
+  subcategories: Subcategory[];
+  technologies: Technology[];
+  projects: Project[];
+  jobs: Job[];
+}
@@ -1,3 +1,4 @@
+import { Paginated } from '@/types';
 import { APIError } from './errors';
 
 /**
@@ -50,3 +51,20 @@ export async function fetchWithRetry<T>(
     clearTimeout(timeoutId);
   }
 }
+
+/**
+ * Fetch every page of a cursor-paginated list endpoint
+ * @param url URL of the first page
+ */
+export async function fetchAllPages<T>(url: string): Promise<T[]> {
+  const results: T[] = [];
+  let next: string | null = url;
+
+  while (next) {
+    const page: Paginated<T> = await fetchWithRetry<Paginated<T>>(next);
+    results.push(...page.results);
+    next = page.next;
+  }
+
+  return results;
+}